@@ -0,0 +1,93 @@
+import time
+from collections import deque
+import numpy as np
+
+
+class Deadline:
+    def __init__(self, seconds=None, nodes=None, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.seconds = seconds
+        self.at = None if seconds is None else self.start + seconds
+        self.nodes = nodes
+
+    def __repr__(self):
+        return f"Deadline(seconds={self.seconds}, nodes={self.nodes})"
+
+    def expired(self, nodes=0, margin=0.0):
+        if self.nodes is not None and nodes >= self.nodes:
+            return True
+        return self.at is not None and time.perf_counter() + margin >= self.at
+
+    def remaining(self):
+        if self.at is None:
+            return float("inf")
+        return max(self.at - time.perf_counter(), 0.0)
+
+
+class TimeControl:
+    def __init__(self, seconds=None, nodes=None):
+        self.seconds = seconds
+        self.nodes = nodes
+
+    def __repr__(self):
+        return f"TimeControl(seconds={self.seconds}, nodes={self.nodes})"
+
+    def deadline(self):
+        if self.seconds is None and self.nodes is None:
+            return None
+        return Deadline(self.seconds, self.nodes)
+
+
+class LatencyTracker:
+    def __init__(self, window=1024):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.recent = deque(maxlen=self.window)
+        self.moves = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.overruns = 0
+
+    def record(self, seconds, deadline=None):
+        self.recent.append(seconds)
+        self.moves += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+        if deadline is not None and deadline.seconds is not None and seconds > deadline.seconds:
+            self.overruns += 1
+
+    def summary(self):
+        if not self.moves:
+            return {"moves": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "overruns": 0}
+        return {
+            "moves": self.moves,
+            "mean_ms": self.total / self.moves * 1000.0,
+            "p95_ms": float(np.percentile(np.array(self.recent) * 1000.0, 95)),
+            "max_ms": self.worst * 1000.0,
+            "overruns": self.overruns,
+        }
+
+
+class AnytimeAgent:
+    def decide(self, matrix, next_value, deadline=None):
+        raise NotImplementedError
+
+    def solve_many(self, boards, next_values):
+        return [self.decide(matrix, next_value) for matrix, next_value in zip(boards, next_values)]
+
+    def act(self, matrix, next_value, deadline=None):
+        start = time.perf_counter()
+        column = self.decide(matrix, next_value, deadline)
+        self.latency.record(time.perf_counter() - start, deadline)
+        return column
+
+    def act_many(self, boards, next_values):
+        start = time.perf_counter()
+        columns = self.solve_many(boards, next_values)
+        if columns:
+            per_move = (time.perf_counter() - start) / len(columns)
+            for _ in columns:
+                self.latency.record(per_move)
+        return columns
@@ -0,0 +1,51 @@
+from collections import namedtuple
+from core.utils.board_spec import as_spec
+from core.utils.transposition_table import TranspositionTable
+from core.utils.zobrist import board_hash
+
+Afterstate = namedtuple("Afterstate", ["board", "score_gain", "merges", "features"])
+
+REJECTED = Afterstate(None, -1, -1, None)
+
+_EXPONENT_SLOTS = 64
+
+
+class AfterstateCache:
+    def __init__(self, capacity=1 << 15, policy="lru"):
+        self.table = TranspositionTable(capacity, policy)
+        self.spec = None
+        self.names = None
+
+    def bind(self, spec, names):
+        spec, names = as_spec(spec), tuple(names)
+        if self.spec is None:
+            self.spec, self.names = spec, names
+        elif (self.spec, self.names) != (spec, names):
+            raise ValueError(
+                f"cache holds {self.names} features for {self.spec!r}, got {names} for {spec!r}"
+            )
+
+    def board_key(self, matrix):
+        return board_hash(matrix, self.spec)
+
+    def key(self, board_key, next_value, column):
+        exp = next_value.bit_length() - 1
+        return (board_key * _EXPONENT_SLOTS + exp) * self.spec.cols + column
+
+    def get(self, board_key, next_value, column):
+        return self.table.get(self.key(board_key, next_value, column))
+
+    def store(self, board_key, next_value, column, afterstate):
+        self.table.store(self.key(board_key, next_value, column), afterstate)
+
+    def clear(self):
+        self.table.clear()
+
+    def __len__(self):
+        return len(self.table)
+
+    def hit_rate(self):
+        return self.table.hit_rate()
+
+    def stats(self):
+        return self.table.stats()
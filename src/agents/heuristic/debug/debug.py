@@ -71,6 +71,7 @@ class Debugger:
             fontweight="bold",
             fontstyle="italic",
         )
+        self._status = self.fig.text(0.5, 0.012, "", ha="center", va="bottom", color=DIM, fontsize=10)
         plt.show(block=False)
         self.fig.canvas.draw()
 
@@ -203,6 +204,11 @@ class Debugger:
     def _init_table(self):
         self.ax_table.axis("off")
 
+    def draw_status(self, text):
+        self._status.set_text(text)
+        self.fig.canvas.draw_idle()
+        self.fig.canvas.flush_events()
+
     def update(self, column, contributions, total_heuristic):
         self._last_contributions = contributions
         self._best_col = None
@@ -0,0 +1,307 @@
+import math
+import numpy as np
+from core.utils.core_utils import rearrange, has_merge, resolve_cascade
+from core.utils.column_table import apply_drop
+from core.utils.exponent_table import line_terms
+from core.utils import jit_kernels
+from core.utils.board_spec import as_spec
+from agents.heuristic.feature_engine import DELTA_BATCH_LIMIT, FEATURE_NAMES, RAW_FEATURE_NAMES, FeatureEngine
+from agents.heuristic.afterstate_cache import REJECTED, Afterstate
+
+
+class FixedWeights:
+    def __init__(self, weights):
+        self.weights = dict(weights)
+
+    def update(self, features, reward):
+        pass
+
+
+class AdaptiveWeights(FixedWeights):
+    def __init__(self, weights, learning_rate=0.05):
+        super().__init__(weights)
+        self.learning_rate = learning_rate
+
+    def _renormalizes(self, total):
+        return total != 0
+
+    def update(self, features, reward):
+        if reward <= 0:
+            return
+        for key in self.weights:
+            self.weights[key] += self.learning_rate * reward * features[key]
+        total = sum(self.weights.values())
+        if self._renormalizes(total):
+            for key in self.weights:
+                self.weights[key] /= total
+
+
+class SimplexWeights(AdaptiveWeights):
+    def _renormalizes(self, total):
+        return total > 0
+
+
+class Evaluator:
+    def __init__(self, spec=None, normalized=True, incremental=False):
+        self.spec = as_spec(spec)
+        self.normalized = normalized
+        self.incremental = incremental
+        self.names = FEATURE_NAMES if normalized else RAW_FEATURE_NAMES
+        self.feature_engine = FeatureEngine(self.spec)
+        self._summary = None
+
+    def summary(self, matrix):
+        engine = self.feature_engine
+        if self._summary is None:
+            self._summary = engine.summarize(matrix)
+        else:
+            self._summary = engine.update(self._summary, matrix)
+        return self._summary
+
+    def parent_summary(self, matrix, count):
+        if not self.incremental or matrix is None or count > DELTA_BATCH_LIMIT:
+            return None
+        return self.summary(matrix)
+
+    def compute_features(self, column, matrix, move_score, merge_count):
+        if not self.normalized:
+            return self.raw_features(column, matrix, move_score, merge_count)
+        if jit_kernels.ENABLED:
+            return self._compute_features_flat(column, matrix, move_score, merge_count)
+        return {
+            "score":  self.norm_score(move_score),
+            "empty":  self.norm_empty(matrix),
+            "merge":  self.norm_merge(merge_count),
+            "mono":   self.norm_monotonicity(matrix),
+            "smooth": self.norm_smoothness(matrix),
+            "corner": self.corner_bonus(column, matrix),
+            "stack":  self.norm_stack(matrix),
+        }
+
+    def _compute_features_flat(self, column, matrix, move_score, merge_count):
+        cols = self.spec.cols
+        empties, mono, smooth, corner, stack = jit_kernels.board_features(matrix, self.spec)
+        return {
+            "score":  self.norm_score(move_score),
+            "empty":  self.soft_norm(int(empties), scale=cols),
+            "merge":  self.norm_merge(merge_count),
+            "mono":   0.5 + 0.5 * math.tanh(mono),
+            "smooth": 1.0 - self.soft_norm(smooth, scale=2.0),
+            "corner": corner,
+            "stack":  max(-1.0, int(stack) / (100.0 * cols)),
+        }
+
+    def raw_features(self, column, matrix, move_score, merge_count):
+        if jit_kernels.ENABLED:
+            empties, mono, smooth, corner, stack = jit_kernels.board_features(matrix, self.spec)
+            return {
+                "score": float(move_score),
+                "empty_cells": float(empties),
+                "merges": float(merge_count),
+                "monotonicity": float(mono),
+                "smoothness": float(smooth),
+                "corner_bonus": float(corner),
+                "stack": float(max(-1.0, int(stack) / (100.0 * self.spec.cols))),
+            }
+        return {
+            "score": float(move_score),
+            "empty_cells": float(self.count_empty_cells(matrix)),
+            "merges": float(merge_count),
+            "monotonicity": float(self.calculate_monotonicity(matrix)),
+            "smoothness": float(self.calculate_smoothness(matrix)),
+            "corner_bonus": float(self.corner_bonus(column, matrix)),
+            "stack": float(self.norm_stack(matrix)),
+        }
+
+    def batch_features(self, moves, matrix=None):
+        if not moves:
+            return np.empty((0, len(self.names)))
+        boards, scores, merges = [], [], []
+        for _, temp_matrix, score_gain, distinct_merges in moves:
+            boards.append(temp_matrix)
+            scores.append(score_gain)
+            merges.append(distinct_merges)
+        parent = self.parent_summary(matrix, len(boards))
+        if self.normalized:
+            return self.feature_engine.features(boards, scores, merges, parent)
+        return self.feature_engine.raw_features(boards, scores, merges, parent)
+
+    def afterstates(self, matrix, next_value):
+        moves = []
+        for col in range(self.spec.cols):
+            temp_matrix = [row[:] for row in matrix]
+            score_gain, distinct_merges = self.simulate_move(temp_matrix, col, next_value)
+            if score_gain != -1:
+                moves.append((col, temp_matrix, score_gain, distinct_merges))
+        return moves
+
+    def scored_afterstates(self, matrix, next_value, cache=None):
+        if cache is None:
+            moves = self.afterstates(matrix, next_value)
+            return moves, self.batch_features(moves, matrix)
+        groups, features = self.stacked_afterstates([matrix], [next_value], cache)
+        return groups[0], features
+
+    def stacked_afterstates(self, boards, next_values, cache=None):
+        if cache is None:
+            groups = [self.afterstates(matrix, value) for matrix, value in zip(boards, next_values)]
+            return groups, self.batch_features([move for moves in groups for move in moves])
+        found, pending = [], []
+        for matrix, value in zip(boards, next_values):
+            board_key = cache.board_key(matrix)
+            entries = {}
+            for col in range(self.spec.cols):
+                entry = cache.get(board_key, value, col)
+                if entry is None:
+                    temp_matrix = [row[:] for row in matrix]
+                    score_gain, distinct_merges = self.simulate_move(temp_matrix, col, value)
+                    if score_gain == -1:
+                        cache.store(board_key, value, col, REJECTED)
+                    else:
+                        pending.append((entries, board_key, value, (col, temp_matrix, score_gain, distinct_merges)))
+                elif entry is not REJECTED:
+                    entries[col] = entry
+            found.append(entries)
+        if pending:
+            parent = boards[0] if len(boards) == 1 else None
+            computed = self.batch_features([move for _, _, _, move in pending], parent)
+            for (entries, board_key, value, move), row in zip(pending, computed):
+                col, temp_matrix, score_gain, distinct_merges = move
+                row = row.copy()
+                row.flags.writeable = False
+                board = tuple(tuple(r) for r in temp_matrix)
+                entries[col] = entry = Afterstate(board, score_gain, distinct_merges, row)
+                cache.store(board_key, value, col, entry)
+        groups, rows = [], []
+        for entries in found:
+            columns = sorted(entries)
+            groups.append([(col, entries[col].board, entries[col].score_gain, entries[col].merges) for col in columns])
+            rows.extend(entries[col].features for col in columns)
+        if not rows:
+            return groups, np.empty((0, len(self.names)))
+        return groups, np.array(rows)
+
+    def simulate_move(self, matrix, column, value):
+        if jit_kernels.ENABLED:
+            return jit_kernels.simulate_move(matrix, column, value, self.spec)
+        entry = apply_drop(matrix, column, value)
+        if entry is None:
+            return self._simulate_move_general(matrix, column, value)
+        cells, full, score_gained, distinct_merges, _, _, _ = entry
+        if cells is None:
+            return (-1, -1)
+        if full:
+            return (score_gained, distinct_merges + 1)
+        if distinct_merges:
+            rearrange(matrix)
+        return self._sweep_columns(matrix, score_gained, distinct_merges)
+
+    def _simulate_move_general(self, matrix, column, value):
+        rows = self.spec.rows
+        index = 0
+        while index < rows and matrix[index][column] != 0:
+            index += 1
+        if index == rows:
+            last_row = rows - 1
+            if matrix[last_row][column] != value:
+                return (-1, -1)
+            matrix[last_row][column] *= 2
+            score_gained = matrix[last_row][column]
+            _, score_delta, merges, _ = resolve_cascade(matrix, column, column)
+            return (score_gained + score_delta, merges + 1)
+        matrix[index][column] = value
+        _, score_gained, distinct_merges, _ = resolve_cascade(matrix, column)
+        return self._sweep_columns(matrix, score_gained, distinct_merges)
+
+    def _sweep_columns(self, matrix, score_gained, distinct_merges):
+        if not has_merge(matrix):
+            return (score_gained, distinct_merges)
+        for column in range(self.spec.cols):
+            _, score_delta, merges, _ = resolve_cascade(matrix, column)
+            score_gained += score_delta
+            distinct_merges += merges
+        return (score_gained, distinct_merges)
+
+    def soft_norm(self, x, scale):
+        return x / (x + scale)
+
+    def norm_score(self, score):
+        if score <= 0:
+            return 0.0
+        return self.soft_norm(math.log2(score + 1), scale=6.0)
+
+    def norm_empty(self, matrix):
+        rows, cols = self.spec.rows, self.spec.cols
+        empties = sum(
+            1 for r in range(rows) for c in range(cols)
+            if matrix[r][c] == 0
+        )
+        return self.soft_norm(empties, scale=cols)
+
+    def norm_merge(self, merges):
+        return self.soft_norm(merges, scale=2.0)
+
+    def norm_monotonicity(self, matrix):
+        raw = self.calculate_monotonicity(matrix)
+        return 0.5 + 0.5 * math.tanh(raw)
+
+    def norm_smoothness(self, matrix):
+        raw = self.calculate_smoothness(matrix)
+        return 1.0 - self.soft_norm(raw, scale=2.0)
+
+    def norm_stack(self, matrix):
+        raw = self.column_stack_penalty(matrix)
+        return max(-1.0, raw / (100.0 * self.spec.cols))
+
+    def column_stack_penalty(self, matrix):
+        rows, cols = self.spec.rows, self.spec.cols
+        penalty = 0
+        threshold = 1
+        for col in range(cols):
+            empty_count = sum(1 for row in range(rows) if matrix[row][col] == 0)
+            if empty_count <= threshold:
+                penalty -= 100
+        return penalty
+
+    def corner_bonus(self, _column, matrix):
+        rows, cols = self.spec.rows, self.spec.cols
+        max_val, max_pos = 0, (0, 0)
+        for r in range(rows):
+            for c in range(cols):
+                if matrix[r][c] > max_val:
+                    max_val = matrix[r][c]
+                    max_pos = (r, c)
+        row, col = max_pos
+        max_dist = (rows - 1) + (cols - 1)
+        dist = row + col
+        return 1.0 - (dist / max_dist)
+
+    def count_empty_cells(self, matrix):
+        rows, cols = self.spec.rows, self.spec.cols
+        return sum(
+            1 for r in range(rows) for c in range(cols)
+            if matrix[r][c] == 0
+        )
+
+    def calculate_monotonicity(self, matrix):
+        v = self._mono_vertical(matrix)
+        h = self._mono_horizontal(matrix)
+        return (v + h) / 2.0
+
+    def _mono_vertical(self, matrix):
+        comparisons = self.spec.cols * (self.spec.rows - 1)
+        score = sum(line_terms(column)[0] for column in zip(*matrix))
+        return score / comparisons if comparisons else 0.0
+
+    def _mono_horizontal(self, matrix):
+        comparisons = self.spec.rows * (self.spec.cols - 1)
+        score = sum(line_terms(tuple(row))[0] for row in matrix)
+        return score / comparisons if comparisons else 0.0
+
+    def calculate_smoothness(self, matrix):
+        smoothness, comparisons = 0, 0
+        for line in [*zip(*matrix), *map(tuple, matrix)]:
+            _, smooth, pairs = line_terms(line)
+            smoothness += smooth
+            comparisons += pairs
+        return smoothness / comparisons if comparisons else 0.0
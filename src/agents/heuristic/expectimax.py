@@ -0,0 +1,173 @@
+import time
+from core.game_logic import GameLogic
+from agents.anytime import AnytimeAgent, Deadline
+from agents.heuristic.basic_bot import BasicBot
+
+GAME_OVER_VALUE = -1.0
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class ExpectimaxBot(BasicBot):
+    def __init__(self, spec=None, depth=3, time_budget=0.1):
+        super().__init__(spec, frozen=True, incremental=True)
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        self.depth = depth
+        self.time_budget = time_budget
+        self.game = GameLogic(spec=self.spec)
+        self.nodes = 0
+        self.completed_depth = 0
+        self.elapsed = 0.0
+        self.total_nodes = 0
+        self.total_time = 0.0
+        self._deadline = None
+        self._last_check = 0.0
+        self._check_interval = 0.0
+
+    def evaluate_leaves(self, boards, scores, merges, matrix=None):
+        if not boards:
+            return []
+        parent = self.evaluator.parent_summary(matrix, len(boards))
+        return (self.feature_engine.features(boards, scores, merges, parent) @ self.weight_vector).tolist()
+
+    def _check_deadline(self):
+        if self._deadline is None:
+            return
+        now = time.perf_counter()
+        self._check_interval = max(self._check_interval, now - self._last_check)
+        self._last_check = now
+        if self._deadline.expired(self.nodes, self._check_interval):
+            raise SearchTimeout
+
+    def _expand(self, value):
+        game = self.game
+        moves = []
+        for col in range(self.spec.cols):
+            accepted, merges, score_gain = game.push_turn(value, col)
+            self.nodes += 1
+            if accepted:
+                moves.append((col, [row[:] for row in game.get_matrix()], score_gain, merges))
+            game.pop()
+        return moves
+
+    def _chance_value(self, depth, gained):
+        self._check_deadline()
+        game = self.game
+        choices = game.spawn_choices()
+        if depth == 1:
+            groups = []
+            boards, scores, merges = [], [], []
+            for value in choices:
+                self._check_deadline()
+                if game.is_game_over(value):
+                    groups.append(0)
+                    continue
+                moves = self._expand(value)
+                groups.append(len(moves))
+                for _, board, score_gain, merge_count in moves:
+                    boards.append(board)
+                    scores.append(gained + score_gain)
+                    merges.append(merge_count)
+            values = self.evaluate_leaves(boards, scores, merges, game.get_matrix())
+            total, start = 0.0, 0
+            for size in groups:
+                total += max(values[start:start + size]) if size else GAME_OVER_VALUE
+                start += size
+            return total / len(choices)
+        total = 0.0
+        for value in choices:
+            total += self._max_value(value, depth, gained)
+        return total / len(choices)
+
+    def _max_value(self, value, depth, gained):
+        game = self.game
+        if game.is_game_over(value):
+            return GAME_OVER_VALUE
+        best = -float("inf")
+        for col in range(self.spec.cols):
+            self._check_deadline()
+            accepted, _, score_gain = game.push_turn(value, col)
+            self.nodes += 1
+            if accepted:
+                best = max(best, self._chance_value(depth - 1, gained + score_gain))
+            game.pop()
+        return best
+
+    def search(self, matrix, next_value, depth):
+        game = self.game
+        game.set_matrix([row[:] for row in matrix])
+        moves = self._expand(next_value)
+        if depth == 1:
+            values = self.evaluate_leaves(
+                [move[1] for move in moves], [move[2] for move in moves], [move[3] for move in moves], matrix
+            )
+            return moves, values
+        values = []
+        for col, _, score_gain, _ in moves:
+            game.push_turn(next_value, col)
+            try:
+                values.append(self._chance_value(depth - 1, score_gain))
+            finally:
+                game.pop()
+        return moves, values
+
+    def decide(self, matrix, next_value, deadline=None):
+        return self.solve(matrix, next_value, deadline=deadline)
+
+    def solve(self, matrix, next_value, debugger=None, deadline=None):
+        start = time.perf_counter()
+        if deadline is None and self.time_budget is not None:
+            deadline = Deadline(self.time_budget, start=start)
+        self._deadline = deadline
+        self.nodes = 0
+        moves, values = self.search(matrix, next_value, 1)
+        self.completed_depth = 1
+        self._last_check = time.perf_counter()
+        self._check_interval = 0.0
+        for depth in range(2, self.depth + 1):
+            try:
+                moves, values = self.search(matrix, next_value, depth)
+            except SearchTimeout:
+                self.game.reset()
+                break
+            self.completed_depth = depth
+        self._deadline = None
+        self.elapsed = time.perf_counter() - start
+        self.total_nodes += self.nodes
+        self.total_time += self.elapsed
+        best_value = -float("inf")
+        best_column = 0
+        for (col, _, _, _), value in zip(moves, values):
+            if value > best_value:
+                best_value = value
+                best_column = col
+        if debugger:
+            move_summaries = []
+            names = self.evaluator.names
+            for (col, _, score_gain, merges), value, row in zip(moves, values, self.batch_features(moves, matrix).tolist()):
+                features = dict(zip(names, row))
+                impact = {k: self.weights[k] * features[k] for k in self.weights}
+                debugger.update(col, impact, value)
+                move_summaries.append({"col": col, "score": score_gain, "h_score": value, "merges": merges})
+            debugger.draw_summary(move_summaries, best_column)
+        return best_column
+
+    def solve_many(self, boards, next_values):
+        return AnytimeAgent.solve_many(self, boards, next_values)
+
+    def nodes_per_sec(self):
+        return self.total_nodes / self.total_time if self.total_time else 0.0
+
+    def stats(self):
+        return {
+            "depth": self.completed_depth,
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+            "nodes_per_sec": self.nodes / self.elapsed if self.elapsed else 0.0,
+            "total_nodes": self.total_nodes,
+            "total_time": self.total_time,
+            "mean_nodes_per_sec": self.nodes_per_sec(),
+        }
@@ -0,0 +1,218 @@
+import math
+import numpy as np
+from core.utils.board_spec import as_spec
+from core.utils.exponent_table import line_terms
+
+FEATURE_NAMES = ("score", "empty", "merge", "mono", "smooth", "corner", "stack")
+RAW_FEATURE_NAMES = ("score", "empty_cells", "merges", "monotonicity", "smoothness", "corner_bonus", "stack")
+
+STACK_PENALTY = 100
+STACK_THRESHOLD = 1
+DELTA_BATCH_LIMIT = 10
+
+_EXPONENT_SHIFT = 52
+_EXPONENT_BIAS = 1023
+
+
+def _adjacent_pairs(rows, cols):
+    first, second = [], []
+    for col in range(cols):
+        for row in range(rows - 1):
+            first.append(row * cols + col)
+            second.append((row + 1) * cols + col)
+    for row in range(rows):
+        for col in range(cols - 1):
+            first.append(row * cols + col)
+            second.append(row * cols + col + 1)
+    return np.array(first, dtype=np.intp), np.array(second, dtype=np.intp)
+
+
+def _column_terms(line):
+    return line_terms(line) + (line.count(0),)
+
+
+def _peak(line):
+    top = max(line)
+    return top, line.index(top)
+
+
+class BoardSummary:
+    __slots__ = ("values", "col_terms", "row_terms", "peaks", "totals")
+
+    def __init__(self, values, col_terms, row_terms, peaks, totals):
+        self.values = values
+        self.col_terms = col_terms
+        self.row_terms = row_terms
+        self.peaks = peaks
+        self.totals = totals
+
+
+class FeatureEngine:
+    def __init__(self, spec=None):
+        self.spec = as_spec(spec)
+        rows, cols = self.spec.rows, self.spec.cols
+        self.vertical_pairs = cols * (rows - 1)
+        self.horizontal_pairs = rows * (cols - 1)
+        self.first, self.second = _adjacent_pairs(rows, cols)
+        self.max_dist = (rows - 1) + (cols - 1)
+        cells = np.arange(rows * cols)
+        self.cell_dist = (cells // cols + cells % cols).astype(np.float64)
+
+    def exponents(self, boards):
+        values = np.asarray(boards, dtype=np.float64).reshape(-1, self.spec.cells)
+        exps = (values.view(np.int64) >> _EXPONENT_SHIFT) - _EXPONENT_BIAS
+        return np.maximum(exps, 0)
+
+    def board_stats(self, boards):
+        exps = self.exponents(boards)
+        count = len(exps)
+        cur = exps[:, self.first]
+        nxt = exps[:, self.second]
+        rise = nxt - cur
+        filled = cur > 0
+        mono = np.where(rise <= 0, 1, np.where(filled, -rise, 0))
+        split = self.vertical_pairs
+        vertical = mono[:, :split].sum(axis=1) / split if split else np.zeros(count)
+        horizontal = (
+            mono[:, split:].sum(axis=1) / self.horizontal_pairs
+            if self.horizontal_pairs else np.zeros(count)
+        )
+        paired = filled & (nxt > 0)
+        comparisons = paired.sum(axis=1)
+        total = np.where(paired, np.abs(rise), 0).sum(axis=1)
+        empty = exps == 0
+        stacked = (
+            empty.reshape(count, self.spec.rows, self.spec.cols).sum(axis=1) <= STACK_THRESHOLD
+        ).sum(axis=1)
+        stats = np.empty((count, 5))
+        stats[:, 0] = empty.sum(axis=1)
+        stats[:, 1] = (vertical + horizontal) / 2.0
+        stats[:, 2] = np.where(comparisons > 0, total / np.maximum(comparisons, 1), 0.0)
+        stats[:, 3] = 1.0 - self.cell_dist[exps.argmax(axis=1)] / self.max_dist
+        stats[:, 4] = np.maximum(-1.0, -STACK_PENALTY * stacked / (100.0 * self.spec.cols))
+        return stats
+
+    def summarize(self, board):
+        values = [tuple(row) for row in board]
+        col_terms = [_column_terms(column) for column in zip(*values)]
+        row_terms = [line_terms(row) for row in values]
+        peaks = [_peak(row) for row in values]
+        totals = [
+            sum(t[0] for t in col_terms),
+            sum(t[0] for t in row_terms),
+            sum(t[1] for t in col_terms) + sum(t[1] for t in row_terms),
+            sum(t[2] for t in col_terms) + sum(t[2] for t in row_terms),
+            sum(t[3] for t in col_terms),
+            sum(1 for t in col_terms if t[3] <= STACK_THRESHOLD),
+        ]
+        return BoardSummary(values, col_terms, row_terms, peaks, totals)
+
+    def _changes(self, parent, board):
+        cols = self.spec.cols
+        lines, changed_cols = {}, set()
+        for r, (row, old) in enumerate(zip(board, parent.values)):
+            row = tuple(row)
+            if row != old:
+                lines[r] = row
+                changed_cols.update(c for c in range(cols) if row[c] != old[c])
+        return lines, changed_cols
+
+    def _delta(self, parent, lines, changed_cols):
+        vmono, hmono, smooth, pairs, empties, stacked = parent.totals
+        row_terms, col_terms = {}, {}
+        for r, line in lines.items():
+            old = parent.row_terms[r]
+            row_terms[r] = new = line_terms(line)
+            hmono += new[0] - old[0]
+            smooth += new[1] - old[1]
+            pairs += new[2] - old[2]
+        values = parent.values
+        for c in changed_cols:
+            old = parent.col_terms[c]
+            column = tuple([lines[r][c] if r in lines else values[r][c] for r in range(self.spec.rows)])
+            col_terms[c] = new = _column_terms(column)
+            vmono += new[0] - old[0]
+            smooth += new[1] - old[1]
+            pairs += new[2] - old[2]
+            empties += new[3] - old[3]
+            stacked += (new[3] <= STACK_THRESHOLD) - (old[3] <= STACK_THRESHOLD)
+        return [vmono, hmono, smooth, pairs, empties, stacked], row_terms, col_terms
+
+    def update(self, parent, board):
+        lines, changed_cols = self._changes(parent, board)
+        if not lines:
+            return parent
+        if len(changed_cols) == self.spec.cols:
+            return self.summarize(board)
+        totals, row_terms, col_terms = self._delta(parent, lines, changed_cols)
+        values = parent.values[:]
+        rows, cols, peaks = parent.row_terms[:], parent.col_terms[:], parent.peaks[:]
+        for r, line in lines.items():
+            values[r] = line
+            rows[r] = row_terms[r]
+            peaks[r] = _peak(line)
+        for c, terms in col_terms.items():
+            cols[c] = terms
+        return BoardSummary(values, cols, rows, peaks, totals)
+
+    def _stats(self, totals, peaks):
+        vmono, hmono, smooth, pairs, empties, stacked = totals
+        vertical = vmono / self.vertical_pairs if self.vertical_pairs else 0.0
+        horizontal = hmono / self.horizontal_pairs if self.horizontal_pairs else 0.0
+        best, peak_row, peak_col = -1, 0, 0
+        for r, (top, col) in enumerate(peaks):
+            if top > best:
+                best, peak_row, peak_col = top, r, col
+        return (
+            empties,
+            (vertical + horizontal) / 2.0,
+            smooth / pairs if pairs else 0.0,
+            1.0 - (peak_row + peak_col) / self.max_dist,
+            max(-1.0, -STACK_PENALTY * stacked / (100.0 * self.spec.cols)),
+        )
+
+    def summary_stats(self, summary):
+        return self._stats(summary.totals, summary.peaks)
+
+    def child_stats(self, parent, board):
+        lines, changed_cols = self._changes(parent, board)
+        if len(changed_cols) == self.spec.cols:
+            return self.summary_stats(self.summarize(board))
+        totals, _, _ = self._delta(parent, lines, changed_cols)
+        peaks = parent.peaks
+        if lines:
+            peaks = [_peak(lines[r]) if r in lines else peak for r, peak in enumerate(peaks)]
+        return self._stats(totals, peaks)
+
+    def delta_stats(self, parent, boards):
+        if not boards:
+            return np.empty((0, 5))
+        return np.array([self.child_stats(parent, board) for board in boards], dtype=np.float64)
+
+    def raw_features(self, boards, scores, merges, parent=None):
+        stats = self.board_stats(boards) if parent is None else self.delta_stats(parent, boards)
+        features = np.empty((len(stats), len(FEATURE_NAMES)))
+        features[:, 0] = scores
+        features[:, 1] = stats[:, 0]
+        features[:, 2] = merges
+        features[:, 3:] = stats[:, 1:]
+        return features
+
+    def features(self, boards, scores, merges, parent=None):
+        stats = self.board_stats(boards) if parent is None else self.delta_stats(parent, boards)
+        empties = stats[:, 0]
+        smooth = stats[:, 2]
+        merges = np.asarray(merges, dtype=np.float64)
+        features = np.empty((len(stats), len(FEATURE_NAMES)))
+        features[:, 0] = [soft_norm(math.log2(s + 1), 6.0) if s > 0 else 0.0 for s in scores]
+        features[:, 1] = empties / (empties + self.spec.cols)
+        features[:, 2] = merges / (merges + 2.0)
+        features[:, 3] = [0.5 + 0.5 * math.tanh(m) for m in stats[:, 1]]
+        features[:, 4] = 1.0 - smooth / (smooth + 2.0)
+        features[:, 5] = stats[:, 3]
+        features[:, 6] = stats[:, 4]
+        return features
+
+
+def soft_norm(x, scale):
+    return x / (x + scale)
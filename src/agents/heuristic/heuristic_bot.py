@@ -0,0 +1,140 @@
+from collections import namedtuple
+import numpy as np
+from core.utils.board_spec import as_spec
+from agents.anytime import AnytimeAgent, LatencyTracker
+from agents.heuristic.evaluator import Evaluator
+
+
+Outcome = namedtuple("Outcome", ["column", "features", "score_gain"])
+
+
+class HeuristicBot(AnytimeAgent):
+    normalized = True
+
+    def __init__(self, policy, spec=None, frozen=False, cache=None, incremental=False):
+        self.spec = as_spec(spec)
+        self.policy = policy
+        self.frozen = frozen
+        self._weight_vector = None
+        self.evaluator = Evaluator(self.spec, self.normalized, incremental)
+        self.feature_engine = self.evaluator.feature_engine
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self.spec, self.evaluator.names)
+        self.debugger = None
+        self.latency = LatencyTracker()
+
+    @property
+    def weights(self):
+        return self.policy.weights
+
+    @property
+    def weight_vector(self):
+        if self._weight_vector is None:
+            vector = np.array([self.policy.weights[k] for k in self.evaluator.names], dtype=np.float64)
+            vector.flags.writeable = False
+            self._weight_vector = vector
+        return self._weight_vector
+
+    def reward(self, score_gain):
+        return score_gain
+
+    def evaluate_board(self, column, matrix, move_score, merge_count):
+        features = self.compute_features(column, matrix, move_score, merge_count)
+        return sum(self.weights[k] * features[k] for k in self.weights)
+
+    def compute_features(self, column, matrix, move_score, merge_count):
+        return self.evaluator.compute_features(column, matrix, move_score, merge_count)
+
+    def update_weights(self, features, reward):
+        self.policy.update(features, reward)
+        self._weight_vector = None
+
+    def outcome(self, matrix, next_value, column):
+        temp_matrix = [row[:] for row in matrix]
+        score_gain, distinct_merges = self.simulate_move(temp_matrix, column, next_value)
+        if score_gain == -1:
+            return None
+        features = self.compute_features(column, temp_matrix, score_gain, distinct_merges)
+        return Outcome(column, features, score_gain)
+
+    def observe(self, outcome):
+        if outcome is not None:
+            self.update_weights(outcome.features, self.reward(outcome.score_gain))
+
+    def simulate_move(self, matrix, column, value):
+        return self.evaluator.simulate_move(matrix, column, value)
+
+    def afterstates(self, matrix, next_value):
+        return self.evaluator.afterstates(matrix, next_value)
+
+    def batch_features(self, moves, matrix=None):
+        return self.evaluator.batch_features(moves, matrix)
+
+    def scored_afterstates(self, matrix, next_value):
+        return self.evaluator.scored_afterstates(matrix, next_value, self.cache)
+
+    def decide(self, matrix, next_value, deadline=None):
+        return self.solve(matrix, next_value, self.debugger)
+
+    def solve(self, matrix, next_value, debugger=None):
+        moves, features = self.scored_afterstates(matrix, next_value)
+        if self.frozen:
+            return self._choose_frozen(moves, features, debugger)
+        return self._choose(moves, features, debugger)
+
+    def solve_many(self, boards, next_values):
+        groups, features = self.evaluator.stacked_afterstates(boards, next_values, self.cache)
+        columns, start = [], 0
+        if not self.frozen:
+            for moves in groups:
+                columns.append(self._choose(moves, features[start:start + len(moves)]))
+                start += len(moves)
+            return columns
+        scores = (features @ self.weight_vector).tolist()
+        for moves in groups:
+            end = start + len(moves)
+            columns.append(moves[max(range(start, end), key=scores.__getitem__) - start][0] if moves else 0)
+            start = end
+        return columns
+
+    def _choose(self, moves, features, debugger=None):
+        best_score = -float("inf")
+        best_column = 0
+        move_summaries = []
+        names = self.evaluator.names
+        for (col, _, score_gain, distinct_merges), row in zip(moves, features.tolist()):
+            row_features = dict(zip(names, row))
+            heuristic_score = sum(self.weights[k] * row_features[k] for k in self.weights)
+            self.update_weights(row_features, self.reward(score_gain))
+            move_summaries.append(
+                {"col": col, "score": score_gain, "h_score": heuristic_score, "merges": distinct_merges}
+            )
+            if debugger:
+                impact = {k: self.weights[k] * row_features[k] for k in self.weights}
+                debugger.update(col, impact, heuristic_score)
+            if heuristic_score > best_score:
+                best_score = heuristic_score
+                best_column = col
+        if debugger:
+            debugger.draw_summary(move_summaries, best_column)
+        return best_column
+
+    def _choose_frozen(self, moves, features, debugger=None):
+        if not moves:
+            return 0
+        scores = features @ self.weight_vector
+        best_column = moves[int(np.argmax(scores))][0]
+        if debugger:
+            names = self.evaluator.names
+            move_summaries = []
+            for (col, _, score_gain, distinct_merges), row, heuristic_score in zip(
+                moves, features.tolist(), scores.tolist()
+            ):
+                impact = {k: w * f for k, w, f in zip(names, self.weight_vector.tolist(), row)}
+                debugger.update(col, impact, heuristic_score)
+                move_summaries.append(
+                    {"col": col, "score": score_gain, "h_score": heuristic_score, "merges": distinct_merges}
+                )
+            debugger.draw_summary(move_summaries, best_column)
+        return best_column
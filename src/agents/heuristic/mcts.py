@@ -0,0 +1,217 @@
+import math
+import random
+import time
+from core.game_logic import GameLogic
+from agents.anytime import AnytimeAgent, Deadline, LatencyTracker
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.fixed_linear import FixedLinearBot
+
+ROLLOUT_POLICIES = ("random", "linear")
+
+
+class DecisionNode:
+    __slots__ = ("board", "value", "untried", "children", "visits")
+
+    def __init__(self, board, value, legal):
+        self.board = board
+        self.value = value
+        self.untried = legal
+        self.children = {}
+        self.visits = 0
+
+
+class ChanceNode:
+    __slots__ = ("children", "visits", "total")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.total = 0.0
+
+
+class MCTSBot(AnytimeAgent):
+    """Heuristic-leaf MCTS over the drop/spawn tree.
+
+    Each iteration descends the tree, expands one node and backs up the score gained on
+    the path plus BasicBot's value of the leaf. ``rollout_depth`` turns of random or
+    FixedLinear play can be inserted before the leaf evaluation; the default of 0 plays
+    none, which scored best in self-play. Budgets and stats count iterations.
+    """
+
+    def __init__(
+        self, spec=None, time_budget=None, iterations=200, rollout_depth=0,
+        rollout_policy="random", exploration=1.0, reuse_tree=True, seed=None,
+        score_weight=0.25, terminal_penalty=1.0,
+    ):
+        if rollout_policy not in ROLLOUT_POLICIES:
+            raise ValueError(f"Unknown rollout policy '{rollout_policy}'. Choose from: {ROLLOUT_POLICIES}")
+        if time_budget is None and iterations is None:
+            raise ValueError("MCTSBot needs a time budget, an iteration budget or both")
+        self.rng = random.Random(seed)
+        self.game = GameLogic(rng=self.rng, spec=spec)
+        self.spec = self.game.get_spec()
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.rollout_depth = rollout_depth
+        self.rollout_policy = rollout_policy
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.score_weight = score_weight
+        self.terminal_penalty = terminal_penalty
+        self.default_policy = (
+            FixedLinearBot(self.spec, frozen=True, incremental=True) if rollout_policy == "linear" else None
+        )
+        self.leaf_evaluator = BasicBot(self.spec, frozen=True)
+        self.root = None
+        self.last_column = None
+        self.completed_iterations = 0
+        self.reused_visits = 0
+        self.elapsed = 0.0
+        self.total_iterations = 0
+        self.total_time = 0.0
+        self.latency = LatencyTracker()
+
+    def _board(self):
+        return tuple(tuple(row) for row in self.game.get_matrix())
+
+    def _legal_columns(self, value):
+        game = self.game
+        top = game.get_matrix()[self.spec.rows - 1]
+        return [
+            col for col in range(self.spec.cols)
+            if game.column_height(col) < self.spec.rows or top[col] == value
+        ]
+
+    def _new_node(self, value):
+        legal = self._legal_columns(value)
+        self.rng.shuffle(legal)
+        return DecisionNode(self._board(), value, legal)
+
+    def _reuse(self, board, next_value):
+        if not self.reuse_tree or self.root is None:
+            return None
+        edge = self.root.children.get(self.last_column)
+        if edge is None:
+            return None
+        node = edge.children.get(next_value)
+        if node is None or node.board != board:
+            return None
+        return node
+
+    def _select(self, node):
+        stats = [(col, edge, edge.total / edge.visits) for col, edge in node.children.items()]
+        low = min(q for _, _, q in stats)
+        high = max(q for _, _, q in stats)
+        spread = high - low
+        log_visits = math.log(node.visits)
+        best, best_score = None, -float("inf")
+        for col, edge, q in stats:
+            score = (q - low) / spread if spread else 0.0
+            score += self.exploration * math.sqrt(log_visits / edge.visits)
+            if score > best_score:
+                best, best_score = (col, edge), score
+        return best
+
+    def _leaf_value(self, value):
+        if self.game.is_game_over(value):
+            return -self.terminal_penalty
+        evaluator = self.leaf_evaluator
+        _, features = evaluator.scored_afterstates(self.game.get_matrix(), value)
+        return float((features @ evaluator.weight_vector).max())
+
+    def _rollout(self):
+        game = self.game
+        gained = 0
+        for _ in range(self.rollout_depth):
+            value = game.get_next_value()
+            if game.is_game_over(value):
+                break
+            if self.default_policy is not None:
+                col = self.default_policy.solve(game.get_matrix(), value)
+            else:
+                col = self.rng.choice(self._legal_columns(value))
+            gained += game.play_turn(col).score_delta
+        return gained, self._leaf_value(game.get_next_value())
+
+    def _iterate(self, root, snapshot):
+        game = self.game
+        game.restore(snapshot)
+        node = root
+        path = []
+        gained = 0
+        leaf = -self.terminal_penalty
+        while not game.is_game_over(node.value):
+            if node.untried:
+                col = node.untried.pop()
+                edge = node.children[col] = ChanceNode()
+            else:
+                col, edge = self._select(node)
+            path.append((node, edge, gained))
+            turn = game.play_turn(col)
+            gained += turn.score_delta
+            child = edge.children.get(turn.next_value)
+            if child is None:
+                edge.children[turn.next_value] = self._new_node(turn.next_value)
+                rollout_gain, leaf = self._rollout()
+                gained += rollout_gain
+                break
+            node = child
+        norm_score = self.leaf_evaluator.evaluator.norm_score
+        for node, edge, before in path:
+            node.visits += 1
+            edge.visits += 1
+            edge.total += self.score_weight * norm_score(gained - before) + leaf
+
+    def decide(self, matrix, next_value, deadline=None):
+        return self.solve(matrix, next_value, deadline=deadline)
+
+    def solve(self, matrix, next_value, debugger=None, deadline=None):
+        start = time.perf_counter()
+        if deadline is None or (deadline.at is None and deadline.nodes is None):
+            deadline = Deadline(self.time_budget, self.iterations, start=start)
+        game = self.game
+        game.set_matrix([row[:] for row in matrix])
+        game.set_next_value(next_value)
+        board = self._board()
+        root = self._reuse(board, next_value)
+        if root is None:
+            root = self._new_node(next_value)
+        self.reused_visits = root.visits
+        snapshot = game.snapshot()
+        count = 0
+        slowest = 0.0
+        while not (count and deadline.expired(count, slowest)):
+            began = time.perf_counter()
+            self._iterate(root, snapshot)
+            slowest = max(slowest, time.perf_counter() - began)
+            count += 1
+        game.restore(snapshot)
+        self.completed_iterations = count
+        self.elapsed = time.perf_counter() - start
+        self.total_iterations += count
+        self.total_time += self.elapsed
+        if root.children:
+            best_column = max(root.children, key=lambda col: root.children[col].visits)
+        else:
+            best_column = 0
+        self.root = root
+        self.last_column = best_column
+        return best_column
+
+    def reset(self):
+        self.root = None
+        self.last_column = None
+
+    def iterations_per_sec(self):
+        return self.total_iterations / self.total_time if self.total_time else 0.0
+
+    def stats(self):
+        return {
+            "iterations": self.completed_iterations,
+            "reused_visits": self.reused_visits,
+            "elapsed": self.elapsed,
+            "iterations_per_sec": self.completed_iterations / self.elapsed if self.elapsed else 0.0,
+            "total_iterations": self.total_iterations,
+            "total_time": self.total_time,
+            "mean_iterations_per_sec": self.iterations_per_sec(),
+        }
@@ -1,15 +1,16 @@
 import json
 import os
-import copy
 import random
 import numpy as np
 from collections import deque
 from typing import List, Optional
-from config.constants import GRID_WIDTH
+from agents.anytime import AnytimeAgent, LatencyTracker
+from agents.heuristic.afterstate_cache import AfterstateCache
 from agents.heuristic.basic_bot import BasicBot
+from core.utils.board_spec import BoardSpec, as_spec
 
 
-class NoTeacherAgent:
+class NoTeacherAgent(AnytimeAgent):
     def __init__(
         self,
         initial_weights: Optional[List[float]] = None,
@@ -17,6 +18,8 @@ class NoTeacherAgent:
         gamma: float = 0.95,
         replay_buffer_size: int = 10_000,
         batch_size: int = 64,
+        spec: Optional[BoardSpec] = None,
+        cache: Optional[AfterstateCache] = None,
     ):
         self.feature_names = ["score", "empty", "merge", "mono", "smooth", "corner", "stack"]
         if initial_weights is None:
@@ -24,12 +27,15 @@ class NoTeacherAgent:
         self.theta = np.array(initial_weights, dtype=float)
         self.learning_rate = float(learning_rate)
         self.gamma = float(gamma)
-        self.rl_bot = BasicBot()
+        self.spec = as_spec(spec)
+        self.cache = cache if cache is not None else AfterstateCache()
+        self.rl_bot = BasicBot(self.spec, frozen=True, cache=self.cache)
         self.replay_buffer: deque = deque(maxlen=replay_buffer_size)
         self.batch_size = batch_size
         self.target_theta = self.theta.copy()
         self.update_count = 0
         self.target_update_freq = 500
+        self.latency = LatencyTracker()
 
     def _feature_vector_from_dict(self, features: dict) -> np.ndarray:
         return np.array([features[key] for key in self.feature_names], dtype=float)
@@ -37,15 +43,10 @@ class NoTeacherAgent:
     def _get_action_space_features(
         self, matrix: List[List[int]], next_value: int
     ) -> List[Optional[np.ndarray]]:
-        feature_vectors = []
-        for col in range(GRID_WIDTH):
-            temp_matrix = copy.deepcopy(matrix)
-            score_gain, merges = self.rl_bot.simulate_move(temp_matrix, col, next_value)
-            if score_gain == -1:
-                feature_vectors.append(None)
-                continue
-            features = self.rl_bot.compute_features(col, temp_matrix, score_gain, merges)
-            feature_vectors.append(self._feature_vector_from_dict(features))
+        feature_vectors = [None] * self.spec.cols
+        moves, features = self.rl_bot.scored_afterstates(matrix, next_value)
+        for (col, _, _, _), vector in zip(moves, features):
+            feature_vectors[col] = vector
         return feature_vectors
 
     def select_action(
@@ -66,6 +67,19 @@ class NoTeacherAgent:
             return np.random.choice(valid_actions) if valid_actions else 0
         return int(np.argmax(logits))
 
+    def solve_many(self, boards: List[List[List[int]]], next_values: List[int]) -> List[int]:
+        groups, features = self.rl_bot.evaluator.stacked_afterstates(boards, next_values, self.cache)
+        logits = (features @ self.theta).tolist()
+        actions, start = [], 0
+        for moves in groups:
+            end = start + len(moves)
+            actions.append(moves[max(range(start, end), key=logits.__getitem__) - start][0] if moves else 0)
+            start = end
+        return actions
+
+    def decide(self, matrix: List[List[int]], next_value: int, deadline=None) -> int:
+        return self.select_action(matrix, next_value, epsilon=0.0)
+
     def update_q_learning(
         self,
         state_features: np.ndarray,
@@ -1,13 +1,14 @@
 import json
 import os
-import copy
 import numpy as np
 from typing import List, Optional
-from config.constants import GRID_WIDTH
+from agents.anytime import AnytimeAgent, LatencyTracker
+from agents.heuristic.afterstate_cache import AfterstateCache
 from agents.heuristic.basic_bot import BasicBot
+from core.utils.board_spec import BoardSpec, as_spec
 
 
-class RLAgent:
+class RLAgent(AnytimeAgent):
     def __init__(
         self,
         initial_weights: Optional[List[float]] = None,
@@ -16,6 +17,9 @@ class RLAgent:
         teacher_lambda: float = 1.0,
         lambda_decay: float = 0.995,
         lambda_min: float = 0.05,
+        spec: Optional[BoardSpec] = None,
+        frozen_teacher: bool = False,
+        cache: Optional[AfterstateCache] = None,
     ):
         self.feature_names = ["score", "empty", "merge", "mono", "smooth", "corner", "stack"]
         if initial_weights is None:
@@ -26,11 +30,14 @@ class RLAgent:
         self.teacher_lambda = float(teacher_lambda)
         self.lambda_decay = float(lambda_decay)
         self.lambda_min = float(lambda_min)
-        self.rl_bot = BasicBot()
+        self.spec = as_spec(spec)
+        self.cache = cache if cache is not None else AfterstateCache()
+        self.rl_bot = BasicBot(self.spec, frozen=frozen_teacher, cache=self.cache)
         self.episode_log = []
         self.target_theta = self.theta.copy()
         self.update_count = 0
         self.target_update_freq = 500
+        self.latency = LatencyTracker()
 
     def _feature_vector_from_dict(self, features: dict) -> np.ndarray:
         return np.array([features[key] for key in self.feature_names], dtype=float)
@@ -38,15 +45,10 @@ class RLAgent:
     def _get_action_space_features(
         self, matrix: List[List[int]], next_value: int
     ) -> List[Optional[np.ndarray]]:
-        feature_vectors = []
-        for col in range(GRID_WIDTH):
-            temp_matrix = copy.deepcopy(matrix)
-            score_gain, merges = self.rl_bot.simulate_move(temp_matrix, col, next_value)
-            if score_gain == -1:
-                feature_vectors.append(None)
-                continue
-            features = self.rl_bot.compute_features(col, temp_matrix, score_gain, merges)
-            feature_vectors.append(self._feature_vector_from_dict(features))
+        feature_vectors = [None] * self.spec.cols
+        moves, features = self.rl_bot.scored_afterstates(matrix, next_value)
+        for (col, _, _, _), vector in zip(moves, features):
+            feature_vectors[col] = vector
         return feature_vectors
 
     def _softmax(self, logits: np.ndarray) -> np.ndarray:
@@ -108,7 +110,7 @@ class RLAgent:
             [np.dot(self.theta, v) if v is not None else -1e9 for v in feature_vectors]
         )
         probabilities = self._softmax(logits)
-        target = np.zeros(GRID_WIDTH)
+        target = np.zeros(self.spec.cols)
         target[teacher_action] = 1.0
         gradient = np.zeros_like(self.theta)
         for i, vec in enumerate(feature_vectors):
@@ -128,6 +130,19 @@ class RLAgent:
             return int(np.argmax(logits))
         return int(np.random.choice(len(logits), p=self._softmax(logits)))
 
+    def solve_many(self, boards: List[List[List[int]]], next_values: List[int]) -> List[int]:
+        groups, features = self.rl_bot.evaluator.stacked_afterstates(boards, next_values, self.cache)
+        logits = (features @ self.theta).tolist()
+        actions, start = [], 0
+        for moves in groups:
+            end = start + len(moves)
+            actions.append(moves[max(range(start, end), key=logits.__getitem__) - start][0] if moves else 0)
+            start = end
+        return actions
+
+    def decide(self, matrix: List[List[int]], next_value: int, deadline=None) -> int:
+        return self.select_action(matrix, next_value, deterministic=True)
+
     def get_weights(self) -> np.ndarray:
         return self.theta
 
@@ -143,16 +143,8 @@ def plot_tile_bar_simple(df: pd.DataFrame, outpath: str) -> None:
 
 
 def smoothness_of_array(arr: np.ndarray) -> int:
-    rows, cols = arr.shape
-    smooth = 0
-    for r in range(rows):
-        for c in range(cols):
-            v = int(arr[r, c])
-            if c + 1 < cols:
-                smooth += abs(v - int(arr[r, c + 1]))
-            if r + 1 < rows:
-                smooth += abs(v - int(arr[r + 1, c]))
-    return int(smooth)
+    arr = arr.astype(np.int64)
+    return int(np.abs(np.diff(arr, axis=1)).sum() + np.abs(np.diff(arr, axis=0)).sum())
 
 
 def potential_m2_merges(arr: np.ndarray) -> Tuple[int, int]:
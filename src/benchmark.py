@@ -1,30 +1,39 @@
 import argparse
+import functools
 import numpy as np
-from typing import Callable, List, Dict
+from typing import Callable, List, Dict, Optional
 from core.game_logic import GameLogic
-from core.utils.core_utils import game_over, rearrange
+from core.bitboard import BitboardGameLogic
+from config.constants import GRID_LENGTH, GRID_WIDTH
+from core.utils.board_spec import BoardSpec
+from core.utils.core_utils import SpawnSequence
+from agents.anytime import LatencyTracker, TimeControl
 
 
-def run_episode_headless(solve_fn: Callable, seed: int = 0) -> Dict:
+ENGINES = {
+    "list":     GameLogic,
+    "bitboard": BitboardGameLogic,
+}
+
+
+def run_episode_headless(
+    solve_fn: Callable, seed: int = 0, engine: str = "list", spawn_sequence: Optional[List[float]] = None,
+    spec: Optional[BoardSpec] = None, time_control: Optional[TimeControl] = None,
+) -> Dict:
     np.random.seed(seed)
-    game = GameLogic()
-    next_value = game.get_random_value()
+    game = ENGINES[engine](seed=seed, spawn_sequence=spawn_sequence, spec=spec)
+    next_value = game.get_next_value()
     total_merges = 0
     total_moves = 0
-    while True:
-        matrix = game.get_matrix()
-        if game_over(matrix, next_value):
-            break
-        action = solve_fn(matrix, next_value)
-        merged, count = game.add_to_column(next_value, action)
-        if not merged:
+    while not game.is_game_over(next_value):
+        deadline = time_control.deadline() if time_control else None
+        action = solve_fn(game.get_matrix(), next_value, deadline)
+        turn = game.play_turn(action)
+        if not turn.accepted:
             break
-        total_merges += count
+        total_merges += turn.reward
         total_moves += 1
-        new_matrix = rearrange(game.get_matrix())
-        game.set_matrix(new_matrix)
-        game.merge_column()
-        next_value = game.get_random_value()
+        next_value = turn.next_value
     final_score = game.get_score() if hasattr(game, "get_score") else total_merges
     return {
         "score": float(final_score),
@@ -33,42 +42,92 @@ def run_episode_headless(solve_fn: Callable, seed: int = 0) -> Dict:
     }
 
 
-def make_fixed_linear():
+def run_lockstep_headless(
+    solve_many: Callable, seeds: List[int], engine: str = "list",
+    spawn_sequences: Optional[Dict[int, List[float]]] = None, spec: Optional[BoardSpec] = None,
+) -> List[Dict]:
+    np.random.seed(seeds[0] if seeds else 0)
+    games = [
+        ENGINES[engine](
+            seed=seed, spawn_sequence=spawn_sequences[seed] if spawn_sequences else None, spec=spec
+        )
+        for seed in seeds
+    ]
+    next_values = [game.get_next_value() for game in games]
+    total_merges = [0] * len(games)
+    total_moves = [0] * len(games)
+    active = [i for i, game in enumerate(games) if not game.is_game_over(next_values[i])]
+    while active:
+        actions = solve_many([games[i].get_matrix() for i in active], [next_values[i] for i in active])
+        still_active = []
+        for i, action in zip(active, actions):
+            turn = games[i].play_turn(action)
+            if not turn.accepted:
+                continue
+            total_merges[i] += turn.reward
+            total_moves[i] += 1
+            next_values[i] = turn.next_value
+            if not games[i].is_game_over(next_values[i]):
+                still_active.append(i)
+        active = still_active
+    return [
+        {
+            "score": float(game.get_score() if hasattr(game, "get_score") else merges),
+            "moves": moves,
+            "merge_efficiency": merges / max(moves, 1),
+        }
+        for game, merges, moves in zip(games, total_merges, total_moves)
+    ]
+
+
+def make_fixed_linear(spec=None, frozen=False):
     from agents.heuristic.fixed_linear import FixedLinearBot
-    bot = FixedLinearBot()
-    return lambda m, v: bot.solve(m, v)
+    bot = FixedLinearBot(spec, frozen)
+    return bot
 
 
-def make_adaptive_linear():
+def make_adaptive_linear(spec=None, frozen=False):
     from agents.heuristic.adaptive_linear import AdaptiveLinearBot
-    bot = AdaptiveLinearBot()
-    return lambda m, v: bot.solve(m, v)
+    bot = AdaptiveLinearBot(spec, frozen)
+    return bot
 
 
-def make_linear():
+def make_linear(spec=None, frozen=False):
     from agents.heuristic.linear import LinearBot
-    bot = LinearBot()
-    return lambda m, v: bot.solve(m, v)
+    bot = LinearBot(spec, frozen)
+    return bot
 
 
-def make_basic_bot():
+def make_basic_bot(spec=None, frozen=False):
     from agents.heuristic.basic_bot import BasicBot
-    bot = BasicBot()
-    return lambda m, v: bot.solve(m, v)
+    bot = BasicBot(spec, frozen)
+    return bot
+
+
+def make_expectimax(spec=None, depth: int = 3, time_budget: float = 0.02):
+    from agents.heuristic.expectimax import ExpectimaxBot
+    bot = ExpectimaxBot(spec, depth=depth, time_budget=time_budget)
+    return bot
+
+
+def make_mcts(spec=None, time_budget: float = 0.02, iterations: Optional[int] = None, seed: int = 0):
+    from agents.heuristic.mcts import MCTSBot
+    bot = MCTSBot(spec, time_budget=time_budget, iterations=iterations, seed=seed)
+    return bot
 
 
-def make_no_teacher(model_path: str = "data/rl_no_teacher_agent.json"):
+def make_no_teacher(model_path: str = "data/rl_no_teacher_agent.json", spec=None):
     from agents.rl.standard import NoTeacherAgent
-    agent = NoTeacherAgent()
+    agent = NoTeacherAgent(spec=spec)
     agent.load(model_path)
-    return lambda m, v: agent.select_action(m, v, epsilon=0.0)
+    return agent
 
 
-def make_teacher_rl(model_path: str = "data/rl_agent.json"):
+def make_teacher_rl(model_path: str = "data/rl_agent.json", spec=None):
     from agents.rl.teacher import RLAgent
-    agent = RLAgent()
+    agent = RLAgent(spec=spec)
     agent.load(model_path)
-    return lambda m, v: agent.select_action(m, v, deterministic=True)
+    return agent
 
 
 AGENTS = [
@@ -76,17 +135,54 @@ AGENTS = [
     ("AdaptiveLinear",   make_adaptive_linear),
     ("LinearBot",        make_linear),
     ("BasicBot",         make_basic_bot),
+    ("Expectimax",       make_expectimax),
+    ("MCTS",             make_mcts),
     ("NoTeacherRL",      make_no_teacher),
     ("TeacherRL",        make_teacher_rl),
 ]
 
+RL_AGENTS = ("NoTeacherRL", "TeacherRL")
 
-def evaluate_agent(name: str, factory_fn: Callable, n_episodes: int, n_seeds: int) -> Dict:
+LEARNING_AGENTS = ("FixedLinearBot", "AdaptiveLinear", "LinearBot", "BasicBot")
+
+
+def episode_seeds(n_episodes: int, n_seeds: int) -> List[int]:
+    return [seed * 10000 + ep for seed in range(n_seeds) for ep in range(n_episodes)]
+
+
+def draw_spawn_sequences(n_episodes: int, n_seeds: int, length: int) -> Dict[int, List[float]]:
+    return {
+        seed: SpawnSequence.from_seed(seed, length).draws
+        for seed in episode_seeds(n_episodes, n_seeds)
+    }
+
+
+def evaluate_agent(
+    name: str, factory_fn: Callable, n_episodes: int, n_seeds: int, engine: str = "list",
+    spawn_sequences: Optional[Dict[int, List[float]]] = None, spec: Optional[BoardSpec] = None,
+    time_control: Optional[TimeControl] = None, lockstep: bool = False,
+) -> Dict:
     all_scores, all_moves, all_efficiency = [], [], []
+    latency = LatencyTracker()
     for seed in range(n_seeds):
-        solve_fn = factory_fn()
+        agent = factory_fn(spec=spec)
+        agent.latency = latency
+        if lockstep:
+            seeds = [seed * 10000 + ep for ep in range(n_episodes)]
+            for result in run_lockstep_headless(
+                agent.act_many, seeds, engine, spawn_sequences, spec
+            ):
+                all_scores.append(result["score"])
+                all_moves.append(result["moves"])
+                all_efficiency.append(result["merge_efficiency"])
+            continue
         for ep in range(n_episodes):
-            result = run_episode_headless(solve_fn, seed=seed * 10000 + ep)
+            episode_seed = seed * 10000 + ep
+            sequence = spawn_sequences[episode_seed] if spawn_sequences else None
+            result = run_episode_headless(
+                agent.act, seed=episode_seed, engine=engine, spawn_sequence=sequence, spec=spec,
+                time_control=time_control,
+            )
             all_scores.append(result["score"])
             all_moves.append(result["moves"])
             all_efficiency.append(result["merge_efficiency"])
@@ -98,14 +194,16 @@ def evaluate_agent(name: str, factory_fn: Callable, n_episodes: int, n_seeds: in
         "mean_moves":       float(np.mean(all_moves)),
         "merge_efficiency": float(np.mean(all_efficiency)),
         "n_runs":           len(all_scores),
+        "latency":          latency.summary(),
     }
 
 
-def print_table(results: List[Dict]):
+def print_table(results: List[Dict], time_control: Optional[TimeControl] = None, lockstep: bool = False):
     results_sorted = sorted(results, key=lambda r: r["mean_score"])
     header = (
         f"{'Rank':<5} {'Agent':<18} {'Mean Score':>12} {'± Std':>9} "
-        f"{'Max Score':>10} {'Avg Moves':>10} {'Merge/Move':>11}"
+        f"{'Max Score':>10} {'Avg Moves':>10} {'Merge/Move':>11} "
+        f"{'ms/Move':>8} {'p95 ms':>8} {'Overrun':>8}"
     )
     print("\n" + "─" * len(header))
     print(header)
@@ -117,10 +215,18 @@ def print_table(results: List[Dict]):
             f"{r['std_score']:>9.1f} "
             f"{r['max_score']:>10.1f} "
             f"{r['mean_moves']:>10.1f} "
-            f"{r['merge_efficiency']:>11.3f}"
+            f"{r['merge_efficiency']:>11.3f} "
+            f"{r['latency']['mean_ms']:>8.2f} "
+            f"{r['latency']['p95_ms']:>8.2f} "
+            f"{r['latency']['overruns']:>8}"
         )
     print("─" * len(header))
-    print(f"  (Each agent evaluated over {results_sorted[0]['n_runs']} total runs)\n")
+    print(f"  (Each agent evaluated over {results_sorted[0]['n_runs']} total runs)")
+    if time_control is not None:
+        print(f"  (Time control: {time_control})")
+    if lockstep:
+        print("  (Lockstep: episodes of each seed decided together with solve_many)")
+    print()
 
 
 def main():
@@ -136,18 +242,48 @@ def main():
     parser.add_argument("--teacher-path", type=str, default="data/rl_agent.json")
     parser.add_argument("--skip-rl", action="store_true",
                         help="Skip RL agents")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="list",
+                        help="Game engine backend")
+    parser.add_argument("--spawn-length", type=int, default=0,
+                        help="Pre-draw this many spawns per episode so every agent "
+                             "sees the same tile sequence; longer games continue on the "
+                             "episode seed's stream (0 to seed each game instead)")
+    parser.add_argument("--rows", type=int, default=GRID_LENGTH,
+                        help="Board rows")
+    parser.add_argument("--cols", type=int, default=GRID_WIDTH,
+                        help="Board columns")
+    parser.add_argument("--move-time", type=float, default=None,
+                        help="Seconds per move given to every agent (fixed time control)")
+    parser.add_argument("--move-nodes", type=int, default=None,
+                        help="Search nodes/iterations per move given to every agent")
+    parser.add_argument("--frozen", action="store_true",
+                        help="Run the heuristic bots in frozen inference mode (no weight updates)")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="Play each seed's episodes side by side and batch every move with solve_many")
     args = parser.parse_args()
-    agents_to_run = AGENTS if not args.skip_rl else AGENTS[:4]
+    if args.lockstep and (args.move_time is not None or args.move_nodes is not None):
+        parser.error("--lockstep batches moves without deadlines; drop --move-time/--move-nodes")
+    spec = BoardSpec(args.rows, args.cols)
+    time_control = (
+        TimeControl(args.move_time, args.move_nodes)
+        if args.move_time is not None or args.move_nodes is not None else None
+    )
+    agents_to_run = AGENTS if not args.skip_rl else [a for a in AGENTS if a[0] not in RL_AGENTS]
+    sequences = (
+        draw_spawn_sequences(args.episodes, args.seeds, args.spawn_length)
+        if args.spawn_length else None
+    )
     results = []
     for name, factory in agents_to_run:
+        if args.frozen and name in LEARNING_AGENTS:
+            factory = functools.partial(factory, frozen=True)
         print(f"  Evaluating {name} ...", flush=True)
-        try:
-            r = evaluate_agent(name, factory, args.episodes, args.seeds)
-            results.append(r)
-        except Exception as e:
-            print(f"    ⚠  Skipped {name}: {e}")
+        results.append(evaluate_agent(
+            name, factory, args.episodes, args.seeds, args.engine, sequences, spec, time_control,
+            args.lockstep,
+        ))
     if results:
-        print_table(results)
+        print_table(results, time_control, args.lockstep)
 
 
 if __name__ == "__main__":
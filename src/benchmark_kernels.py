@@ -0,0 +1,163 @@
+import argparse
+import random
+import time
+import timeit
+from queue import Queue
+from typing import Callable, Dict, List
+import numpy as np
+from config.constants import GRID_LENGTH, GRID_WIDTH
+from core.utils.board_spec import DEFAULT_SPEC, BoardSpec
+from core.game_logic import GameLogic
+from core.vec_game_logic import VecGameLogic
+from core.utils.core_utils import rearrange
+from core.utils import jit_kernels
+from agents.heuristic.basic_bot import BasicBot
+
+
+def _rearrange_queue(matrix, column=None):
+    rows = len(matrix)
+    columns = range(len(matrix[0])) if column is None else [column]
+    for i in columns:
+        queue = Queue()
+        for j in range(rows):
+            if matrix[j][i] != 0:
+                queue.put(matrix[j][i])
+        for j in range(rows):
+            matrix[j][i] = 0
+        for j in range(queue.qsize()):
+            matrix[j][i] = queue.get()
+    return matrix
+
+
+def random_boards(n: int, seed: int = 0, holes: float = 0.3, spec: BoardSpec = DEFAULT_SPEC) -> List[List[List[int]]]:
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(n):
+        boards.append([
+            [0 if rng.random() < holes else 2 ** rng.randint(1, 10) for _ in range(spec.cols)]
+            for _ in range(spec.rows)
+        ])
+    return boards
+
+
+def time_kernel(fn: Callable, boards: List, repeat: int) -> float:
+    def copy_only():
+        for board in boards:
+            [row[:] for row in board]
+
+    def run():
+        for board in boards:
+            fn([row[:] for row in board])
+
+    overhead = min(timeit.repeat(copy_only, number=1, repeat=repeat))
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return max(best - overhead, 0.0) / len(boards) * 1e6
+
+
+def compare(label: str, baseline: Callable, candidate: Callable, boards: List, repeat: int) -> Dict:
+    for board in boards:
+        assert baseline([row[:] for row in board]) == candidate([row[:] for row in board])
+    before = time_kernel(baseline, boards, repeat)
+    after = time_kernel(candidate, boards, repeat)
+    return {"name": label, "baseline_us": before, "candidate_us": after, "speedup": before / after if after else float("inf")}
+
+
+KERNELS = [
+    ("rearrange",        lambda m: _rearrange_queue(m),      lambda m: rearrange(m)),
+    ("rearrange(col=2)", lambda m: _rearrange_queue(m, 2),   lambda m: rearrange(m, 2)),
+]
+
+
+def jit_kernel_pairs(spec: BoardSpec = DEFAULT_SPEC) -> List:
+    bot = BasicBot(spec)
+    column = spec.cols // 2
+    return [
+        ("simulate_move (jit)",
+         lambda m: bot.simulate_move(m, column, 4),
+         lambda m: jit_kernels.simulate_move(m, column, 4, spec)),
+        ("features (jit)",
+         lambda m: bot.compute_features(0, m, 0, 0),
+         lambda m: bot.evaluator._compute_features_flat(0, m, 0, 0)),
+    ]
+
+
+def compare_jit(boards: List, repeat: int, spec: BoardSpec = DEFAULT_SPEC) -> List[Dict]:
+    if not jit_kernels.NUMBA_AVAILABLE:
+        print("numba not installed; JIT kernels skipped (pure-Python fallback in use)")
+        return []
+    boards = [rearrange([row[:] for row in board]) for board in boards]
+    enabled = jit_kernels.ENABLED
+    jit_kernels.set_enabled(False)
+    try:
+        return [
+            compare(name, baseline, candidate, boards, repeat)
+            for name, baseline, candidate in jit_kernel_pairs(spec)
+        ]
+    finally:
+        jit_kernels.set_enabled(enabled)
+
+
+def compare_vec(n_games: int, steps: int, seed: int, spec: BoardSpec = DEFAULT_SPEC) -> Dict:
+    rng = random.Random(seed)
+    game = GameLogic(seed=seed, spec=spec)
+    start = time.perf_counter()
+    for _ in range(steps * 10):
+        turn = game.play_turn(rng.randrange(spec.cols))
+        if not turn.accepted or turn.done:
+            game.reset()
+    before = (time.perf_counter() - start) / (steps * 10) * 1e6
+    vec = VecGameLogic(n_games, seed=seed, spec=spec)
+    actions = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        vec.step(actions.integers(0, spec.cols, size=n_games))
+        vec.reset(np.flatnonzero(vec.get_done()))
+    after = (time.perf_counter() - start) / (steps * n_games) * 1e6
+    return {"name": f"turn (vec x{n_games})", "baseline_us": before, "candidate_us": after,
+            "speedup": before / after if after else float("inf")}
+
+
+def print_table(results: List[Dict]):
+    header = f"{'Kernel':<22} {'Baseline µs':>12} {'Current µs':>11} {'Speedup':>8}"
+    print("\n" + "─" * len(header))
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        print(
+            f"{r['name']:<22} "
+            f"{r['baseline_us']:>12.2f} "
+            f"{r['candidate_us']:>11.2f} "
+            f"{r['speedup']:>7.1f}x"
+        )
+    print("─" * len(header) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="M2MasterBot — engine kernel micro-benchmarks"
+    )
+    parser.add_argument("--boards", type=int, default=2000,
+                        help="Random boards per kernel")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vec-games", type=int, default=512,
+                        help="Games stepped together by VecGameLogic (0 to skip)")
+    parser.add_argument("--vec-steps", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=GRID_LENGTH)
+    parser.add_argument("--cols", type=int, default=GRID_WIDTH)
+    args = parser.parse_args()
+    spec = BoardSpec(args.rows, args.cols)
+    boards = random_boards(args.boards, args.seed, spec=spec)
+    results = [
+        compare(name, baseline, candidate, boards, args.repeat)
+        for name, baseline, candidate in KERNELS
+    ]
+    results.extend(compare_jit(boards, args.repeat, spec))
+    if args.vec_games:
+        results.append(compare_vec(args.vec_games, args.vec_steps, args.seed, spec))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+from collections import namedtuple
+from core.game_logic import GameLogic, TurnResult
+from core.utils.board_spec import as_spec
+from core.utils.column_table import build_entry
+from core.utils.core_utils import MergeEvent, spawn_choice, spawn_table
+from core.utils.exponent_table import EXPONENT
+from core.utils.transposition_table import TranspositionTable
+
+CELL_BITS = 8
+CELL_MASK = (1 << CELL_BITS) - 1
+TABLE_LIMIT = 1 << 16
+
+Layout = namedtuple(
+    "Layout", ["rows", "cols", "cells", "column_bits", "column_mask", "low", "seven", "high", "below_top", "top"]
+)
+
+_TABLE = TranspositionTable(TABLE_LIMIT, "lru")
+
+
+def _lanes(spec, byte, keep=lambda row: True):
+    board = 0
+    for column in range(spec.cols):
+        for row in range(spec.rows):
+            if keep(row):
+                board |= byte << (column * spec.rows + row) * CELL_BITS
+    return board
+
+
+def _build_layout(spec):
+    column_bits = spec.rows * CELL_BITS
+    return Layout(
+        spec.rows, spec.cols, spec.cells, column_bits, (1 << column_bits) - 1,
+        _lanes(spec, 0x01), _lanes(spec, 0x7F), _lanes(spec, 0x80),
+        _lanes(spec, 0x80, lambda row: row < spec.rows - 1),
+        _lanes(spec, 0x80, lambda row: row == spec.rows - 1),
+    )
+
+
+def layout(spec=None):
+    return as_spec(spec).cached("bitboard_layout", _build_layout)
+
+
+def encode(matrix, spec=None):
+    spec = as_spec(spec)
+    cells = bytearray(spec.cells)
+    for row, values in enumerate(matrix):
+        for column, value in enumerate(values):
+            cells[column * spec.rows + row] = EXPONENT[value]
+    return int.from_bytes(cells, "little")
+
+
+def decode(board, spec=None):
+    spec = as_spec(spec)
+    rows = spec.rows
+    cells = board.to_bytes(spec.cells, "little")
+    return [
+        [1 << cells[index] if cells[index] else 0 for index in range(row, spec.cells, rows)]
+        for row in range(rows)
+    ]
+
+
+def nonzero_lanes(board, lay):
+    return ((board & lay.seven) + lay.seven | board) & lay.high
+
+
+def equal_lanes(a, b, lay):
+    return lay.high & ~nonzero_lanes(a ^ b, lay)
+
+
+def lanes_below(board, exponent, lay):
+    return lay.high & ~((board | lay.high) - exponent * lay.low)
+
+
+def has_merge(board, lay):
+    filled = nonzero_lanes(board, lay)
+    vertical = equal_lanes(board, board >> CELL_BITS, lay) & lay.below_top
+    horizontal = equal_lanes(board, board >> lay.column_bits, lay)
+    return bool((vertical | horizontal) & filled)
+
+
+def has_holes(board, lay):
+    filled = nonzero_lanes(board, lay)
+    return bool(lay.below_top & ~filled & filled >> CELL_BITS)
+
+
+def max_exponent(board, lay):
+    return max(board.to_bytes(lay.cells, "little"))
+
+
+def purge_lanes(board, count, lay):
+    return nonzero_lanes(board, lay) & lanes_below(board, count + 1, lay)
+
+
+def column_entry(packed, value, lay):
+    key = EXPONENT[value] << lay.column_bits | packed
+    entry = _TABLE.get(key)
+    if entry is None:
+        cells = packed.to_bytes(lay.rows, "little")
+        entry = build_entry(tuple(1 << exp if exp else 0 for exp in cells), value)
+        if entry[0] is not None:
+            entry = (int.from_bytes(bytes(EXPONENT[v] for v in entry[0]), "little"),) + entry[1:]
+        _TABLE.store(key, entry)
+    return entry
+
+
+class BitboardGameLogic:
+    def __init__(self, seed=None, rng=None, spawn_sequence=None, spec=None):
+        self._spec = as_spec(spec)
+        self._layout = layout(self._spec)
+        self._fallback = GameLogic(seed, rng, spawn_sequence, self._spec)
+        self._rng = self._fallback.get_rng()
+        self._board = 0
+        self._score = 0
+        self._next_value = None
+
+    def reset(self):
+        self._board = 0
+        self._score = 0
+        self._next_value = None
+
+    def snapshot(self):
+        return (self._board, self._score, self._next_value)
+
+    def restore(self, snapshot):
+        self._board, self._score, self._next_value = snapshot
+
+    def get_spec(self):
+        return self._spec
+
+    def get_matrix(self):
+        return decode(self._board, self._spec)
+
+    def set_matrix(self, matrix):
+        self._board = encode(matrix, self._spec)
+
+    def get_score(self):
+        return self._score
+
+    def seed(self, seed=None, rng=None, spawn_sequence=None):
+        self._fallback.seed(seed, rng, spawn_sequence)
+        self._rng = self._fallback.get_rng()
+
+    def get_rng(self):
+        return self._rng
+
+    def max_tile(self):
+        exponent = max_exponent(self._board, self._layout)
+        return 1 << exponent if exponent else 0
+
+    def empty_count(self):
+        return self._spec.cells - nonzero_lanes(self._board, self._layout).bit_count()
+
+    def column_height(self, column):
+        lay = self._layout
+        return (nonzero_lanes(self._board, lay) >> column * lay.column_bits & lay.column_mask).bit_count()
+
+    def column_heights(self):
+        return tuple(self.column_height(column) for column in range(self._spec.cols))
+
+    def is_game_over(self, value):
+        lay = self._layout
+        if nonzero_lanes(self._board, lay) != lay.high:
+            return False
+        return not equal_lanes(self._board, EXPONENT[value] * lay.low, lay) & lay.top
+
+    def spawn_choices(self):
+        choices, purge_values = spawn_table(max_exponent(self._board, self._layout))
+        if purge_values:
+            purged = purge_lanes(self._board, len(purge_values), self._layout)
+            self._board &= ~((purged >> 7) * CELL_MASK)
+        return choices
+
+    def get_random_value(self):
+        value = spawn_choice(self.spawn_choices(), self._rng)
+        self._next_value = value
+        return value
+
+    def get_next_value(self):
+        if self._next_value is None:
+            return self.get_random_value()
+        return self._next_value
+
+    def set_next_value(self, value):
+        self._next_value = value
+
+    def step(self, column: int):
+        value = self.get_random_value()
+        success, merge_count = self.add_to_column(value, column)
+        return (merge_count, not success)
+
+    def _drop(self, value, column):
+        lay = self._layout
+        shift = column * lay.column_bits
+        entry = column_entry(self._board >> shift & lay.column_mask, value, lay)
+        if entry[0] is None:
+            return (self._board, entry)
+        if entry[5] and not self._isolated(column, entry[5]):
+            return None
+        return (self._board & ~(lay.column_mask << shift) | entry[0] << shift, entry)
+
+    def _isolated(self, column, checks):
+        lay = self._layout
+        board = self._board
+        for row, mask in checks:
+            shift = (column * lay.rows + row) * CELL_BITS
+            if column > 0 and mask >> (board >> shift - lay.column_bits & CELL_MASK) & 1:
+                return False
+            if column + 1 < lay.cols and mask >> (board >> shift + lay.column_bits & CELL_MASK) & 1:
+                return False
+        return True
+
+    def _settled(self, board):
+        lay = self._layout
+        if has_holes(board, lay) or has_merge(board, lay):
+            return False
+        purge_values = spawn_table(max_exponent(board, lay))[1]
+        return not (purge_values and purge_lanes(board, len(purge_values), lay))
+
+    def _delegate(self):
+        game = self._fallback
+        game.set_matrix(decode(self._board, self._spec))
+        game.set_next_value(self._next_value)
+        return game, game.get_score()
+
+    def _adopt(self, game, score):
+        self._board = encode(game.get_matrix(), self._spec)
+        self._score += game.get_score() - score
+
+    def add_to_column(self, value, column):
+        drop = self._drop(value, column)
+        if drop is None or drop[1][0] is not None and not drop[1][1] and has_merge(drop[0], self._layout):
+            game, score = self._delegate()
+            result = game.add_to_column(value, column)
+            self._adopt(game, score)
+            return result
+        board, entry = drop
+        if entry[0] is None:
+            return (False, 0)
+        self._board = board
+        self._score += entry[2]
+        return (True, entry[4])
+
+    def play_turn(self, column):
+        value = self.get_next_value()
+        drop = self._drop(value, column)
+        if drop is not None and drop[1][0] is None:
+            return TurnResult(False, 0, 0, 0, False, value, ())
+        if drop is None or not self._settled(drop[0]):
+            game, score = self._delegate()
+            turn = game.play_turn(column)
+            self._adopt(game, score)
+            self._next_value = turn.next_value
+            return turn
+        board, (_, full, gained, _, max_count, _, column_events) = drop
+        events = [
+            MergeEvent(tuple((row, column) for row in sources), (target, column), merged)
+            for sources, target, merged in column_events
+        ]
+        if full:
+            events.insert(0, MergeEvent((), (self._spec.rows - 1, column), value * 2))
+        self._board = board
+        self._score += gained
+        next_value = self.get_random_value()
+        return TurnResult(
+            True, max_count, len(events), gained, self.is_game_over(next_value), next_value, tuple(events)
+        )
+
+    def merge_column(self, column=-1):
+        game, score = self._delegate()
+        result = game.merge_column(column)
+        self._adopt(game, score)
+        return result
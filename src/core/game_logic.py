@@ -1,24 +1,171 @@
-from config.constants import GRID_LENGTH, GRID_WIDTH
-from core.utils.core_utils import rearrange, merge_column, random_value
+from collections import namedtuple
+import numpy as np
+from core.utils.core_utils import (
+    merge_column,
+    MergeEvent,
+    PurgeEvent,
+    compact_tracked,
+    spawn_choice,
+    has_merge,
+    resolve_cascade,
+    spawn_distribution,
+    make_rng,
+    resolve_tracked,
+)
+from core.utils.column_table import apply_drop
+from core.utils.board_spec import as_spec
+from core.utils.zobrist import zobrist_keys
+
+
+class TurnResult(namedtuple(
+    "TurnResult",
+    ["accepted", "reward", "merges", "score_delta", "done", "next_value", "events"],
+)):
+    """``events`` holds the turn's MergeEvents whether or not anyone is subscribed.
+
+    Listeners are called as ``listener(turn, stream)``, where ``stream`` is the full
+    Move/Merge/Purge sequence that replays the turn.
+    """
+
+    __slots__ = ()
 
 
 class GameLogic:
-    def __init__(self):
-        self._matrix = [[0] * GRID_WIDTH for i in range(GRID_LENGTH)]
+    def __init__(self, seed=None, rng=None, spawn_sequence=None, spec=None):
+        self._spec = as_spec(spec)
+        self._rows = self._spec.rows
+        self._cols = self._spec.cols
+        self._cell_count = self._spec.cells
+        self._keys = zobrist_keys(self._spec)
+        self._rng = make_rng(seed, rng, spawn_sequence)
+        self._matrix = self._spec.empty_matrix()
         self._score = 0
+        self._next_value = None
+        self._drop_events = []
+        self._listeners = []
+        self._log = None
+        self._journal = []
+        self._exponents = None
+        self._refresh_stats()
 
     def _reset(self):
-        self._matrix = [[0] * GRID_WIDTH for i in range(GRID_LENGTH)]
+        self._matrix = self._spec.empty_matrix()
         self._score = 0
+        self._next_value = None
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        self._heights = [0] * self._cols
+        self._column_max = [0] * self._cols
+        self._column_hash = [0] * self._cols
+        self._filled = 0
+        self._hash = 0
+        self._refresh_columns(range(self._cols))
+
+    def _refresh_columns(self, columns):
+        keys = self._keys
+        for column in columns:
+            height = 0
+            top = 0
+            h = 0
+            for row, cells in enumerate(self._matrix):
+                value = cells[column]
+                if value:
+                    height += 1
+                    if value > top:
+                        top = value
+                    h ^= keys[row][column][value.bit_length() - 1]
+            self._filled += height - self._heights[column]
+            self._heights[column] = height
+            self._column_max[column] = top
+            self._hash ^= self._column_hash[column] ^ h
+            self._column_hash[column] = h
+            if self._exponents is not None:
+                self._sync_exponents(column)
+
+    def _sync_exponents(self, column):
+        self._exponents[:, column] = [
+            row[column].bit_length() - 1 if row[column] else 0 for row in self._matrix
+        ]
+
+    def exponent_view(self):
+        if self._exponents is None:
+            self._exponents = np.zeros((self._rows, self._cols), dtype=np.int8)
+            for column in range(self._cols):
+                self._sync_exponents(column)
+        view = self._exponents.view()
+        view.flags.writeable = False
+        return view
 
     def reset(self):
         self._reset()
+        self._journal = []
+
+    def snapshot(self):
+        return (
+            tuple(tuple(row) for row in self._matrix),
+            self._score,
+            tuple(self._heights),
+            tuple(self._column_max),
+            tuple(self._column_hash),
+            self._filled,
+            self._hash,
+            self._next_value,
+        )
+
+    def restore(self, snapshot):
+        (
+            rows, self._score, heights, column_max, column_hash,
+            self._filled, self._hash, self._next_value,
+        ) = snapshot
+        for row, saved in zip(self._matrix, rows):
+            row[:] = saved
+        self._heights[:] = heights
+        self._column_max[:] = column_max
+        self._column_hash[:] = column_hash
+        if self._exponents is not None:
+            for column in range(self._cols):
+                self._sync_exponents(column)
+
+    def push(self, value, column):
+        self._journal.append(self.snapshot())
+        return self.add_to_column(value, column)
+
+    def pop(self):
+        self.restore(self._journal.pop())
+
+    def undo_depth(self):
+        return len(self._journal)
+
+    def get_spec(self):
+        return self._spec
 
     def get_matrix(self):
         return self._matrix
 
     def set_matrix(self, matrix):
         self._matrix = matrix
+        self._refresh_stats()
+
+    def get_hash(self):
+        return self._hash
+
+    def max_tile(self):
+        return max(self._column_max)
+
+    def empty_count(self):
+        return self._cell_count - self._filled
+
+    def column_heights(self):
+        return tuple(self._heights)
+
+    def column_height(self, column):
+        return self._heights[column]
+
+    def is_game_over(self, value):
+        if self._filled < self._cell_count:
+            return False
+        return value not in self._matrix[self._rows - 1]
 
     def step(self, column: int):
         value = self.get_random_value()
@@ -30,58 +177,187 @@ class GameLogic:
     def get_score(self):
         return self._score
 
+    def seed(self, seed=None, rng=None, spawn_sequence=None):
+        self._rng = make_rng(seed, rng, spawn_sequence)
+
+    def get_rng(self):
+        return self._rng
+
+    def spawn_choices(self):
+        choices, purge_values = spawn_distribution(self.max_tile())
+        if purge_values:
+            self._purge(purge_values)
+        return choices
+
     def get_random_value(self):
-        value, matrix = random_value(self._matrix)
-        self._matrix = matrix
+        value = spawn_choice(self.spawn_choices(), self._rng)
+        self._next_value = value
         return value
 
+    def get_next_value(self):
+        if self._next_value is None:
+            return self.get_random_value()
+        return self._next_value
+
+    def set_next_value(self, value):
+        self._next_value = value
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _purge(self, purge_values):
+        purge = set(purge_values)
+        touched = set()
+        for i, row in enumerate(self._matrix):
+            for j, value in enumerate(row):
+                if value in purge:
+                    row[j] = 0
+                    touched.add(j)
+                    if self._log is not None:
+                        self._log.append(PurgeEvent((i, j), value))
+        self._refresh_columns(touched)
+
+    def _compact(self):
+        changed = []
+        for column in range(self._cols):
+            compact_tracked(self._matrix, column, changed, self._log)
+        if changed:
+            self._refresh_columns({column for _, column in changed})
+
+    def _settle(self):
+        self._compact()
+        purge_values = spawn_distribution(self.max_tile())[1]
+        if purge_values:
+            self._purge(purge_values)
+        if has_merge(self._matrix):
+            return self.resolve_merges()
+        return (0, [])
+
+    def push_turn(self, value, column):
+        self._journal.append(self.snapshot())
+        score = self._score
+        accepted, _ = self.add_to_column(value, column)
+        if not accepted:
+            return (False, 0, 0)
+        merges = len(self._drop_events)
+        settled, _ = self._settle()
+        return (True, merges + settled, self._score - score)
+
+    def play_turn(self, column):
+        value = self.get_next_value()
+        score = self._score
+        if self._listeners:
+            self._log = []
+        try:
+            accepted, reward = self.add_to_column(value, column)
+            if not accepted:
+                return TurnResult(False, 0, 0, 0, False, value, ())
+            merges = len(self._drop_events)
+            events = self._drop_events
+            settled, settle_events = self._settle()
+            merges += settled
+            events = events + settle_events
+            stream = tuple(events if self._log is None else self._log)
+            next_value = self.get_random_value()
+            turn = TurnResult(
+                True, reward, merges, self._score - score,
+                self.is_game_over(next_value), next_value, tuple(events),
+            )
+        finally:
+            self._log = None
+        for listener in self._listeners:
+            listener(turn, stream)
+        return turn
+
     def can_merge_last_row(self, column, value):
-        last_row = GRID_LENGTH - 1
+        last_row = self._rows - 1
         return self._matrix[last_row][column] == value
 
     def add_to_column(self, value, column):
+        if self._log is not None:
+            return self._add_to_column_general(value, column)
+        entry = apply_drop(self._matrix, column, value)
+        if entry is None:
+            return self._add_to_column_general(value, column)
+        cells, full, gained, merges, max_count, _, column_events = entry
+        self._drop_events = [
+            MergeEvent(tuple((row, column) for row in sources), (target, column), merged)
+            for sources, target, merged in column_events
+        ]
+        if cells is None:
+            return (False, 0)
+        self._score += gained
+        self._refresh_columns((column,))
+        if full:
+            self._drop_events.insert(0, MergeEvent((), (self._rows - 1, column), value * 2))
+            return (True, max_count)
+        count_merge = [max_count] if merges else []
+        return self._sweep_columns(count_merge)
+
+    def _add_to_column_general(self, value, column):
+        self._drop_events = []
+        last_row = self._rows - 1
         index = 0
-        count_merge = []
-        while True:
-            if index == GRID_LENGTH:
-                if self.can_merge_last_row(column, value):
-                    self._matrix[GRID_LENGTH - 1][column] *= 2
-                    self._score += self._matrix[GRID_LENGTH - 1][column]
-                    while True:
-                        merged, count = self.merge_column(column)
-                        if not merged:
-                            break
-                        count_merge.append(count)
-                        self._matrix = rearrange(self._matrix, column)
-                    merge_count = max(count_merge) if count_merge else count
-                    return (True, merge_count)
-                else:
-                    pass
-                    return (False, 0)
-            if self._matrix[index][column] == 0:
-                self._matrix[index][column] = value
-                while True:
-                    merged, count = self.merge_column(column)
-                    if not merged:
-                        break
-                    count_merge.append(count)
-                    self._matrix = rearrange(self._matrix, column)
-                break
-            else:
-                index += 1
-        for i in range(GRID_WIDTH):
-            while True:
-                merged, count = self.merge_column(i)
-                if not merged:
-                    break
-                count_merge.append(count)
-                self._matrix = rearrange(self._matrix)
-        count_merge.sort()
-        merge_count = count_merge[-1] if count_merge else 0
+        while index < self._rows and self._matrix[index][column] != 0:
+            index += 1
+        if index == self._rows:
+            if not self.can_merge_last_row(column, value):
+                return (False, 0)
+            self._matrix[last_row][column] *= 2
+            self._score += self._matrix[last_row][column]
+            doubled = MergeEvent((), (last_row, column), value * 2)
+            if self._log is not None:
+                self._log.append(doubled)
+            touched = {column}
+            self._matrix, gained, _, events, count = resolve_tracked(
+                self._matrix, column, column, touched, self._log
+            )
+            self._score += gained
+            self._refresh_columns(touched)
+            self._drop_events = [doubled] + events
+            count_merge = [event.count for event in events]
+            merge_count = max(count_merge) if count_merge else count
+            return (True, merge_count)
+        self._matrix[index][column] = value
+        touched = {column}
+        self._matrix, gained, _, events = resolve_cascade(
+            self._matrix, column, column, touched, self._log
+        )
+        self._score += gained
+        self._refresh_columns(touched)
+        self._drop_events = events
+        return self._sweep_columns([event.count for event in events])
+
+    def _sweep_columns(self, count_merge):
+        if not has_merge(self._matrix):
+            return (True, max(count_merge) if count_merge else 0)
+        touched = set()
+        for i in range(self._cols):
+            self._matrix, gained, _, events = resolve_cascade(
+                self._matrix, i, None, touched, self._log
+            )
+            self._score += gained
+            count_merge.extend(event.count for event in events)
+            self._drop_events.extend(events)
+        self._refresh_columns(touched)
+        merge_count = max(count_merge) if count_merge else 0
         return (True, merge_count)
 
+    def resolve_merges(self, column=-1):
+        touched = set()
+        self._matrix, gained, merge_count, events = resolve_cascade(
+            self._matrix, column, None, touched, self._log
+        )
+        self._score += gained
+        self._refresh_columns(touched)
+        return (merge_count, events)
+
     def merge_column(self, column=-1):
         merged, self._matrix, self._score, count = merge_column(
             self._matrix, self._score, column
         )
+        self._refresh_columns(range(self._cols))
         return (merged, count)
@@ -0,0 +1,68 @@
+import math
+import numpy as np
+from core.game_logic import GameLogic
+
+
+def compute_reward(score_delta, merge_count, empty_cells, merged, cell_count):
+    if not merged:
+        return -10.0
+    survival_bonus = empty_cells / cell_count
+    score_term = math.log2(score_delta + 1) * 0.5 if score_delta > 0 else 0.0
+    merge_bonus = merge_count / (merge_count + 2.0)
+    return score_term * 0.5 + survival_bonus * 0.3 + merge_bonus * 0.2
+
+
+class M2Env:
+    def __init__(self, seed=None, max_steps=None, spec=None):
+        self.game = GameLogic(seed=seed, spec=spec)
+        self.spec = self.game.get_spec()
+        self.max_steps = max_steps
+        self.steps = 0
+        self._board = self.game.exponent_view()
+
+    def _observation(self):
+        return {
+            "board": self._board,
+            "next_value": self.game.get_next_value().bit_length() - 1,
+        }
+
+    def _info(self, turn=None):
+        info = {"score": self.game.get_score(), "action_mask": self.action_mask()}
+        if turn is not None:
+            info.update(
+                accepted=turn.accepted,
+                merges=turn.merges,
+                score_delta=turn.score_delta,
+                events=turn.events,
+            )
+        return info
+
+    def action_mask(self):
+        next_value = self.game.get_next_value()
+        top = self.game.get_matrix()[self.spec.rows - 1]
+        return np.array(
+            [
+                self.game.column_height(column) < self.spec.rows or top[column] == next_value
+                for column in range(self.spec.cols)
+            ],
+            dtype=bool,
+        )
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.game.seed(seed)
+        self.game.reset()
+        self.steps = 0
+        return (self._observation(), self._info())
+
+    def step(self, action):
+        empty_cells = self.game.empty_count()
+        turn = self.game.play_turn(int(action))
+        self.steps += 1
+        reward = compute_reward(
+            float(turn.reward), float(turn.reward), empty_cells, turn.accepted,
+            self.spec.cells,
+        )
+        done = turn.done or not turn.accepted
+        truncated = not done and self.max_steps is not None and self.steps >= self.max_steps
+        return (self._observation(), reward, done, truncated, self._info(turn))
@@ -0,0 +1,45 @@
+from config.constants import GRID_LENGTH, GRID_WIDTH
+
+
+class BoardSpec:
+    _instances = {}
+
+    def __new__(cls, rows=GRID_LENGTH, cols=GRID_WIDTH):
+        key = (rows, cols)
+        spec = cls._instances.get(key)
+        if spec is None:
+            if rows < 1 or cols < 1:
+                raise ValueError(f"board must have at least one row and column, got {rows}x{cols}")
+            spec = super().__new__(cls)
+            spec.rows = rows
+            spec.cols = cols
+            spec.cells = rows * cols
+            spec._cache = {}
+            cls._instances[key] = spec
+        return spec
+
+    def __reduce__(self):
+        return (BoardSpec, (self.rows, self.cols))
+
+    def __repr__(self):
+        return f"BoardSpec(rows={self.rows}, cols={self.cols})"
+
+    def empty_matrix(self):
+        return [[0] * self.cols for _ in range(self.rows)]
+
+    def cached(self, name, build):
+        table = self._cache.get(name)
+        if table is None:
+            table = self._cache[name] = build(self)
+        return table
+
+
+DEFAULT_SPEC = BoardSpec()
+
+
+def as_spec(spec=None):
+    return DEFAULT_SPEC if spec is None else spec
+
+
+def spec_of(matrix):
+    return BoardSpec(len(matrix), len(matrix[0]))
@@ -0,0 +1,136 @@
+from core.utils.exponent_table import EXPONENT
+from core.utils.transposition_table import TranspositionTable
+
+TABLE_LIMIT = 1 << 16
+
+_TABLE = TranspositionTable(TABLE_LIMIT, "lru")
+
+
+def _merge_in_column(cells, row, value, masks):
+    bit = 1 << EXPONENT[value]
+    masks[row] |= bit
+    rows = len(cells)
+    count = 0
+    sources = []
+    visited = set()
+    for new_row in (row - 1, row + 1):
+        if not 0 <= new_row < rows or new_row in visited:
+            continue
+        visited.add(new_row)
+        if cells[new_row] != value:
+            continue
+        cells[new_row] = 0
+        count += 1
+        sources.append(new_row)
+        masks[new_row] |= bit
+        for sec_row in (new_row - 1, new_row + 1):
+            if not 0 <= sec_row < rows or sec_row in visited:
+                continue
+            visited.add(sec_row)
+            if cells[sec_row] == value:
+                cells[sec_row] = 0
+                count += 1
+                if sec_row != row:
+                    sources.append(sec_row)
+    if 2 <= count <= 4:
+        value <<= count - 1
+        cells[row] = value
+        return (True, value, count, tuple(sources))
+    return (False, 0, count, ())
+
+
+def _scan_column(cells, masks):
+    for row in range(len(cells)):
+        value = cells[row]
+        if value == 0:
+            continue
+        merged, gained, count, sources = _merge_in_column(cells, row, value, masks)
+        if merged:
+            return (True, gained, count, (sources, row, gained))
+    return (False, 0, 0, None)
+
+
+def _compact_column(cells):
+    write = 0
+    for read in range(len(cells)):
+        if cells[read]:
+            cells[write], cells[read] = cells[read], cells[write]
+            write += 1
+
+
+def _neighbor_checks(masks):
+    return tuple((row, mask) for row, mask in enumerate(masks) if mask)
+
+
+def build_entry(column_cells, value):
+    cells = list(column_cells)
+    rows = len(cells)
+    masks = [0] * rows
+    index = 0
+    while index < rows and cells[index] != 0:
+        index += 1
+    full = index == rows
+    gained = 0
+    if full:
+        if cells[rows - 1] != value:
+            return (None, True, 0, 0, 0, (), ())
+        cells[rows - 1] = value * 2
+        gained += value * 2
+    else:
+        cells[index] = value
+    merges = 0
+    max_count = 0
+    events = []
+    while True:
+        merged, score, count, event = _scan_column(cells, masks)
+        if not merged:
+            break
+        gained += score
+        merges += 1
+        max_count = max(max_count, count)
+        events.append(event)
+        _compact_column(cells)
+    return (tuple(cells), full, gained, merges, max_count, _neighbor_checks(masks), tuple(events))
+
+
+def lookup(matrix, column, value):
+    key = EXPONENT[value]
+    for row in matrix:
+        key = key << 6 | EXPONENT[row[column]]
+    entry = _TABLE.get(key)
+    if entry is None:
+        entry = build_entry(tuple([row[column] for row in matrix]), value)
+        _TABLE.store(key, entry)
+    return entry
+
+
+def is_isolated(matrix, column, checks):
+    left = column - 1
+    right = column + 1 if column + 1 < len(matrix[0]) else -1
+    for row, mask in checks:
+        cells = matrix[row]
+        if left >= 0 and mask >> EXPONENT[cells[left]] & 1:
+            return False
+        if right >= 0 and mask >> EXPONENT[cells[right]] & 1:
+            return False
+    return True
+
+
+def apply_drop(matrix, column, value):
+    entry = lookup(matrix, column, value)
+    cells = entry[0]
+    if cells is None:
+        return entry
+    if entry[5] and not is_isolated(matrix, column, entry[5]):
+        return None
+    for row, new_value in zip(matrix, cells):
+        row[column] = new_value
+    return entry
+
+
+def table_size():
+    return len(_TABLE)
+
+
+def clear_table():
+    _TABLE.clear()
@@ -1,12 +1,73 @@
+import heapq
 import random
-from queue import Queue
-from config.constants import GRID_LENGTH, GRID_WIDTH
+from collections import namedtuple
+from functools import lru_cache
 
 
-def _spawn_choice(choices):
+class MergeEvent(namedtuple("MergeEvent", ["sources", "target", "value"])):
+    __slots__ = ()
+
+    @property
+    def count(self):
+        return len(self.sources) + 1
+
+
+MoveEvent = namedtuple("MoveEvent", ["source", "target", "value"])
+
+PurgeEvent = namedtuple("PurgeEvent", ["cell", "value"])
+
+_DIRECTIONS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+
+
+class SpawnSequence:
+    def __init__(self, draws, seed=None):
+        self.draws = list(draws)
+        self.position = 0
+        self.seed = seed
+        self._fallback = None
+
+    @classmethod
+    def from_seed(cls, seed, length):
+        rng = random.Random(seed)
+        return cls((rng.random() for _ in range(length)), seed)
+
+    def random(self):
+        if self.position < len(self.draws):
+            draw = self.draws[self.position]
+            self.position += 1
+            return draw
+        if self.seed is None:
+            raise IndexError("spawn sequence exhausted")
+        if self._fallback is None:
+            self._fallback = random.Random(self.seed)
+            for _ in self.draws:
+                self._fallback.random()
+        return self._fallback.random()
+
+    def choices(self, population):
+        return [population[int(self.random() * len(population))]]
+
+    def rewind(self):
+        self.position = 0
+        self._fallback = None
+
+
+def make_rng(seed=None, rng=None, spawn_sequence=None):
+    if spawn_sequence is not None:
+        if isinstance(spawn_sequence, SpawnSequence):
+            return spawn_sequence
+        return SpawnSequence(spawn_sequence, seed)
+    if rng is not None:
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return None
+
+
+def spawn_choice(choices, rng=None):
     if not choices:
         choices = [2, 4]
-    return random.choices(choices)[0]
+    return (random if rng is None else rng).choices(choices)[0]
 
 
 def _get_remove_values(max_value):
@@ -93,27 +154,41 @@ def dynamic_random_choices(max_value):
     return random_choices
 
 
-def random_value(matrix):
-    max_value = 0
-    for i in range(GRID_LENGTH):
-        for j in range(GRID_WIDTH):
-            if matrix[i][j] != 0:
-                max_value = max(max_value, matrix[i][j])
+@lru_cache(maxsize=None)
+def spawn_table(max_exponent):
+    max_value = 1 << max_exponent if max_exponent > 0 else 0
+    purge_values = []
     if max_value == 0:
-        random_choices = [2, 4]
-        return (_spawn_choice(random_choices), matrix)
+        choices = [2, 4]
     elif max_value >= 1024:
-        random_choices = dynamic_random_choices(max_value)
+        choices = dynamic_random_choices(max_value)
         remove_value = _get_remove_values(max_value)
-        random_choices, matrix = remove_redundant(
-            matrix=matrix, random_choices=random_choices, remove_values=remove_value
-        )
-        return (_spawn_choice(random_choices), matrix)
+        while remove_value >= 2:
+            purge_values.append(remove_value)
+            remove_value //= 2
+        choices = [value for value in choices if value not in purge_values]
     else:
-        random_choices = initial_random_choices(max_value)
-        if not random_choices:
-            random_choices = [2, 4]
-        return (_spawn_choice(random_choices), matrix)
+        choices = initial_random_choices(max_value)
+    if not choices:
+        choices = [2, 4]
+    return (tuple(choices), tuple(purge_values))
+
+
+def spawn_distribution(max_value):
+    return spawn_table(max_value.bit_length() - 1 if max_value > 0 else 0)
+
+
+def random_value(matrix, max_value=None, rng=None):
+    if max_value is None:
+        max_value = max(map(max, matrix))
+    choices, purge_values = spawn_distribution(max_value)
+    if purge_values:
+        purge = set(purge_values)
+        for row in matrix:
+            for j, value in enumerate(row):
+                if value in purge:
+                    row[j] = 0
+    return (spawn_choice(choices, rng), matrix)
 
 
 def remove_redundant(matrix, random_choices=None, remove_values=None):
@@ -130,10 +205,10 @@ def remove_redundant(matrix, random_choices=None, remove_values=None):
     for value in remove_value_list:
         if value in random_choices:
             random_choices.remove(value)
-        for i in range(GRID_LENGTH):
-            for j in range(GRID_WIDTH):
-                if matrix[i][j] == value:
-                    matrix[i][j] = 0
+        for row in matrix:
+            for j, cell in enumerate(row):
+                if cell == value:
+                    row[j] = 0
     return (random_choices, matrix)
 
 
@@ -144,59 +219,66 @@ def print_matrix(matrix):
 
 
 def rearrange(matrix, column=None):
+    rows, cols = len(matrix), len(matrix[0])
     if column is None:
-        for i in range(GRID_WIDTH):
-            queue = Queue()
-            non_zero_value = 0
-            for j in range(GRID_LENGTH):
-                if matrix[j][i] == 0:
-                    continue
-                else:
-                    queue.put(matrix[j][i])
-            for j in range(GRID_LENGTH):
-                matrix[j][i] = 0
-            non_zero_value = queue.qsize()
-            for j in range(non_zero_value):
-                value = queue.get()
-                if value > 0:
-                    matrix[j][i] = value
+        for i in range(cols):
+            write = 0
+            for j in range(rows):
+                value = matrix[j][i]
+                if value:
+                    if j != write:
+                        matrix[write][i] = value
+                        matrix[j][i] = 0
+                    write += 1
     else:
-        queue = Queue()
-        non_zero_value = 0
-        for i in range(GRID_LENGTH):
-            if matrix[i][column] == 0:
-                continue
-            else:
-                queue.put(matrix[i][column])
-        for i in range(GRID_LENGTH):
-            matrix[i][column] = 0
-        non_zero_value = queue.qsize()
-        for i in range(non_zero_value):
-            value = queue.get()
-            if value > 0:
-                matrix[i][column] = value
+        write = 0
+        for i in range(rows):
+            value = matrix[i][column]
+            if value:
+                if i != write:
+                    matrix[write][column] = value
+                    matrix[i][column] = 0
+                write += 1
     return matrix
 
 
 def game_over(matrix, value):
-    for i in range(GRID_WIDTH):
-        for j in range(GRID_LENGTH):
+    rows, cols = len(matrix), len(matrix[0])
+    for i in range(cols):
+        for j in range(rows):
             if matrix[j][i] == 0:
                 return False
-    for i in range(GRID_WIDTH):
-        if matrix[GRID_LENGTH - 1][i] == value:
+    for i in range(cols):
+        if matrix[rows - 1][i] == value:
             return False
     return True
 
 
+def has_merge(matrix):
+    rows, cols = len(matrix), len(matrix[0])
+    for i in range(rows):
+        row = matrix[i]
+        upper = matrix[i + 1] if i + 1 < rows else None
+        for j in range(cols):
+            value = row[j]
+            if value == 0:
+                continue
+            if j + 1 < cols and row[j + 1] == value:
+                return True
+            if upper is not None and upper[j] == value:
+                return True
+    return False
+
+
 def merging_values(matrix, score, row, column, value):
+    rows, cols = len(matrix), len(matrix[0])
     indexes = [(-1, 0), (0, -1), (1, 0), (0, 1)]
     count = 0
     visited = set()
     for i, j in indexes:
         new_row = row + i
         new_column = column + j
-        if 0 <= new_row < GRID_LENGTH and 0 <= new_column < GRID_WIDTH:
+        if 0 <= new_row < rows and 0 <= new_column < cols:
             if (new_row, new_column) not in visited:
                 visited.add((new_row, new_column))
                 if matrix[new_row][new_column] == value:
@@ -206,8 +288,8 @@ def merging_values(matrix, score, row, column, value):
                         sec_new_row = new_row + i
                         sec_new_column = new_column + j
                         if (
-                            0 <= sec_new_row < GRID_LENGTH
-                            and 0 <= sec_new_column < GRID_WIDTH
+                            0 <= sec_new_row < rows
+                            and 0 <= sec_new_column < cols
                         ):
                             if (sec_new_row, sec_new_column) not in visited:
                                 visited.add((sec_new_row, sec_new_column))
@@ -232,10 +314,11 @@ def merging_values(matrix, score, row, column, value):
 
 
 def merge_column(matrix, score, column=-1):
+    rows, cols = len(matrix), len(matrix[0])
     count = 0
     if column == -1:
-        for i in range(GRID_WIDTH):
-            for j in range(GRID_LENGTH):
+        for i in range(cols):
+            for j in range(rows):
                 value = matrix[j][i]
                 if value == 0:
                     continue
@@ -245,7 +328,7 @@ def merge_column(matrix, score, column=-1):
                 if merged:
                     return (True, matrix, score, count)
     else:
-        for j in range(GRID_LENGTH):
+        for j in range(rows):
             value = matrix[j][column]
             if value == 0:
                 continue
@@ -255,3 +338,158 @@ def merge_column(matrix, score, column=-1):
             if merged:
                 return (True, matrix, score, count)
     return (False, matrix, score, count)
+
+
+def _can_merge(matrix, row, column):
+    rows, cols = len(matrix), len(matrix[0])
+    value = matrix[row][column]
+    if value == 0:
+        return False
+    if row > 0 and matrix[row - 1][column] == value:
+        return True
+    if row + 1 < rows and matrix[row + 1][column] == value:
+        return True
+    if column > 0 and matrix[row][column - 1] == value:
+        return True
+    if column + 1 < cols and matrix[row][column + 1] == value:
+        return True
+    return False
+
+
+def _consume(matrix, row, column, value):
+    rows, cols = len(matrix), len(matrix[0])
+    consumed = []
+    visited = set()
+    for i, j in _DIRECTIONS:
+        new_row, new_column = row + i, column + j
+        if not (0 <= new_row < rows and 0 <= new_column < cols):
+            continue
+        if (new_row, new_column) in visited:
+            continue
+        visited.add((new_row, new_column))
+        if matrix[new_row][new_column] != value:
+            continue
+        matrix[new_row][new_column] = 0
+        consumed.append((new_row, new_column))
+        for k, m in _DIRECTIONS:
+            sec_row, sec_column = new_row + k, new_column + m
+            if not (0 <= sec_row < rows and 0 <= sec_column < cols):
+                continue
+            if (sec_row, sec_column) in visited:
+                continue
+            visited.add((sec_row, sec_column))
+            if matrix[sec_row][sec_column] == value:
+                matrix[sec_row][sec_column] = 0
+                consumed.append((sec_row, sec_column))
+    if 2 <= len(consumed) <= 4:
+        value <<= len(consumed) - 1
+        matrix[row][column] = value
+        return (value, consumed)
+    return (0, consumed)
+
+
+def compact_tracked(matrix, column, changed, log=None):
+    rows = len(matrix)
+    write = 0
+    for row in range(rows):
+        value = matrix[row][column]
+        if value:
+            if row != write:
+                matrix[write][column] = value
+                matrix[row][column] = 0
+                changed.append((write, column))
+                changed.append((row, column))
+                if log is not None:
+                    log.append(MoveEvent((row, column), (write, column), value))
+            write += 1
+
+
+def resolve_tracked(matrix, column=-1, compact_column=None, touched=None, log=None):
+    rows, cols = len(matrix), len(matrix[0])
+    columns = range(cols) if column == -1 else (column,)
+    active = set()
+    for c in columns:
+        for r in range(rows):
+            if _can_merge(matrix, r, c):
+                active.add(c * rows + r)
+    dirty = set(range(cols)) if compact_column is None else set()
+    score = 0
+    events = []
+    cursor = -1
+    vanished = None
+    heap = sorted(active)
+    deferred = []
+    while heap:
+        key = heapq.heappop(heap)
+        if key not in active:
+            continue
+        if key <= cursor:
+            deferred.append(key)
+            continue
+        c, r = divmod(key, rows)
+        if not _can_merge(matrix, r, c):
+            active.discard(key)
+            continue
+        value = matrix[r][c]
+        new_value, consumed = _consume(matrix, r, c, value)
+        changed = consumed + [(r, c)]
+        for _, consumed_column in consumed:
+            dirty.add(consumed_column)
+        if touched is not None:
+            touched.add(c)
+            touched.update(consumed_column for _, consumed_column in consumed)
+        if new_value:
+            events.append(MergeEvent(
+                tuple(cell for cell in consumed if cell != (r, c)), (r, c), new_value
+            ))
+            if log is not None:
+                log.append(events[-1])
+            score += new_value
+            if compact_column is None:
+                for dirty_column in dirty:
+                    compact_tracked(matrix, dirty_column, changed, log)
+                dirty.clear()
+            else:
+                compact_tracked(matrix, compact_column, changed, log)
+            cursor = -1
+            vanished = None
+            for deferred_key in deferred:
+                heapq.heappush(heap, deferred_key)
+            deferred.clear()
+        else:
+            if log is not None:
+                log.extend(PurgeEvent(cell, value) for cell in consumed)
+            cursor = key
+            vanished = (key, len(consumed))
+        for changed_row, changed_column in changed:
+            for i, j in ((0, 0),) + _DIRECTIONS:
+                nr, nc = changed_row + i, changed_column + j
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                if column != -1 and nc != column:
+                    continue
+                neighbour = nc * rows + nr
+                if not _can_merge(matrix, nr, nc):
+                    active.discard(neighbour)
+                elif neighbour > cursor:
+                    active.add(neighbour)
+                    heapq.heappush(heap, neighbour)
+                else:
+                    active.add(neighbour)
+                    deferred.append(neighbour)
+    last_count = 0
+    if vanished is not None:
+        key, count = vanished
+        if not any(
+            matrix[r][c]
+            for c in columns
+            for r in range(rows)
+            if c * rows + r > key
+        ):
+            last_count = count
+    return (matrix, score, len(events), events, last_count)
+
+
+def resolve_cascade(matrix, column=-1, compact_column=None, touched=None, log=None):
+    matrix, score, merge_count, events, _ = resolve_tracked(matrix, column, compact_column, touched, log)
+    return (matrix, score, merge_count, events)
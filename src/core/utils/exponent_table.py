@@ -0,0 +1,48 @@
+MAX_EXPONENT = 63
+LINE_TABLE_LIMIT = 1 << 18
+
+EXPONENT = {0: 0, **{1 << exp: exp for exp in range(MAX_EXPONENT + 1)}}
+
+_LINES = {}
+
+
+def _mono(cur, nxt):
+    if nxt <= cur:
+        return 1
+    return cur - nxt if cur else 0
+
+
+def _table(fn):
+    return tuple(tuple(fn(a, b) for b in range(MAX_EXPONENT + 1)) for a in range(MAX_EXPONENT + 1))
+
+
+MONO = _table(_mono)
+SMOOTH = _table(lambda a, b: abs(a - b) if a and b else 0)
+PAIRED = _table(lambda a, b: 1 if a and b else 0)
+
+
+def build_line_terms(line):
+    exps = [EXPONENT[value] for value in line]
+    mono = smooth = pairs = 0
+    for cur, nxt in zip(exps, exps[1:]):
+        mono += MONO[cur][nxt]
+        smooth += SMOOTH[cur][nxt]
+        pairs += PAIRED[cur][nxt]
+    return mono, smooth, pairs
+
+
+def line_terms(line):
+    entry = _LINES.get(line)
+    if entry is None:
+        entry = build_line_terms(line)
+        if len(_LINES) < LINE_TABLE_LIMIT:
+            _LINES[line] = entry
+    return entry
+
+
+def table_size():
+    return len(_LINES)
+
+
+def clear_table():
+    _LINES.clear()
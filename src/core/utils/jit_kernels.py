@@ -0,0 +1,241 @@
+import math
+from collections import namedtuple
+import numpy as np
+from core.utils.board_spec import as_spec
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+ENABLED = NUMBA_AVAILABLE
+
+_DR = np.array([-1, 0, 1, 0], dtype=np.int64)
+_DC = np.array([0, -1, 0, 1], dtype=np.int64)
+
+Kernels = namedtuple(
+    "Kernels",
+    ["merging_values_flat", "merge_column_flat", "rearrange_flat", "simulate_move_flat", "board_features_flat"],
+)
+
+
+def set_enabled(enabled):
+    global ENABLED
+    ENABLED = bool(enabled) and NUMBA_AVAILABLE
+    return ENABLED
+
+
+def _build_kernels(spec):
+    ROWS = spec.rows
+    COLS = spec.cols
+    CELLS = spec.cells
+
+    @njit
+    def merging_values_flat(cells, row, column, value):
+        visited = np.zeros(CELLS, dtype=np.bool_)
+        count = 0
+        for d in range(4):
+            nr = row + _DR[d]
+            nc = column + _DC[d]
+            if nr < 0 or nr >= ROWS or nc < 0 or nc >= COLS:
+                continue
+            k = nr * COLS + nc
+            if visited[k]:
+                continue
+            visited[k] = True
+            if cells[k] != value:
+                continue
+            cells[k] = 0
+            count += 1
+            for e in range(4):
+                sr = nr + _DR[e]
+                sc = nc + _DC[e]
+                if sr < 0 or sr >= ROWS or sc < 0 or sc >= COLS:
+                    continue
+                s = sr * COLS + sc
+                if visited[s]:
+                    continue
+                visited[s] = True
+                if cells[s] == value:
+                    cells[s] = 0
+                    count += 1
+        if 2 <= count <= 4:
+            value = value << (count - 1)
+            cells[row * COLS + column] = value
+            return True, value, count
+        return False, 0, count
+
+
+    @njit
+    def merge_column_flat(cells, column):
+        count = 0
+        first = 0 if column == -1 else column
+        last = COLS if column == -1 else column + 1
+        for c in range(first, last):
+            for r in range(ROWS):
+                value = cells[r * COLS + c]
+                if value == 0:
+                    continue
+                merged, gained, count = merging_values_flat(cells, r, c, value)
+                if merged:
+                    return True, gained, count
+        return False, 0, count
+
+
+    @njit
+    def rearrange_flat(cells, column):
+        first = 0 if column == -1 else column
+        last = COLS if column == -1 else column + 1
+        for c in range(first, last):
+            write = 0
+            for r in range(ROWS):
+                value = cells[r * COLS + c]
+                if value:
+                    cells[r * COLS + c] = 0
+                    cells[write * COLS + c] = value
+                    write += 1
+
+
+    @njit
+    def simulate_move_flat(cells, column, value):
+        score = 0
+        merges = 0
+        index = 0
+        while index < ROWS and cells[index * COLS + column] != 0:
+            index += 1
+        if index == ROWS:
+            top = (ROWS - 1) * COLS + column
+            if cells[top] != value:
+                return -1, -1
+            cells[top] = value * 2
+            score += value * 2
+            merges += 1
+            while True:
+                merged, gained, _ = merge_column_flat(cells, column)
+                score += gained
+                if not merged:
+                    break
+                merges += 1
+                rearrange_flat(cells, column)
+            return score, merges
+        cells[index * COLS + column] = value
+        while True:
+            merged, gained, _ = merge_column_flat(cells, column)
+            score += gained
+            if not merged:
+                break
+            merges += 1
+            rearrange_flat(cells, -1)
+        for c in range(COLS):
+            while True:
+                merged, gained, _ = merge_column_flat(cells, c)
+                score += gained
+                if not merged:
+                    break
+                merges += 1
+                rearrange_flat(cells, -1)
+        return score, merges
+
+
+    @njit
+    def board_features_flat(cells):
+        empties = 0
+        for k in range(CELLS):
+            if cells[k] == 0:
+                empties += 1
+        vertical = 0.0
+        for c in range(COLS):
+            for r in range(ROWS - 1):
+                cur = cells[r * COLS + c]
+                nxt = cells[(r + 1) * COLS + c]
+                if cur >= nxt:
+                    vertical += 1
+                elif cur > 0 and nxt > 0:
+                    vertical -= math.log2(nxt) - math.log2(cur)
+        horizontal = 0.0
+        for r in range(ROWS):
+            for c in range(COLS - 1):
+                cur = cells[r * COLS + c]
+                nxt = cells[r * COLS + c + 1]
+                if cur >= nxt:
+                    horizontal += 1
+                elif cur > 0 and nxt > 0:
+                    horizontal -= math.log2(nxt) - math.log2(cur)
+        monotonicity = (
+            vertical / (COLS * (ROWS - 1)) + horizontal / (ROWS * (COLS - 1))
+        ) / 2.0
+        smoothness = 0.0
+        comparisons = 0
+        for r in range(ROWS):
+            for c in range(COLS):
+                value = cells[r * COLS + c]
+                if value > 0:
+                    exp = math.log2(value)
+                    if c + 1 < COLS and cells[r * COLS + c + 1] > 0:
+                        smoothness += abs(exp - math.log2(cells[r * COLS + c + 1]))
+                        comparisons += 1
+                    if r + 1 < ROWS and cells[(r + 1) * COLS + c] > 0:
+                        smoothness += abs(exp - math.log2(cells[(r + 1) * COLS + c]))
+                        comparisons += 1
+        if comparisons:
+            smoothness /= comparisons
+        max_value = 0
+        max_row = 0
+        max_col = 0
+        for r in range(ROWS):
+            for c in range(COLS):
+                if cells[r * COLS + c] > max_value:
+                    max_value = cells[r * COLS + c]
+                    max_row = r
+                    max_col = c
+        corner = 1.0 - (max_row + max_col) / ((ROWS - 1) + (COLS - 1))
+        stack = 0
+        for c in range(COLS):
+            column_empty = 0
+            for r in range(ROWS):
+                if cells[r * COLS + c] == 0:
+                    column_empty += 1
+            if column_empty <= 1:
+                stack -= 100
+        return empties, monotonicity, smoothness, corner, stack
+
+    return Kernels(
+        merging_values_flat, merge_column_flat, rearrange_flat, simulate_move_flat, board_features_flat
+    )
+
+
+def kernels(spec=None):
+    return as_spec(spec).cached("jit_kernels", _build_kernels)
+
+
+merging_values_flat, merge_column_flat, rearrange_flat, simulate_move_flat, board_features_flat = kernels()
+
+
+def to_flat(matrix):
+    return np.array(matrix, dtype=np.int64).ravel()
+
+
+def write_back(matrix, cells):
+    cols = len(matrix[0])
+    for r, row in enumerate(matrix):
+        row[:] = cells[r * cols:(r + 1) * cols].tolist()
+    return matrix
+
+
+def simulate_move(matrix, column, value, spec=None):
+    cells = to_flat(matrix)
+    score, merges = kernels(spec).simulate_move_flat(cells, column, value)
+    if score != -1:
+        write_back(matrix, cells)
+    return (int(score), int(merges))
+
+
+def board_features(matrix, spec=None):
+    return kernels(spec).board_features_flat(to_flat(matrix))
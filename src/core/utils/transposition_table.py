@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+POLICIES = ("always", "depth", "lru")
+
+
+class TranspositionTable:
+    def __init__(self, capacity=1 << 16, policy="always"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy '{policy}'. Choose from: {POLICIES}")
+        self.capacity = capacity
+        self.policy = policy
+        self.clear()
+
+    def clear(self):
+        if self.policy == "lru":
+            self._entries = OrderedDict()
+        else:
+            self._slots = [None] * self.capacity
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def __len__(self):
+        return self._size
+
+    def get(self, key, default=None):
+        if self.policy == "lru":
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        else:
+            entry = self._slots[key % self.capacity]
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        return default
+
+    def store(self, key, value, depth=0):
+        self.stores += 1
+        if self.policy == "lru":
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif self._size >= self.capacity:
+                self._entries.popitem(last=False)
+                self.replacements += 1
+            else:
+                self._size += 1
+            self._entries[key] = (value, depth)
+            return True
+        slot = key % self.capacity
+        entry = self._slots[slot]
+        if entry is None:
+            self._size += 1
+        elif entry[0] != key:
+            if self.policy == "depth" and entry[2] > depth:
+                return False
+            self.replacements += 1
+        self._slots[slot] = (key, value, depth)
+        return True
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def occupancy(self):
+        return self._size / self.capacity
+
+    def stats(self):
+        return {
+            "size": self._size,
+            "capacity": self.capacity,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "hit_rate": self.hit_rate(),
+            "occupancy": self.occupancy(),
+        }
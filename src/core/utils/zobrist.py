@@ -0,0 +1,46 @@
+import random
+from core.utils.board_spec import as_spec
+
+ZOBRIST_SEED = 0x4D32
+MAX_EXPONENT = 63
+
+
+def _build_keys(spec, seed=ZOBRIST_SEED):
+    rng = random.Random(seed)
+    return [
+        [[0] + [rng.getrandbits(64) for _ in range(MAX_EXPONENT)] for _ in range(spec.cols)]
+        for _ in range(spec.rows)
+    ]
+
+
+def zobrist_keys(spec=None):
+    return as_spec(spec).cached("zobrist_keys", _build_keys)
+
+
+ZOBRIST_KEYS = zobrist_keys()
+
+
+def cell_key(row, column, value, spec=None):
+    keys = ZOBRIST_KEYS if spec is None else zobrist_keys(spec)
+    return keys[row][column][value.bit_length() - 1] if value else 0
+
+
+def column_hash(matrix, column, spec=None):
+    keys = ZOBRIST_KEYS if spec is None else zobrist_keys(spec)
+    h = 0
+    for row in range(len(matrix)):
+        value = matrix[row][column]
+        if value:
+            h ^= keys[row][column][value.bit_length() - 1]
+    return h
+
+
+def board_hash(matrix, spec=None):
+    keys = ZOBRIST_KEYS if spec is None else zobrist_keys(spec)
+    h = 0
+    for row in range(len(matrix)):
+        row_keys = keys[row]
+        for column, value in enumerate(matrix[row]):
+            if value:
+                h ^= row_keys[column][value.bit_length() - 1]
+    return h
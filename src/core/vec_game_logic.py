@@ -0,0 +1,243 @@
+import numpy as np
+from core.utils.board_spec import as_spec
+from core.utils.core_utils import spawn_table
+
+MAX_EXPONENT = 62
+PAD = 2
+
+_FIRST = ((-1, 0), (0, -1), (1, 0), (0, 1))
+_SECOND = tuple(
+    tuple((i + k, j + m) for k, m in _FIRST) for i, j in _FIRST
+)
+
+
+def _build_spawn_tables():
+    choices, removes = [], []
+    for exp in range(MAX_EXPONENT + 1):
+        options, purge_values = spawn_table(exp)
+        choices.append([v.bit_length() - 1 for v in options])
+        removes.append(purge_values[0].bit_length() - 1 if purge_values else 0)
+    width = max(len(c) for c in choices)
+    table = np.zeros((MAX_EXPONENT + 1, width), dtype=np.int16)
+    counts = np.zeros(MAX_EXPONENT + 1, dtype=np.int64)
+    for exp, options in enumerate(choices):
+        table[exp, :len(options)] = options
+        counts[exp] = len(options)
+    return table, counts, np.array(removes, dtype=np.int16)
+
+
+SPAWN_CHOICES, SPAWN_COUNTS, REMOVE_EXPONENT = _build_spawn_tables()
+
+
+def _flat(boards):
+    return boards.transpose(0, 2, 1).reshape(len(boards), -1)
+
+
+def _mergeable(boards):
+    equal = np.zeros(boards.shape, dtype=bool)
+    vertical = boards[:, 1:, :] == boards[:, :-1, :]
+    horizontal = boards[:, :, 1:] == boards[:, :, :-1]
+    equal[:, 1:, :] |= vertical
+    equal[:, :-1, :] |= vertical
+    equal[:, :, 1:] |= horizontal
+    equal[:, :, :-1] |= horizontal
+    return equal & (boards != 0)
+
+
+def compact(boards, column_mask=None):
+    order = np.argsort(boards == 0, axis=1, kind="stable")
+    compacted = np.take_along_axis(boards, order, axis=1)
+    if column_mask is None:
+        boards[...] = compacted
+    else:
+        boards[...] = np.where(column_mask[:, None, :], compacted, boards)
+    return boards
+
+
+def _merge_at(boards, rows, columns):
+    m = len(boards)
+    picks = np.arange(m)
+    height, width = boards.shape[1:]
+    padded = np.full((m, height + 2 * PAD, width + 2 * PAD), -1, dtype=boards.dtype)
+    padded[:, PAD:-PAD, PAD:-PAD] = boards
+    value = boards[picks, rows, columns]
+    cells = {}
+
+    def cell(offset):
+        if offset not in cells:
+            cells[offset] = padded[picks, rows + PAD + offset[0], columns + PAD + offset[1]]
+        return cells[offset]
+
+    offsets = set(_FIRST).union(*_SECOND)
+    visited = {offset: np.zeros(m, dtype=bool) for offset in offsets}
+    zeroed = {offset: np.zeros(m, dtype=bool) for offset in offsets}
+    count = np.zeros(m, dtype=np.int64)
+    for first, seconds in zip(_FIRST, _SECOND):
+        ok = (cell(first) >= 0) & ~visited[first]
+        visited[first] |= ok
+        hit = ok & (cell(first) == value)
+        zeroed[first] |= hit
+        count += hit
+        for second in seconds:
+            ok = hit & (cell(second) >= 0) & ~visited[second]
+            visited[second] |= ok
+            found = ok & (cell(second) == value)
+            zeroed[second] |= found
+            count += found
+    for (i, j), mask in zeroed.items():
+        if np.any(mask):
+            boards[picks[mask], rows[mask] + i, columns[mask] + j] = 0
+    merged = (count >= 2) & (count <= 4)
+    new_value = (value + count - 1).astype(boards.dtype)
+    boards[picks[merged], rows[merged], columns[merged]] = new_value[merged]
+    gained = np.where(merged, np.left_shift(1, new_value.astype(np.int64)), 0)
+    return merged, count, gained
+
+
+def settle(boards, indices, scan_mask, compact_mask=None):
+    n = len(indices)
+    score = np.zeros(n, dtype=np.int64)
+    merges = np.zeros(n, dtype=np.int64)
+    max_count = np.zeros(n, dtype=np.int64)
+    last_count = np.zeros(n, dtype=np.int64)
+    cursor = np.full(n, -1)
+    vanish_key = np.full(n, -1)
+    vanish_count = np.zeros(n, dtype=np.int64)
+    rows, cols = boards.shape[1:]
+    keys = np.arange(rows * cols)
+    scan_keys = np.repeat(scan_mask, rows, axis=1)
+    live = np.arange(n)
+    while live.size:
+        sub = boards[indices[live]]
+        candidates = _flat(_mergeable(sub)) & scan_keys[live] & (keys > cursor[live, None])
+        found = candidates.any(axis=1)
+        done = live[~found]
+        if done.size:
+            vanished = vanish_key[done] >= 0
+            if np.any(vanished):
+                tail = _flat(boards[indices[done]] != 0) & scan_keys[done] & (keys > vanish_key[done, None])
+                last_count[done] = np.where(vanished & ~tail.any(axis=1), vanish_count[done], 0)
+        live = live[found]
+        if not live.size:
+            break
+        sub = sub[found]
+        picked = candidates[found].argmax(axis=1)
+        columns, picked_rows = np.divmod(picked, rows)
+        merged, count, gained = _merge_at(sub, picked_rows, columns)
+        if np.any(merged):
+            merged_sub = sub[merged]
+            mask = None if compact_mask is None else compact_mask[live[merged]]
+            sub[merged] = compact(merged_sub, mask)
+        score[live] += gained
+        merges[live] += merged
+        max_count[live] = np.where(merged, np.maximum(max_count[live], count), max_count[live])
+        cursor[live] = np.where(merged, -1, picked)
+        vanish_key[live] = np.where(merged, -1, picked)
+        vanish_count[live] = np.where(merged, 0, count)
+        boards[indices[live]] = sub
+    return score, merges, max_count, last_count
+
+
+def purge(boards, indices):
+    sub = boards[indices]
+    remove = REMOVE_EXPONENT[sub.max(axis=(1, 2))]
+    sub[sub <= remove[:, None, None]] = 0
+    boards[indices] = sub
+
+
+class VecGameLogic:
+    def __init__(self, n_games: int, seed=None, spec=None):
+        self.n_games = n_games
+        self.spec = as_spec(spec)
+        self._rng = np.random.default_rng(seed)
+        self._boards = np.zeros((n_games, self.spec.rows, self.spec.cols), dtype=np.int16)
+        self._scores = np.zeros(n_games, dtype=np.int64)
+        self._next = np.zeros(n_games, dtype=np.int16)
+        self._done = np.zeros(n_games, dtype=bool)
+        self.reset()
+
+    def reset(self, indices=None):
+        indices = np.arange(self.n_games) if indices is None else np.asarray(indices)
+        self._boards[indices] = 0
+        self._scores[indices] = 0
+        self._done[indices] = False
+        self._spawn(indices)
+
+    def get_boards(self):
+        return self._boards
+
+    def get_matrices(self):
+        boards = self._boards.astype(np.int64)
+        return np.where(boards > 0, np.left_shift(1, boards), 0)
+
+    def get_scores(self):
+        return self._scores
+
+    def get_next_values(self):
+        return np.left_shift(1, self._next.astype(np.int64))
+
+    def get_done(self):
+        return self._done
+
+    def _spawn(self, indices):
+        if not len(indices):
+            return
+        max_exp = self._boards[indices].max(axis=(1, 2))
+        purge(self._boards, indices)
+        picks = self._rng.integers(0, SPAWN_COUNTS[max_exp])
+        self._next[indices] = SPAWN_CHOICES[max_exp, picks]
+
+    def _game_over(self, indices):
+        sub = self._boards[indices]
+        full = ~(sub == 0).any(axis=(1, 2))
+        blocked = ~(sub[:, -1, :] == self._next[indices, None]).any(axis=1)
+        return full & blocked
+
+    def step(self, columns):
+        columns = np.asarray(columns, dtype=np.int64)
+        rewards = np.zeros(self.n_games, dtype=np.int64)
+        active = np.flatnonzero(~self._done)
+        if not active.size:
+            return (rewards, self._done.copy())
+        cols = columns[active]
+        exps = self._next[active]
+        sub = self._boards[active]
+        picks = np.arange(active.size)
+        column_cells = sub[picks, :, cols]
+        empty = column_cells == 0
+        has_room = empty.any(axis=1)
+        first_empty = empty.argmax(axis=1)
+        top = column_cells[:, -1]
+        doubles = ~has_room & (top == exps)
+        rejected = ~has_room & ~doubles
+        placed = picks[has_room]
+        sub[placed, first_empty[has_room], cols[has_room]] = exps[has_room]
+        sub[picks[doubles], -1, cols[doubles]] = exps[doubles] + 1
+        self._boards[active] = sub
+        self._scores[active[doubles]] += np.left_shift(1, exps[doubles].astype(np.int64) + 1)
+        self._done[active[rejected]] = True
+        live = active[~rejected]
+        live_cols = cols[~rejected]
+        width = self.spec.cols
+        one_hot = np.zeros((live.size, width), dtype=bool)
+        one_hot[np.arange(live.size), live_cols] = True
+        score, _, max_count, last_count = settle(self._boards, live, one_hot, one_hot)
+        self._scores[live] += score
+        full = doubles[~rejected]
+        rewards[live] = np.where(full & (max_count == 0), last_count, max_count)
+        sweep = live[~full]
+        sweep = sweep[_mergeable(self._boards[sweep]).any(axis=(1, 2))]
+        for column in range(width):
+            mask = np.zeros((sweep.size, width), dtype=bool)
+            mask[:, column] = True
+            score, _, max_count, _ = settle(self._boards, sweep, mask)
+            self._scores[sweep] += score
+            rewards[sweep] = np.maximum(rewards[sweep], max_count)
+        sub = self._boards[live]
+        self._boards[live] = compact(sub)
+        purge(self._boards, live)
+        score, _, _, _ = settle(self._boards, live, np.ones((live.size, width), dtype=bool))
+        self._scores[live] += score
+        self._spawn(live)
+        self._done[live] = self._game_over(live)
+        return (rewards, self._done.copy())
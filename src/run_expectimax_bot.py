@@ -0,0 +1,14 @@
+import argparse
+from core.game_logic import GameLogic
+from ui.agents.heuristic.expectimax_bot_ui import ExpectimaxBotUI
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="M2MasterBot — expectimax search bot")
+    parser.add_argument("--depth", type=int, default=3,
+                        help="Maximum search depth in placements")
+    parser.add_argument("--budget", type=float, default=0.1,
+                        help="Seconds per move for iterative deepening")
+    args = parser.parse_args()
+    game_logic = GameLogic()
+    game_ui = ExpectimaxBotUI(game_logic, depth=args.depth, time_budget=args.budget)
+    game_ui.run()
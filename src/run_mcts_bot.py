@@ -0,0 +1,14 @@
+import argparse
+from core.game_logic import GameLogic
+from agents.heuristic.mcts import ROLLOUT_POLICIES
+from ui.agents.heuristic.mcts_bot_ui import MCTSBotUI
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="M2MasterBot — Monte Carlo tree search bot")
+    parser.add_argument("--budget", type=float, default=0.15,
+                        help="Seconds of search per move")
+    parser.add_argument("--rollout-policy", choices=ROLLOUT_POLICIES, default="random")
+    args = parser.parse_args()
+    game_logic = GameLogic()
+    game_ui = MCTSBotUI(game_logic, time_budget=args.budget, rollout_policy=args.rollout_policy)
+    game_ui.run()
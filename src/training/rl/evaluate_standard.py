@@ -1,7 +1,6 @@
 import argparse
 import numpy as np
 from core.game_logic import GameLogic
-from core.utils.core_utils import game_over, rearrange
 from agents.rl.standard import NoTeacherAgent
 
 
@@ -11,19 +10,14 @@ def evaluate_no_teacher(episodes=100, model_path="data/rl_no_teacher_agent.json"
     scores = []
     for ep in range(episodes):
         game = GameLogic()
-        next_value = game.get_random_value()
-        while True:
+        next_value = game.get_next_value()
+        while not game.is_game_over(next_value):
             matrix = game.get_matrix()
-            if game_over(matrix, next_value):
-                break
             action = agent.select_action(matrix, next_value, epsilon=0.0)
-            merged, _ = game.add_to_column(next_value, action)
-            if not merged:
+            turn = game.play_turn(action)
+            if not turn.accepted:
                 break
-            new_matrix = rearrange(game.get_matrix())
-            game.set_matrix(new_matrix)
-            game.merge_column()
-            next_value = game.get_random_value()
+            next_value = turn.next_value
         final_score = game.get_score()
         scores.append(final_score)
         print(f"No-Teacher Eval Episode {ep + 1}: {final_score}")
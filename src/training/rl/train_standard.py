@@ -1,28 +1,14 @@
 import os
-import math
 import argparse
 import numpy as np
 import pygame
-from config.constants import GRID_WIDTH, GRID_LENGTH
 from core.game_logic import GameLogic
-from core.utils.core_utils import game_over, rearrange, remove_redundant, _get_remove_values
+from core.m2_env import compute_reward
 from agents.rl.standard import NoTeacherAgent
 from ui.game.game_ui import GameUI
 from training.debug.no_teacher_visualizer import NoTeacherVisualizer
 
 
-def _compute_reward(score_delta: float, merge_count: float,
-                    matrix_before: list, merged: bool) -> float:
-    total_cells = GRID_WIDTH * GRID_LENGTH
-    empty_cells = sum(1 for row in matrix_before for v in row if v == 0)
-    survival_bonus = empty_cells / total_cells
-    if not merged:
-        return -10.0
-    score_term = math.log2(score_delta + 1) * 0.5 if score_delta > 0 else 0.0
-    merge_bonus = merge_count / (merge_count + 2.0)
-    return score_term * 0.5 + survival_bonus * 0.3 + merge_bonus * 0.2
-
-
 class NoTeacherTrainer:
     def __init__(
         self,
@@ -73,33 +59,23 @@ class NoTeacherTrainer:
         total_volatility = []
         while True:
             matrix = self.game.get_matrix()
-            if game_over(matrix, self.next_value):
+            if self.game.is_game_over(self.next_value):
                 break
             action = self.agent.select_action(matrix, self.next_value, self.epsilon)
             feature_vectors = self.agent._get_action_space_features(matrix, self.next_value)
             state_features = feature_vectors[action]
             if state_features is None:
                 break
-            merged, count = self.game.add_to_column(self.next_value, action)
-            reward = _compute_reward(float(count), float(count), matrix, bool(merged))
+            empty_cells = self.game.empty_count()
+            turn = self.game.play_turn(action)
+            reward = compute_reward(
+                float(turn.reward), float(turn.reward), empty_cells, turn.accepted,
+                self.game.get_spec().cells,
+            )
             episode_reward += reward
-            new_matrix = self.game.get_matrix()
-            new_matrix = rearrange(new_matrix)
-            max_val = max(max(r) for r in new_matrix) if new_matrix else 0
-            remove_values = _get_remove_values(max_val)
-            try:
-                _, new_matrix = remove_redundant(matrix=new_matrix, remove_values=remove_values)
-            except Exception:
-                pass
-            while True:
-                merged_m, _ = self.game.merge_column()
-                if not merged_m:
-                    break
-                new_matrix = rearrange(new_matrix)
-            self.game.set_matrix(new_matrix)
-            next_val = self.game.get_random_value()
+            next_val = turn.next_value if turn.accepted else self.game.get_random_value()
             vol = self.agent.update_q_learning(
-                state_features, reward, self.game.get_matrix(), next_val, not merged
+                state_features, reward, self.game.get_matrix(), next_val, not turn.accepted
             )
             total_volatility.append(vol)
             self.next_value = next_val
@@ -113,7 +89,7 @@ class NoTeacherTrainer:
         total_volatility = []
         while True:
             matrix = self.game.get_matrix()
-            if game_over(matrix, self.ui.next_value):
+            if self.game.is_game_over(self.ui.next_value):
                 self.ui.draw_game_over()
                 break
             self.ui.handle_events()
@@ -126,37 +102,22 @@ class NoTeacherTrainer:
                 self.ui.input_column = action
                 self.ui.trigger_drop_animation(action, self.ui.next_value)
             if not self.ui.game_is_over and self.ui.input_column is not None and state_features is not None:
-                old_matrix = [row[:] for row in self.game.get_matrix()]
-                merged, count = self.game.add_to_column(self.ui.next_value, self.ui.input_column)
-                reward = _compute_reward(float(count), float(count), old_matrix, bool(merged))
+                empty_cells = self.game.empty_count()
+                turn = self.game.play_turn(self.ui.input_column)
+                reward = compute_reward(
+                    float(turn.reward), float(turn.reward), empty_cells, turn.accepted,
+                    self.game.get_spec().cells,
+                )
                 episode_reward += reward
-                if not merged:
-                    self.game.merge_column(self.ui.input_column)
+                if not turn.accepted:
                     self.ui.drop_animations = []
                 else:
-                    new_matrix = self.game.get_matrix()
-                    self.ui.detect_and_trigger_animations(old_matrix, new_matrix, self.ui.input_column)
-                    next_val = self.game.get_random_value()
                     vol = self.agent.update_q_learning(
-                        state_features, reward, self.game.get_matrix(), next_val, False
+                        state_features, reward, self.game.get_matrix(), turn.next_value, False
                     )
                     total_volatility.append(vol)
-                    self.ui.next_value = next_val
+                    self.ui.next_value = turn.next_value
                     self.ui.input_column = None
-            current_matrix = self.game.get_matrix()
-            current_matrix = rearrange(current_matrix)
-            max_val = max(max(r) for r in current_matrix) if current_matrix else 0
-            remove_values = _get_remove_values(max_val)
-            try:
-                _, current_matrix = remove_redundant(matrix=current_matrix, remove_values=remove_values)
-            except Exception:
-                pass
-            while True:
-                merged_m, _ = self.game.merge_column()
-                if not merged_m:
-                    break
-                current_matrix = rearrange(current_matrix)
-            self.game.set_matrix(current_matrix)
             self.ui.draw_matrix()
             self.visualizer.draw(
                 self.ui.screen,
@@ -187,7 +148,8 @@ class NoTeacherTrainer:
                 f"Episode {ep + 1}/{self.episodes}  "
                 f"Reward: {reward:.3f}  "
                 f"ε: {self.epsilon:.4f}  "
-                f"Volatility: {self.weight_volatility:.5f}"
+                f"Volatility: {self.weight_volatility:.5f}  "
+                f"Cache hits: {self.agent.cache.hit_rate():.1%}"
             )
         self.agent.save(self.output_path)
 
@@ -1,28 +1,14 @@
 import os
-import math
 import argparse
 import numpy as np
 import pygame
-from config.constants import GRID_WIDTH, GRID_LENGTH
 from core.game_logic import GameLogic
-from core.utils.core_utils import game_over, rearrange, remove_redundant, _get_remove_values
+from core.m2_env import compute_reward
 from agents.rl.teacher import RLAgent
 from ui.game.game_ui import GameUI
 from training.debug.teacher_enhanced_visualizer import TeacherEnhancedVisualizer
 
 
-def _compute_reward(score_delta: float, merge_count: float,
-                    matrix_before: list, merged: bool) -> float:
-    total_cells = GRID_WIDTH * GRID_LENGTH
-    empty_cells = sum(1 for row in matrix_before for v in row if v == 0)
-    survival_bonus = empty_cells / total_cells
-    if not merged:
-        return -10.0
-    score_term = math.log2(score_delta + 1) * 0.5 if score_delta > 0 else 0.0
-    merge_bonus = merge_count / (merge_count + 2.0)
-    return score_term * 0.5 + survival_bonus * 0.3 + merge_bonus * 0.2
-
-
 class UITrainer:
     def __init__(
         self,
@@ -68,33 +54,22 @@ class UITrainer:
         episode_score = 0.0
         while True:
             matrix = self.game.get_matrix()
-            if game_over(matrix, self.next_value):
+            if self.game.is_game_over(self.next_value):
                 break
             chosen_action, state_features, teacher_action, agent_action = (
                 self.agent.select_action_with_teacher(matrix, self.next_value)
             )
             self.alignment_score = 1.0 if chosen_action == teacher_action else 0.0
-            old_matrix = [row[:] for row in matrix]
-            merged, count = self.game.add_to_column(self.next_value, chosen_action)
-            reward = _compute_reward(float(count), float(count), old_matrix, bool(merged))
+            empty_cells = self.game.empty_count()
+            turn = self.game.play_turn(chosen_action)
+            reward = compute_reward(
+                float(turn.reward), float(turn.reward), empty_cells, turn.accepted,
+                self.game.get_spec().cells,
+            )
             episode_score += max(reward, 0.0)
-            new_matrix = self.game.get_matrix()
-            new_matrix = rearrange(new_matrix)
-            max_val = max(max(r) for r in new_matrix) if new_matrix else 0
-            remove_values = _get_remove_values(max_val)
-            try:
-                _, new_matrix = remove_redundant(matrix=new_matrix, remove_values=remove_values)
-            except Exception:
-                pass
-            while True:
-                merged_m, _ = self.game.merge_column()
-                if not merged_m:
-                    break
-                new_matrix = rearrange(new_matrix)
-            self.game.set_matrix(new_matrix)
-            next_val = self.game.get_random_value()
+            next_val = turn.next_value if turn.accepted else self.game.get_random_value()
             self.agent.update_q_learning(
-                state_features, reward, self.game.get_matrix(), next_val, not merged
+                state_features, reward, self.game.get_matrix(), next_val, not turn.accepted
             )
             self.next_value = next_val
         return episode_score
@@ -104,7 +79,7 @@ class UITrainer:
         state_features = np.zeros(len(self.agent.feature_names))
         while True:
             matrix = self.game.get_matrix()
-            if game_over(matrix, self.ui.next_value):
+            if self.game.is_game_over(self.ui.next_value):
                 self.ui.draw_game_over()
                 break
             self.ui.handle_events()
@@ -117,43 +92,24 @@ class UITrainer:
                 self.ui.trigger_drop_animation(chosen_action, self.ui.next_value)
             show_message = False
             if not self.ui.game_is_over and self.ui.input_column is not None:
-                old_matrix = [row[:] for row in self.game.get_matrix()]
-                merged, count = self.game.add_to_column(
-                    self.ui.next_value, self.ui.input_column
+                empty_cells = self.game.empty_count()
+                turn = self.game.play_turn(self.ui.input_column)
+                reward = compute_reward(
+                    float(turn.reward), float(turn.reward), empty_cells, turn.accepted,
+                    self.game.get_spec().cells,
                 )
-                reward = _compute_reward(float(count), float(count), old_matrix, bool(merged))
-                if not merged:
+                if not turn.accepted:
                     show_message = True
-                    self.game.merge_column(self.ui.input_column)
                     self.ui.drop_animations = []
                 else:
-                    new_matrix = self.game.get_matrix()
-                    self.ui.detect_and_trigger_animations(
-                        old_matrix, new_matrix, self.ui.input_column
-                    )
-                    episode_score += float(count)
-                    next_val = self.game.get_random_value()
+                    episode_score += float(turn.reward)
                     self.agent.update_q_learning(
-                        state_features, reward, self.game.get_matrix(), next_val, False
+                        state_features, reward, self.game.get_matrix(), turn.next_value, False
                     )
-                    self.ui.next_value = next_val
+                    self.ui.next_value = turn.next_value
                     self.ui.input_column = None
             if show_message and not self.ui.game_is_over:
                 self.ui.show_temp_message("Column is full!")
-            current_matrix = self.game.get_matrix()
-            current_matrix = rearrange(current_matrix)
-            max_val = max(max(r) for r in current_matrix) if current_matrix else 0
-            remove_values = _get_remove_values(max_val)
-            try:
-                _, current_matrix = remove_redundant(matrix=current_matrix, remove_values=remove_values)
-            except Exception:
-                pass
-            while True:
-                merged_m, _ = self.game.merge_column()
-                if not merged_m:
-                    break
-                current_matrix = rearrange(current_matrix)
-            self.game.set_matrix(current_matrix)
             self.ui.draw_matrix()
             self.visualizer.draw(
                 self.ui.screen,
@@ -186,7 +142,8 @@ class UITrainer:
                 f"Episode {episode}/{self.loop_count}  "
                 f"Score: {reward:.1f}  "
                 f"λ: {self.agent.teacher_lambda:.4f}  "
-                f"Alignment: {self.alignment_score:.2f}"
+                f"Alignment: {self.alignment_score:.2f}  "
+                f"Cache hits: {self.agent.cache.hit_rate():.1%}"
             )
         self.agent.save(self.output_path)
 
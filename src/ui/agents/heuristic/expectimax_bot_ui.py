@@ -0,0 +1,35 @@
+import pygame
+from ui.game.game_ui import GameUI
+from agents.anytime import Deadline
+from agents.heuristic.expectimax import ExpectimaxBot
+from agents.heuristic.debug.debug import Debugger
+
+
+class ExpectimaxBotUI(GameUI):
+    def __init__(self, game_logic, depth=3, time_budget=0.1):
+        super().__init__(game_logic)
+        self.bot = ExpectimaxBot(game_logic.get_spec(), depth=depth)
+        self.move_budget = time_budget
+        self.visualizer = Debugger(list(self.bot.weights.keys()))
+        self.last_move_time = 0
+        self.move_delay = 200
+        self.debug = False
+
+    def handle_events(self):
+        super().handle_events()
+        if not self.game_is_over and self.input_column is None:
+            current_time = pygame.time.get_ticks()
+            if current_time - self.last_move_time > self.move_delay:
+                matrix = self.game_logic.get_matrix()
+                deadline = Deadline(self.move_budget)
+                if self.debug:
+                    best_col = self.bot.solve(matrix, self.next_value, self.visualizer, deadline)
+                    stats = self.bot.stats()
+                    self.visualizer.draw_status(
+                        f"DEPTH {stats['depth']}   {stats['nodes']} NODES   "
+                        f"{stats['elapsed'] * 1000:.1f} MS   {stats['nodes_per_sec']:.0f} NODES/S"
+                    )
+                else:
+                    best_col = self.bot.act(matrix, self.next_value, deadline)
+                self.input_column = best_col
+                self.last_move_time = current_time
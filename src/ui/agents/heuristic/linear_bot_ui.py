@@ -1,14 +1,16 @@
 import pygame
 from ui.game.game_ui import GameUI
+from agents.anytime import Deadline
 from agents.heuristic.linear import LinearBot
 from agents.heuristic.debug.debug import Debugger
 
 
 class LinearBotUI(GameUI):
-    def __init__(self, game_logic):
+    def __init__(self, game_logic, time_budget=0.05):
         super().__init__(game_logic)
-        self.bot = LinearBot()
+        self.bot = LinearBot(game_logic.get_spec())
         self.visualizer = Debugger(list(self.bot.weights.keys()))
+        self.move_budget = time_budget
         self.last_move_time = 0
         self.move_delay = 200
         self.debug = False
@@ -19,7 +21,7 @@ class LinearBotUI(GameUI):
             current_time = pygame.time.get_ticks()
             if current_time - self.last_move_time > self.move_delay:
                 matrix = self.game_logic.get_matrix()
-                self.visualizer = self.visualizer if self.debug else None
-                best_col = self.bot.solve(matrix, self.next_value, self.visualizer)
+                self.bot.debugger = self.visualizer if self.debug else None
+                best_col = self.bot.act(matrix, self.next_value, Deadline(self.move_budget))
                 self.input_column = best_col
                 self.last_move_time = current_time
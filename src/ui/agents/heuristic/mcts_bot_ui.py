@@ -0,0 +1,34 @@
+import pygame
+from ui.game.game_ui import GameUI
+from agents.anytime import Deadline
+from agents.heuristic.mcts import MCTSBot
+from agents.heuristic.debug.debug import Debugger
+
+
+class MCTSBotUI(GameUI):
+    def __init__(self, game_logic, time_budget=0.15, rollout_policy="random"):
+        super().__init__(game_logic)
+        self.bot = MCTSBot(
+            game_logic.get_spec(), time_budget=time_budget, iterations=None, rollout_policy=rollout_policy
+        )
+        self.move_budget = time_budget
+        self.visualizer = Debugger(list(self.bot.leaf_evaluator.weights.keys()))
+        self.last_move_time = 0
+        self.move_delay = 200
+        self.debug = False
+
+    def handle_events(self):
+        super().handle_events()
+        if not self.game_is_over and self.input_column is None:
+            current_time = pygame.time.get_ticks()
+            if current_time - self.last_move_time > self.move_delay:
+                matrix = self.game_logic.get_matrix()
+                best_col = self.bot.act(matrix, self.next_value, Deadline(self.move_budget))
+                if self.debug:
+                    stats = self.bot.stats()
+                    self.visualizer.draw_status(
+                        f"{stats['iterations']} ITERATIONS ({stats['reused_visits']} REUSED)   "
+                        f"{stats['elapsed'] * 1000:.1f} MS   {stats['iterations_per_sec']:.0f} ITERATIONS/S"
+                    )
+                self.input_column = best_col
+                self.last_move_time = current_time
@@ -1,10 +1,4 @@
 import pygame
-from core.utils.core_utils import (
-    game_over,
-    rearrange,
-    remove_redundant,
-    _get_remove_values,
-)
 from core.game_logic import GameLogic
 from agents.rl.teacher import RLAgent
 from ui.game.game_ui import GameUI
@@ -39,9 +33,7 @@ class RLBotUI:
             self.ui.input_column is None
             and now - self.last_action_time >= self.move_interval_ms
         ):
-            action = self.agent.select_action(
-                self.game.get_matrix(), self.ui.next_value, deterministic=True
-            )
+            action = self.agent.act(self.game.get_matrix(), self.ui.next_value)
             self.ui.input_column = action
             self.last_action_time = now
         current_time = pygame.time.get_ticks()
@@ -52,22 +44,16 @@ class RLBotUI:
             self.last_move_time = current_time
             col = self.ui.input_column
             next_val = self.ui.next_value
-            old_matrix = [row[:] for row in self.game.get_matrix()]
             try:
                 self.ui.trigger_drop_animation(col, next_val)
             except Exception:
                 pass
-            merged, _ = self.game.add_to_column(next_val, col)
-            if not merged:
+            turn = self.game.play_turn(col)
+            if not turn.accepted:
                 self.ui.show_temp_message("Column full!")
                 self.ui.input_column = None
             else:
-                new_matrix = self.game.get_matrix()
-                try:
-                    self.ui.detect_and_trigger_animations(old_matrix, new_matrix, col)
-                except Exception:
-                    pass
-                self.ui.next_value = self.game.get_random_value()
+                self.ui.next_value = turn.next_value
                 self.ui.input_column = None
         self.ui.draw_matrix()
         self.ui.clock.tick(self.fps)
@@ -77,26 +63,10 @@ class RLBotUI:
         self.load_agent()
         self.reset()
         while True:
-            if game_over(self.game.get_matrix(), self.ui.next_value):
+            if self.game.is_game_over(self.ui.next_value):
                 self.ui.draw_game_over()
                 self.ui._save_game_over_to_csv()
                 pygame.time.delay(2000)
                 self.reset()
             if not self.step():
                 break
-            matrix = self.game.get_matrix()
-            matrix = rearrange(matrix)
-            max_value = max((max(row) for row in matrix))
-            remove_values = _get_remove_values(max_value)
-            _, matrix = remove_redundant(matrix=matrix, remove_values=remove_values)
-            while True:
-                old_matrix = [row[:] for row in matrix]
-                merged, _ = self.game.merge_column()
-                if not merged:
-                    break
-                matrix = rearrange(self.game.get_matrix())
-                try:
-                    self.ui.detect_and_trigger_animations(old_matrix, matrix, None)
-                except Exception:
-                    pass
-            self.game.set_matrix(matrix)
@@ -6,13 +6,7 @@ import math
 import colorsys
 import random
 from datetime import datetime
-from config.constants import CELL_SIZE, MARGIN, SCORE_FONT_SIZE, GRID_LENGTH, GRID_WIDTH
-from core.utils.core_utils import (
-    game_over,
-    rearrange,
-    remove_redundant,
-    _get_remove_values,
-)
+from config.constants import CELL_SIZE, MARGIN, SCORE_FONT_SIZE
 
 
 class Particle:
@@ -133,11 +127,12 @@ class GameUI:
 
     def __init__(self, game_logic):
         self.game_logic = game_logic
+        self.spec = game_logic.get_spec()
         self.top_padding = 90
         self.bottom_padding = 110
-        self.window_width = GRID_WIDTH * (CELL_SIZE + MARGIN) + MARGIN
+        self.window_width = self.spec.cols * (CELL_SIZE + MARGIN) + MARGIN
         self.window_height = (
-            GRID_LENGTH * (CELL_SIZE + MARGIN) + self.top_padding + self.bottom_padding
+            self.spec.rows * (CELL_SIZE + MARGIN) + self.top_padding + self.bottom_padding
         )
         pygame.init()
         pygame.mixer.init()
@@ -191,6 +186,7 @@ class GameUI:
         self.restart_button_rect = None
         self.fullscreen_button_rect = None
         self.game_over_time = None
+        self.game_logic.subscribe(self.on_turn)
 
     def get_cell_color(self, value):
         if value == 0:
@@ -338,10 +334,10 @@ class GameUI:
         if self.hover_column < 0 or self.game_is_over:
             return
         target_row = 0
-        for r in range(GRID_LENGTH):
+        for r in range(self.spec.rows):
             if self.render_matrix[r][self.hover_column] != 0:
                 target_row += 1
-        if target_row >= GRID_LENGTH:
+        if target_row >= self.spec.rows:
             return
         x = MARGIN + self.hover_column * (CELL_SIZE + MARGIN)
         y = self.top_padding + MARGIN + target_row * (CELL_SIZE + MARGIN)
@@ -379,8 +375,7 @@ class GameUI:
 
     def _save_game_over_to_csv(self):
         try:
-            matrix = self.game_logic.get_matrix()
-            highest_tile = max((max(row) for row in matrix)) if matrix else 0
+            highest_tile = self.game_logic.max_tile()
             score = self.game_logic.get_score()
             timestamp = datetime.utcnow().isoformat()
             row = {
@@ -410,15 +405,15 @@ class GameUI:
         grid_rect = pygame.Rect(
             MARGIN - 2,
             self.top_padding - 2,
-            GRID_WIDTH * (CELL_SIZE + MARGIN) - MARGIN + 4,
-            GRID_LENGTH * (CELL_SIZE + MARGIN) - MARGIN + 4,
+            self.spec.cols * (CELL_SIZE + MARGIN) - MARGIN + 4,
+            self.spec.rows * (CELL_SIZE + MARGIN) - MARGIN + 4,
         )
         pygame.draw.rect(self.render_surface, (40, 40, 50), grid_rect, border_radius=18)
         inner_grid = pygame.Rect(
             MARGIN,
             self.top_padding,
-            GRID_WIDTH * (CELL_SIZE + MARGIN) - MARGIN,
-            GRID_LENGTH * (CELL_SIZE + MARGIN) - MARGIN,
+            self.spec.cols * (CELL_SIZE + MARGIN) - MARGIN,
+            self.spec.rows * (CELL_SIZE + MARGIN) - MARGIN,
         )
         self.draw_rounded_rect(self.render_surface, self.GRID_BG, inner_grid, 16)
         self.draw_column_hover()
@@ -429,7 +424,7 @@ class GameUI:
             if elapsed < flash_dur:
                 alpha = int(160 * (1 - elapsed / flash_dur))
                 fx = MARGIN + flash_col * (CELL_SIZE + MARGIN)
-                col_h = GRID_LENGTH * (CELL_SIZE + MARGIN) - MARGIN
+                col_h = self.spec.rows * (CELL_SIZE + MARGIN) - MARGIN
                 flash_surf = pygame.Surface((CELL_SIZE, col_h), pygame.SRCALPHA)
                 flash_surf.fill((255, 255, 255, alpha))
                 self.render_surface.blit(flash_surf, (fx, self.top_padding))
@@ -437,8 +432,8 @@ class GameUI:
                 self.col_flash = None
         self.render_matrix = [row[:] for row in self.game_logic.get_matrix()]
         current_time = pygame.time.get_ticks()
-        for row in range(GRID_LENGTH):
-            for col in range(GRID_WIDTH):
+        for row in range(self.spec.rows):
+            for col in range(self.spec.cols):
                 rect = pygame.Rect(
                     MARGIN + col * (CELL_SIZE + MARGIN),
                     self.top_padding + MARGIN + row * (CELL_SIZE + MARGIN),
@@ -505,8 +500,8 @@ class GameUI:
             text_surface = self.render_label(font, value, self.TEXT_LIGHT)
             text_rect = text_surface.get_rect(center=rect.center)
             self.render_surface.blit(text_surface, text_rect)
-        for row in range(GRID_LENGTH):
-            for col in range(GRID_WIDTH):
+        for row in range(self.spec.rows):
+            for col in range(self.spec.cols):
                 value = self.render_matrix[row][col]
                 if value == 0:
                     continue
@@ -639,7 +634,7 @@ class GameUI:
         x, y = self.mouse_pos
         if y >= self.top_padding - 40:
             col = (x - MARGIN) // (CELL_SIZE + MARGIN)
-            self.hover_column = col if 0 <= col < GRID_WIDTH else -1
+            self.hover_column = col if 0 <= col < self.spec.cols else -1
         else:
             self.hover_column = -1
         for event in pygame.event.get():
@@ -666,7 +661,7 @@ class GameUI:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
                     self.reset_game()
-                for i in range(GRID_WIDTH):
+                for i in range(self.spec.cols):
                     if event.key == getattr(pygame, f"K_{i}"):
                         self.input_column = i
                         self.col_flash = (i, pygame.time.get_ticks())
@@ -682,7 +677,7 @@ class GameUI:
                         return
                     if click_y >= self.top_padding:
                         col = int((click_x - MARGIN) // (CELL_SIZE + MARGIN))
-                        if 0 <= col < GRID_WIDTH:
+                        if 0 <= col < self.spec.cols:
                             self.input_column = col
                             self.col_flash = (col, pygame.time.get_ticks())
 
@@ -767,8 +762,7 @@ class GameUI:
             self._draw_stat(
                 "TOTAL SCORE", self.format_score(score), cx, card_rect.top + 120
             )
-            matrix = self.game_logic.get_matrix()
-            highest = max((max(r) for r in matrix)) if matrix else 0
+            highest = self.game_logic.max_tile()
             self._draw_stat(
                 "HIGHEST BLOCK",
                 self.format_value_label(highest),
@@ -847,11 +841,11 @@ class GameUI:
     def trigger_drop_animation(self, col, value):
         matrix = self.game_logic.get_matrix()
         target_row = 0
-        for row in range(GRID_LENGTH):
+        for row in range(self.spec.rows):
             if matrix[row][col] == 0:
                 target_row = row
                 break
-            elif row == GRID_LENGTH - 1:
+            elif row == self.spec.rows - 1:
                 target_row = row
         start_y = self.window_height - self.bottom_padding + CELL_SIZE
         target_y = self.top_padding + MARGIN + target_row * (CELL_SIZE + MARGIN)
@@ -859,70 +853,33 @@ class GameUI:
             (col, start_y, target_y, value, pygame.time.get_ticks())
         )
 
-    def detect_and_trigger_animations(self, old_matrix, new_matrix, merged_col):
+    def on_turn(self, turn, stream):
         current_time = pygame.time.get_ticks()
-        if old_matrix is None:
-            return
-        target_cells = {}
-        for row in range(GRID_LENGTH):
-            for col in range(GRID_WIDTH):
-                old_val = old_matrix[row][col]
-                new_val = new_matrix[row][col]
-                if new_val != 0 and new_val > old_val:
-                    target_cells[col, row] = new_val
-                    if old_val != 0:
-                        if self.merge_sound:
-                            self.merge_sound.play()
-                        self.shake_intensity = 0
-                        cell_center_x = (
-                            MARGIN + col * (CELL_SIZE + MARGIN) + CELL_SIZE // 2
-                        )
-                        cell_center_y = (
-                            self.top_padding
-                            + MARGIN
-                            + row * (CELL_SIZE + MARGIN)
-                            + CELL_SIZE // 2
-                        )
-                        color = self.get_cell_color(new_val)
-                        for _ in range(18):
-                            self.particles.append(
-                                Particle(cell_center_x, cell_center_y, color)
-                            )
-                        self.score_popups.append(
-                            ScorePopup(cell_center_x, cell_center_y - 20, new_val)
-                        )
-                    else:
-                        pass
-        for row in range(GRID_LENGTH):
-            for col in range(GRID_WIDTH):
-                old_val = old_matrix[row][col]
-                new_val = new_matrix[row][col]
-                if old_val != 0 and new_val == 0:
-                    best_target = None
-                    best_dist = float("inf")
-                    for (t_col, t_row), t_val in target_cells.items():
-                        if t_val >= old_val * 2:
-                            dist = abs(col - t_col) + abs(row - t_row)
-                            if dist < best_dist:
-                                best_dist = dist
-                                best_target = (t_col, t_row)
-                    if best_target:
-                        self.merge_animations.append(
-                            (
-                                col,
-                                row,
-                                best_target[0],
-                                best_target[1],
-                                current_time,
-                                old_val,
-                            )
-                        )
+        for event in turn.events:
+            row, col = event.target
+            if self.merge_sound:
+                self.merge_sound.play()
+            self.shake_intensity = 0
+            cell_center_x = MARGIN + col * (CELL_SIZE + MARGIN) + CELL_SIZE // 2
+            cell_center_y = (
+                self.top_padding + MARGIN + row * (CELL_SIZE + MARGIN) + CELL_SIZE // 2
+            )
+            color = self.get_cell_color(event.value)
+            for _ in range(18):
+                self.particles.append(Particle(cell_center_x, cell_center_y, color))
+            self.score_popups.append(
+                ScorePopup(cell_center_x, cell_center_y - 20, event.value)
+            )
+            source_value = event.value >> len(event.sources)
+            for source_row, source_col in event.sources:
+                self.merge_animations.append(
+                    (source_col, source_row, col, row, current_time, source_value)
+                )
 
     def run(self):
         while True:
             current_time = pygame.time.get_ticks()
-            matrix = self.game_logic.get_matrix()
-            if game_over(matrix, self.next_value):
+            if self.game_logic.is_game_over(self.next_value):
                 if not self.game_is_over:
                     self.game_is_over = True
                     if self.game_logic.get_score() > self.high_score:
@@ -940,38 +897,15 @@ class GameUI:
             self.handle_events()
             show_message = False
             if not self.game_is_over and self.input_column is not None:
-                old_matrix = [row[:] for row in matrix]
                 self.trigger_drop_animation(self.input_column, self.next_value)
-                merged, count = self.game_logic.add_to_column(
-                    self.next_value, self.input_column
-                )
-                if not merged:
+                turn = self.game_logic.play_turn(self.input_column)
+                if not turn.accepted:
                     show_message = True
-                    self.game_logic.merge_column(self.input_column)
                     self.drop_animations = []
                 else:
-                    new_matrix = self.game_logic.get_matrix()
-                    self.detect_and_trigger_animations(
-                        old_matrix, new_matrix, self.input_column
-                    )
-                    self.next_value = self.game_logic.get_random_value()
+                    self.next_value = turn.next_value
                     self.input_column = None
             if show_message and (not self.game_is_over):
                 self.show_temp_message("Column is full!")
-            matrix = self.game_logic.get_matrix()
-            matrix = rearrange(matrix)
-            max_value = max((max(row) for row in matrix))
-            remove_value = _get_remove_values(max_value)
-            _, matrix = remove_redundant(matrix=matrix, remove_values=remove_value)
-            while True:
-                old_m = [r[:] for r in matrix]
-                merged, _ = self.game_logic.merge_column()
-                if not merged:
-                    break
-                matrix = rearrange(matrix)
-                self.game_logic.set_matrix(matrix)
-                new_m = self.game_logic.get_matrix()
-                self.detect_and_trigger_animations(old_m, new_m, -1)
-            self.game_logic.set_matrix(matrix)
             self.draw_matrix()
             self.clock.tick(60)
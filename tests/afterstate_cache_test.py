@@ -0,0 +1,117 @@
+import numpy as np
+from agents.heuristic.afterstate_cache import REJECTED, AfterstateCache
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.linear import LinearBot
+from agents.rl.standard import NoTeacherAgent
+from agents.rl.teacher import RLAgent
+from core.utils.board_spec import BoardSpec
+
+
+def test_cached_afterstates_match_uncached(positions):
+    bot = BasicBot()
+    cache = AfterstateCache()
+    cache.bind(bot.spec, bot.evaluator.names)
+    for matrix, value in positions(3):
+        for _ in range(2):
+            moves, features = bot.evaluator.scored_afterstates(matrix, value, cache)
+            expected = bot.afterstates(matrix, value)
+            assert [m[0] for m in moves] == [m[0] for m in expected]
+            for (_, board, score, merges), (_, want, want_score, want_merges) in zip(moves, expected):
+                assert [list(row) for row in board] == want
+                assert (score, merges) == (want_score, want_merges)
+            assert np.array_equal(features, bot.batch_features(expected))
+    stats = cache.stats()
+    assert stats["hits"] >= stats["misses"] > 0
+
+
+def test_rejected_columns_are_cached():
+    spec = BoardSpec(rows=2, cols=2)
+    bot = BasicBot(spec, cache=AfterstateCache())
+    matrix = [[2, 4], [8, 16]]
+    assert bot.scored_afterstates(matrix, 16)[0][0][0] == 1
+    key = bot.cache.board_key(matrix)
+    assert bot.cache.get(key, 16, 0) is REJECTED
+    misses = bot.cache.stats()["misses"]
+    bot.scored_afterstates(matrix, 16)
+    assert bot.cache.stats()["misses"] == misses
+
+
+def test_cached_bot_decisions_unchanged(positions):
+    plain, cached = BasicBot(), BasicBot(cache=AfterstateCache(capacity=64))
+    for matrix, value in positions(4) * 2:
+        assert plain.solve(matrix, value) == cached.solve(matrix, value)
+    assert plain.weights == cached.weights
+    assert cached.cache.stats()["replacements"] > 0
+
+
+def test_lru_eviction_keeps_recent_entries(positions):
+    bot = BasicBot(cache=AfterstateCache(capacity=10))
+    states = positions(5, count=5)
+    for matrix, value in states:
+        bot.scored_afterstates(matrix, value)
+    assert len(bot.cache) == 10
+    matrix, value = states[-1]
+    key = bot.cache.board_key(matrix)
+    assert all(bot.cache.get(key, value, col) is not None for col in range(bot.spec.cols))
+    matrix, value = states[0]
+    key = bot.cache.board_key(matrix)
+    assert bot.cache.get(key, value, 0) is None
+
+
+def test_cached_features_are_read_only(positions):
+    bot = BasicBot(cache=AfterstateCache())
+    matrix, value = positions(6, count=1)[0]
+    _, features = bot.scored_afterstates(matrix, value)
+    features[:] = 0.0
+    _, again = bot.scored_afterstates(matrix, value)
+    assert again.any()
+    entry = bot.cache.get(bot.cache.board_key(matrix), value, 0)
+    assert not entry.features.flags.writeable
+
+
+def test_cache_rejects_mismatched_features():
+    cache = AfterstateCache()
+    BasicBot(cache=cache)
+    try:
+        LinearBot(cache=cache)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("raw-feature bot accepted a normalized cache")
+    try:
+        BasicBot(BoardSpec(rows=6, cols=6), cache=cache)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("cache accepted a second board spec")
+
+
+def test_rl_agents_share_a_cache(positions):
+    cache = AfterstateCache()
+    teacher, student = RLAgent(cache=cache), NoTeacherAgent(cache=cache)
+    assert teacher.rl_bot.cache is student.rl_bot.cache is cache
+    for matrix, value in positions(7, count=20):
+        teacher.select_action_with_teacher(matrix, value)
+    hits = cache.stats()["hits"]
+    for matrix, value in positions(7, count=20):
+        student.select_action(matrix, value, deterministic=True)
+    assert cache.stats()["hits"] >= hits + 20 * teacher.spec.cols
+
+
+def test_rl_agents_default_to_private_caches():
+    assert RLAgent().cache is not RLAgent().cache
+    assert NoTeacherAgent().cache is not None
+
+
+if __name__ == "__main__":
+    from conftest import played_positions
+
+    test_cached_afterstates_match_uncached(played_positions)
+    test_rejected_columns_are_cached()
+    test_cached_bot_decisions_unchanged(played_positions)
+    test_lru_eviction_keeps_recent_entries(played_positions)
+    test_cached_features_are_read_only(played_positions)
+    test_cache_rejects_mismatched_features()
+    test_rl_agents_share_a_cache(played_positions)
+    test_rl_agents_default_to_private_caches()
+    print("All tests passed!")
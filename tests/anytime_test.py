@@ -0,0 +1,141 @@
+import time
+from agents.anytime import Deadline, LatencyTracker, TimeControl
+from agents.heuristic.adaptive_linear import AdaptiveLinearBot
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.expectimax import ExpectimaxBot
+from agents.heuristic.fixed_linear import FixedLinearBot
+from agents.heuristic.linear import LinearBot
+from agents.heuristic.mcts import MCTSBot
+from agents.rl.standard import NoTeacherAgent
+from agents.rl.teacher import RLAgent
+from benchmark import make_basic_bot, run_episode_headless
+from core.game_logic import GameLogic
+
+
+def midgame(seed, moves=30):
+    game = GameLogic(seed=seed)
+    bot = BasicBot()
+    for _ in range(moves):
+        game.play_turn(bot.solve(game.get_matrix(), game.get_next_value()))
+    return game
+
+
+def test_deadline_expiry():
+    assert not Deadline().expired(10 ** 9)
+    assert Deadline().remaining() == float("inf")
+    assert Deadline(nodes=5).expired(5)
+    assert not Deadline(nodes=5).expired(4)
+    assert Deadline(0.0).expired()
+    assert Deadline(10.0).expired(margin=20.0)
+    assert not Deadline(10.0).expired()
+    assert TimeControl().deadline() is None
+    assert TimeControl(nodes=3).deadline().nodes == 3
+
+
+def test_latency_tracker_counts_overruns():
+    tracker = LatencyTracker()
+    assert tracker.summary()["moves"] == 0
+    deadline = Deadline(0.01)
+    tracker.record(0.005, deadline)
+    tracker.record(0.02, deadline)
+    tracker.record(0.5)
+    summary = tracker.summary()
+    assert summary["moves"] == 3
+    assert summary["overruns"] == 1
+    assert summary["max_ms"] == 500.0
+
+
+def test_latency_tracker_keeps_a_bounded_window():
+    tracker = LatencyTracker(window=4)
+    for ms in range(1, 11):
+        tracker.record(ms / 1000.0)
+    assert len(tracker.recent) == 4
+    summary = tracker.summary()
+    assert summary["moves"] == 10
+    assert abs(summary["mean_ms"] - 5.5) < 1e-9
+    assert abs(summary["max_ms"] - 10.0) < 1e-9
+    assert 7.0 <= summary["p95_ms"] <= 10.0
+
+
+def test_every_agent_acts_under_a_deadline():
+    game = midgame(3)
+    matrix = [row[:] for row in game.get_matrix()]
+    value = game.get_next_value()
+    legal = [col for col in range(5) if game.column_height(col) < 7 or matrix[6][col] == value]
+    agents = [
+        BasicBot(), LinearBot(), AdaptiveLinearBot(), FixedLinearBot(),
+        ExpectimaxBot(), MCTSBot(seed=0), NoTeacherAgent(), RLAgent(),
+    ]
+    for agent in agents:
+        column = agent.act(game.get_matrix(), value, Deadline(0.05))
+        assert column in legal
+        assert game.get_matrix() == matrix
+        assert agent.latency.summary()["moves"] == 1
+
+
+def test_one_ply_agents_match_solve():
+    game = midgame(5)
+    for cls in (BasicBot, LinearBot, AdaptiveLinearBot, FixedLinearBot):
+        assert cls().act(game.get_matrix(), 4, Deadline(0.0)) == cls().solve(game.get_matrix(), 4)
+    assert RLAgent().act(game.get_matrix(), 4) == RLAgent().select_action(game.get_matrix(), 4)
+
+
+def test_act_forwards_the_debugger():
+    class Recorder:
+        def __init__(self):
+            self.columns = []
+
+        def update(self, column, impact, score):
+            self.columns.append(column)
+
+        def draw_summary(self, summaries, best_column):
+            self.best = best_column
+
+    game = midgame(4)
+    for cls in (BasicBot, LinearBot, AdaptiveLinearBot, FixedLinearBot):
+        bot = cls()
+        bot.debugger = Recorder()
+        column = bot.act(game.get_matrix(), game.get_next_value(), Deadline(0.05))
+        assert bot.debugger.best == column
+        assert bot.debugger.columns
+        assert bot.latency.summary()["moves"] == 1
+
+
+def test_search_agents_honour_node_budgets():
+    game = midgame(7)
+    mcts = MCTSBot(iterations=500, seed=2)
+    mcts.act(game.get_matrix(), game.get_next_value(), Deadline(nodes=7))
+    assert mcts.completed_iterations == 7
+    expectimax = ExpectimaxBot(depth=4, time_budget=None)
+    expectimax.act(game.get_matrix(), game.get_next_value(), Deadline(nodes=40))
+    assert expectimax.completed_depth == 1
+    assert expectimax.game.undo_depth() == 0
+
+
+def test_search_agents_return_near_the_deadline():
+    game = midgame(9)
+    for agent in (ExpectimaxBot(depth=8, time_budget=None), MCTSBot(iterations=None, time_budget=10.0, seed=1)):
+        start = time.perf_counter()
+        agent.act(game.get_matrix(), game.get_next_value(), Deadline(0.03))
+        assert time.perf_counter() - start < 0.25
+
+
+def test_benchmark_records_latency_under_time_control():
+    agent = make_basic_bot()
+    result = run_episode_headless(agent.act, seed=1, time_control=TimeControl(0.5))
+    summary = agent.latency.summary()
+    assert summary["moves"] in (result["moves"], result["moves"] + 1)
+    assert summary["overruns"] == 0
+
+
+if __name__ == "__main__":
+    test_deadline_expiry()
+    test_latency_tracker_counts_overruns()
+    test_latency_tracker_keeps_a_bounded_window()
+    test_every_agent_acts_under_a_deadline()
+    test_one_ply_agents_match_solve()
+    test_act_forwards_the_debugger()
+    test_search_agents_honour_node_budgets()
+    test_search_agents_return_near_the_deadline()
+    test_benchmark_records_latency_under_time_control()
+    print("All tests passed!")
@@ -0,0 +1,123 @@
+import random
+from agents.heuristic.basic_bot import BasicBot
+from core import bitboard
+from core.bitboard import BitboardGameLogic, decode, encode
+from core.game_logic import GameLogic
+from core.utils.board_spec import BoardSpec
+from core.utils.core_utils import has_merge
+
+
+def play_both(reference, packed, choose, moves):
+    value = reference.get_next_value()
+    assert packed.get_next_value() == value
+    for move in range(moves):
+        if reference.is_game_over(value):
+            break
+        column = choose(reference.get_matrix(), value)
+        expected = reference.play_turn(column)
+        assert packed.play_turn(column) == expected, move
+        assert packed.get_matrix() == reference.get_matrix(), move
+        assert packed.get_score() == reference.get_score(), move
+        value = expected.next_value
+    assert packed.is_game_over(value) == reference.is_game_over(value)
+    return move
+
+
+def test_encode_roundtrip(random_board):
+    rng = random.Random(3)
+    for spec in (None, BoardSpec(6, 4), BoardSpec(9, 8)):
+        for _ in range(200):
+            matrix = random_board(rng, spec, max_exp=40)
+            assert decode(encode(matrix, spec), spec) == matrix
+
+
+def test_lane_queries_match_matrix(random_board):
+    rng = random.Random(5)
+    lay = bitboard.layout()
+    for _ in range(2000):
+        matrix = random_board(rng, fill=rng.random(), max_exp=rng.randint(1, 12))
+        board = encode(matrix)
+        reference = GameLogic()
+        reference.set_matrix(matrix)
+        packed = BitboardGameLogic()
+        packed.set_matrix(matrix)
+        assert bitboard.has_merge(board, lay) == has_merge(matrix)
+        holes = any(
+            matrix[row][column] == 0 and matrix[row + 1][column]
+            for row in range(len(matrix) - 1) for column in range(len(matrix[0]))
+        )
+        assert bitboard.has_holes(board, lay) == holes
+        assert packed.max_tile() == reference.max_tile()
+        assert packed.empty_count() == reference.empty_count()
+        assert packed.column_heights() == reference.column_heights()
+        for value in (2, 4, 8, 16):
+            assert packed.is_game_over(value) == reference.is_game_over(value)
+
+
+def test_play_turn_matches_list_engine():
+    for seed in range(20):
+        policy = random.Random(seed)
+        play_both(
+            GameLogic(seed=seed), BitboardGameLogic(seed=seed),
+            lambda matrix, value: policy.randrange(5), 400,
+        )
+
+
+def test_long_game_with_purges_matches_list_engine():
+    reference = GameLogic(seed=0)
+    bot = BasicBot(frozen=True)
+    play_both(reference, BitboardGameLogic(seed=0), bot.solve, 5000)
+    assert reference.max_tile() >= 4096
+
+
+def test_other_shapes_match_list_engine():
+    for spec in (BoardSpec(6, 4), BoardSpec(4, 7)):
+        for seed in range(5):
+            policy = random.Random(seed)
+            play_both(
+                GameLogic(seed=seed, spec=spec), BitboardGameLogic(seed=seed, spec=spec),
+                lambda matrix, value: policy.randrange(spec.cols), 300,
+            )
+
+
+def test_add_to_column_and_merge_column_match(random_matrix):
+    rng = random.Random(13)
+    for _ in range(2000):
+        matrix = random_matrix(rng)
+        column = rng.randrange(5)
+        value = 2 ** rng.randint(1, 4)
+        reference = GameLogic()
+        reference.set_matrix([row[:] for row in matrix])
+        packed = BitboardGameLogic()
+        packed.set_matrix(matrix)
+        assert packed.add_to_column(value, column) == reference.add_to_column(value, column)
+        assert packed.get_matrix() == reference.get_matrix()
+        assert packed.merge_column() == reference.merge_column()
+        assert packed.get_matrix() == reference.get_matrix()
+        assert packed.get_score() == reference.get_score()
+
+
+def test_snapshot_restore_round_trips():
+    game = BitboardGameLogic(seed=4)
+    for column in (0, 1, 2, 3, 4, 2, 2):
+        game.play_turn(column)
+    before = (game.get_matrix(), game.get_score(), game.get_next_value())
+    snapshot = game.snapshot()
+    first = game.play_turn(3)
+    game.play_turn(1)
+    game.restore(snapshot)
+    assert (game.get_matrix(), game.get_score(), game.get_next_value()) == before
+    assert game.play_turn(3)[:4] == first[:4]
+
+
+if __name__ == "__main__":
+    from conftest import scattered_board, stacked_matrix
+
+    test_encode_roundtrip(scattered_board)
+    test_lane_queries_match_matrix(scattered_board)
+    test_play_turn_matches_list_engine()
+    test_long_game_with_purges_matches_list_engine()
+    test_other_shapes_match_list_engine()
+    test_add_to_column_and_merge_column_match(stacked_matrix)
+    test_snapshot_restore_round_trips()
+    print("All tests passed!")
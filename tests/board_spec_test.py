@@ -0,0 +1,121 @@
+import pickle
+import random
+import numpy as np
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.linear import LinearBot
+from core.game_logic import GameLogic
+from core.m2_env import M2Env
+from core.utils import jit_kernels
+from core.utils.board_spec import DEFAULT_SPEC, BoardSpec
+from core.utils.core_utils import _get_remove_values, rearrange, remove_redundant
+from core.utils.zobrist import ZOBRIST_KEYS, board_hash, zobrist_keys
+from core.vec_game_logic import VecGameLogic
+
+
+def test_specs_are_interned():
+    assert BoardSpec() is DEFAULT_SPEC
+    assert BoardSpec(7, 5) is DEFAULT_SPEC
+    assert BoardSpec(6, 4) is BoardSpec(6, 4)
+    assert pickle.loads(pickle.dumps(BoardSpec(6, 4))) is BoardSpec(6, 4)
+    assert DEFAULT_SPEC.empty_matrix() == [[0] * 5 for _ in range(7)]
+    try:
+        BoardSpec(0, 5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_tables_are_cached_per_spec():
+    spec = BoardSpec(6, 4)
+    assert zobrist_keys() is ZOBRIST_KEYS
+    assert zobrist_keys(spec) is zobrist_keys(spec)
+    assert len(zobrist_keys(spec)) == 6 and len(zobrist_keys(spec)[0]) == 4
+    assert jit_kernels.kernels(spec) is jit_kernels.kernels(spec)
+    assert jit_kernels.kernels(spec) is not jit_kernels.kernels()
+
+
+def test_game_stats_on_other_shapes():
+    for spec in (BoardSpec(6, 4), BoardSpec(9, 6), BoardSpec(4, 3)):
+        rng = random.Random(spec.cells)
+        game = GameLogic(seed=1, spec=spec)
+        for _ in range(300):
+            turn = game.play_turn(rng.randrange(spec.cols))
+            matrix = game.get_matrix()
+            assert len(matrix) == spec.rows and len(matrix[0]) == spec.cols
+            assert game.get_hash() == board_hash(matrix, spec)
+            assert game.empty_count() == sum(row.count(0) for row in matrix)
+            assert game.max_tile() == max(map(max, matrix))
+            if turn.done or not turn.accepted:
+                game.reset()
+
+
+def test_vec_engine_matches_list_engine_on_other_shape():
+    spec = BoardSpec(6, 4)
+    n = 32
+    vec = VecGameLogic(n, seed=5, spec=spec)
+    policy = np.random.default_rng(9)
+    games = [GameLogic(spec=spec) for _ in range(n)]
+    done = np.zeros(n, dtype=bool)
+    for _ in range(200):
+        values = vec.get_next_values()
+        columns = policy.integers(0, spec.cols, size=n)
+        rewards, dones = vec.step(columns)
+        matrices = vec.get_matrices()
+        for i, game in enumerate(games):
+            if done[i]:
+                continue
+            merged, count = game.add_to_column(int(values[i]), int(columns[i]))
+            if merged:
+                matrix = rearrange(game.get_matrix())
+                max_value = max(max(row) for row in matrix)
+                remove_redundant(matrix=matrix, remove_values=_get_remove_values(max_value))
+                game.resolve_merges()
+                assert count == rewards[i]
+                assert matrices[i].tolist() == game.get_matrix()
+                assert game.get_score() == vec.get_scores()[i]
+            done[i] = dones[i]
+        if done.all():
+            break
+
+
+def test_bots_play_other_shapes():
+    spec = BoardSpec(9, 6)
+    rng = random.Random(3)
+    for bot in (BasicBot(spec), LinearBot(spec)):
+        game = GameLogic(seed=2, spec=spec)
+        for _ in range(60):
+            column = bot.solve(game.get_matrix(), game.get_next_value())
+            assert 0 <= column < spec.cols
+            turn = game.play_turn(column)
+            if turn.done or not turn.accepted:
+                break
+    for _ in range(200):
+        matrix = [[0] * spec.cols for _ in range(spec.rows)]
+        for column in range(spec.cols):
+            for row in range(rng.randint(0, spec.rows)):
+                matrix[row][column] = 2 ** rng.randint(1, 4)
+        column = rng.randrange(spec.cols)
+        general = [row[:] for row in matrix]
+        flat = [row[:] for row in matrix]
+        bot = BasicBot(spec)
+        assert bot.evaluator._simulate_move_general(general, column, 4) == jit_kernels.simulate_move(flat, column, 4, spec)
+        assert general == flat
+        assert bot.evaluator._compute_features_flat(0, flat, 8, 1) == bot.compute_features(0, flat, 8, 1)
+
+
+def test_env_respects_spec():
+    env = M2Env(seed=0, spec=BoardSpec(6, 4))
+    obs, info = env.reset()
+    assert obs["board"].shape == (6, 4)
+    assert info["action_mask"].shape == (4,)
+
+
+if __name__ == "__main__":
+    test_specs_are_interned()
+    test_tables_are_cached_per_spec()
+    test_game_stats_on_other_shapes()
+    test_vec_engine_matches_list_engine_on_other_shape()
+    test_bots_play_other_shapes()
+    test_env_respects_spec()
+    print("All tests passed!")
@@ -0,0 +1,53 @@
+import random
+from core.game_logic import GameLogic
+from core.utils.core_utils import game_over, rearrange
+
+
+def expected_stats(matrix):
+    heights = tuple(sum(1 for row in matrix if row[column]) for column in range(5))
+    return (max(map(max, matrix)), sum(row.count(0) for row in matrix), heights)
+
+
+def actual_stats(game):
+    return (game.max_tile(), game.empty_count(), game.column_heights())
+
+
+def test_stats_track_random_games():
+    for seed in range(30):
+        random.seed(seed)
+        policy = random.Random(seed)
+        game = GameLogic()
+        value = game.get_random_value()
+        for _ in range(300):
+            matrix = game.get_matrix()
+            assert actual_stats(game) == expected_stats(matrix)
+            assert game.is_game_over(value) == game_over(matrix, value)
+            if game.is_game_over(value):
+                break
+            merged, _ = game.add_to_column(value, policy.randrange(5))
+            assert actual_stats(game) == expected_stats(game.get_matrix())
+            if merged:
+                game.set_matrix(rearrange(game.get_matrix()))
+                game.resolve_merges()
+                assert actual_stats(game) == expected_stats(game.get_matrix())
+            value = game.get_random_value()
+
+
+def test_set_matrix_and_reset():
+    game = GameLogic()
+    matrix = [[2 ** (row + column + 1) for column in range(5)] for row in range(7)]
+    game.set_matrix(matrix)
+    assert game.max_tile() == 2 ** 11
+    assert game.empty_count() == 0
+    assert game.column_heights() == (7, 7, 7, 7, 7)
+    assert game.is_game_over(4)
+    assert not game.is_game_over(2 ** 7)
+    game.reset()
+    assert actual_stats(game) == (0, 35, (0, 0, 0, 0, 0))
+    assert not game.is_game_over(2)
+
+
+if __name__ == "__main__":
+    test_stats_track_random_games()
+    test_set_matrix_and_reset()
+    print("All tests passed!")
@@ -0,0 +1,69 @@
+import copy
+import random
+from agents.heuristic.basic_bot import BasicBot
+from core.game_logic import GameLogic
+from core.utils import column_table
+from core.utils.column_table import apply_drop
+
+
+def test_simulate_move_matches_general_path(random_matrix):
+    rng = random.Random(7)
+    bot = BasicBot()
+    for _ in range(3000):
+        matrix = random_matrix(rng)
+        column = rng.randrange(5)
+        value = 2 ** rng.randint(1, 4)
+        fast = copy.deepcopy(matrix)
+        slow = copy.deepcopy(matrix)
+        assert bot.simulate_move(fast, column, value) == bot.evaluator._simulate_move_general(slow, column, value)
+        assert fast == slow
+
+
+def test_add_to_column_matches_general_path(random_matrix):
+    rng = random.Random(11)
+    for _ in range(3000):
+        matrix = random_matrix(rng)
+        column = rng.randrange(5)
+        value = 2 ** rng.randint(1, 4)
+        fast = GameLogic()
+        fast.set_matrix(copy.deepcopy(matrix))
+        slow = GameLogic()
+        slow.set_matrix(copy.deepcopy(matrix))
+        assert fast.add_to_column(value, column) == slow._add_to_column_general(value, column)
+        assert fast.get_matrix() == slow.get_matrix()
+        assert fast.get_score() == slow.get_score()
+
+
+def test_cross_column_merge_falls_back():
+    matrix = [[0] * 5 for _ in range(7)]
+    matrix[0][0] = 4
+    matrix[0][1] = 2
+    assert apply_drop(matrix, 1, 2) is None
+    assert matrix[0][1] == 2
+
+
+def test_table_is_bounded_lru(random_matrix):
+    limit = column_table.TABLE_LIMIT
+    column_table._TABLE = column_table.TranspositionTable(8, "lru")
+    try:
+        rng = random.Random(5)
+        boards = [(random_matrix(rng), 2 ** rng.randint(1, 4)) for _ in range(40)]
+        for matrix, value in boards:
+            apply_drop(copy.deepcopy(matrix), 2, value)
+        assert column_table.table_size() == 8
+        matrix, value = boards[-1]
+        misses = column_table._TABLE.misses
+        apply_drop(copy.deepcopy(matrix), 2, value)
+        assert column_table._TABLE.misses == misses
+    finally:
+        column_table._TABLE = column_table.TranspositionTable(limit, "lru")
+
+
+if __name__ == "__main__":
+    from conftest import stacked_matrix
+
+    test_simulate_move_matches_general_path(stacked_matrix)
+    test_add_to_column_matches_general_path(stacked_matrix)
+    test_cross_column_merge_falls_back()
+    test_table_is_bounded_lru(stacked_matrix)
+    print("All tests passed!")
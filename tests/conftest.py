@@ -0,0 +1,57 @@
+import os
+import sys
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from agents.heuristic.basic_bot import BasicBot
+from core.game_logic import GameLogic
+from core.utils.board_spec import as_spec
+
+
+def stacked_matrix(rng, max_exp=4, fill=0.7, spec=None):
+    spec = as_spec(spec)
+    matrix = [[0] * spec.cols for _ in range(spec.rows)]
+    for column in range(spec.cols):
+        height = rng.randint(0, spec.rows) if rng.random() < fill else rng.randint(0, 3)
+        for row in range(height):
+            matrix[row][column] = 2 ** rng.randint(1, max_exp)
+    return matrix
+
+
+def scattered_board(rng, spec=None, fill=0.6, max_exp=12):
+    spec = as_spec(spec)
+    return [
+        [2 ** rng.randint(1, max_exp) if rng.random() < fill else 0 for _ in range(spec.cols)]
+        for _ in range(spec.rows)
+    ]
+
+
+def played_positions(seed, count=40):
+    game = GameLogic(seed=seed)
+    bot = BasicBot(frozen=True)
+    states = []
+    for _ in range(count):
+        value = game.get_next_value()
+        if game.is_game_over(value):
+            break
+        states.append(([row[:] for row in game.get_matrix()], value))
+        game.play_turn(bot.solve(game.get_matrix(), value))
+    return states
+
+
+@pytest.fixture
+def random_matrix():
+    return stacked_matrix
+
+
+@pytest.fixture
+def random_board():
+    return scattered_board
+
+
+@pytest.fixture
+def positions():
+    return played_positions
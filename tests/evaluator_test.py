@@ -0,0 +1,82 @@
+import random
+from agents.heuristic.adaptive_linear import AdaptiveLinearBot
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.evaluator import AdaptiveWeights, Evaluator, FixedWeights, SimplexWeights
+from agents.heuristic.fixed_linear import FixedLinearBot
+from agents.heuristic.heuristic_bot import HeuristicBot
+from agents.heuristic.linear import LinearBot
+from core.game_logic import GameLogic
+
+
+def test_fixed_weights_never_change():
+    policy = FixedWeights({"a": 1.0, "b": 2.0})
+    policy.update({"a": 5.0, "b": 5.0}, 10.0)
+    assert policy.weights == {"a": 1.0, "b": 2.0}
+
+
+def test_adaptive_weights_renormalize():
+    policy = AdaptiveWeights({"a": 1.0, "b": 1.0}, learning_rate=0.5)
+    policy.update({"a": 2.0, "b": 0.0}, 1.0)
+    assert policy.weights == {"a": 2.0 / 3.0, "b": 1.0 / 3.0}
+    policy.update({"a": 2.0, "b": 0.0}, 0.0)
+    assert policy.weights == {"a": 2.0 / 3.0, "b": 1.0 / 3.0}
+
+
+def test_adaptive_weights_skip_zero_total():
+    policy = AdaptiveWeights({"a": 1.0, "b": -2.0}, learning_rate=1.0)
+    policy.update({"a": 1.0, "b": 0.0}, 1.0)
+    assert policy.weights == {"a": 2.0, "b": -2.0}
+
+
+def test_simplex_weights_keep_negative_total():
+    policy = SimplexWeights({"a": 1.0, "b": -3.0}, learning_rate=1.0)
+    policy.update({"a": 1.0, "b": 0.0}, 1.0)
+    assert policy.weights == {"a": 2.0, "b": -3.0}
+    adaptive = AdaptiveWeights({"a": 1.0, "b": -3.0}, learning_rate=1.0)
+    adaptive.update({"a": 1.0, "b": 0.0}, 1.0)
+    assert adaptive.weights == {"a": -2.0, "b": 3.0}
+
+
+def test_bots_share_one_evaluator_type():
+    for cls, normalized in (
+        (BasicBot, True), (LinearBot, False), (AdaptiveLinearBot, False), (FixedLinearBot, False)
+    ):
+        bot = cls()
+        assert isinstance(bot, HeuristicBot)
+        assert isinstance(bot.evaluator, Evaluator)
+        assert bot.evaluator.normalized is normalized
+        assert list(bot.weights) == list(bot.evaluator.names)
+
+
+def test_solve_matches_evaluate_board():
+    rng = random.Random(5)
+    for cls in (BasicBot, LinearBot, AdaptiveLinearBot, FixedLinearBot):
+        game = GameLogic(seed=3)
+        bot, shadow = cls(), cls()
+        for _ in range(40):
+            matrix = [row[:] for row in game.get_matrix()]
+            value = game.get_next_value()
+            best, best_column = -float("inf"), 0
+            for column, board, score, merges in shadow.afterstates(matrix, value):
+                h_score = shadow.evaluate_board(column, board, score, merges)
+                shadow.update_weights(
+                    shadow.compute_features(column, board, score, merges), shadow.reward(score)
+                )
+                if h_score > best:
+                    best, best_column = h_score, column
+            column = bot.solve(matrix, value)
+            assert column == best_column
+            assert bot.weights == shadow.weights
+            turn = game.play_turn(column if rng.random() < 0.8 else rng.randrange(5))
+            if turn.done:
+                break
+
+
+if __name__ == "__main__":
+    test_fixed_weights_never_change()
+    test_adaptive_weights_renormalize()
+    test_adaptive_weights_skip_zero_total()
+    test_simplex_weights_keep_negative_total()
+    test_bots_share_one_evaluator_type()
+    test_solve_matches_evaluate_board()
+    print("All tests passed!")
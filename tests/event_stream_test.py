@@ -0,0 +1,94 @@
+import random
+from agents.heuristic.basic_bot import BasicBot
+from core.game_logic import GameLogic
+from core.utils.core_utils import MergeEvent, MoveEvent, PurgeEvent
+
+
+def replay(matrix, column, value, events):
+    board = [row[:] for row in matrix]
+    heights = [row[column] for row in board]
+    if 0 in heights:
+        board[heights.index(0)][column] = value
+    for event in events:
+        if isinstance(event, MergeEvent):
+            for row, col in event.sources:
+                board[row][col] = 0
+            board[event.target[0]][event.target[1]] = event.value
+        elif isinstance(event, MoveEvent):
+            board[event.source[0]][event.source[1]] = 0
+            board[event.target[0]][event.target[1]] = event.value
+        elif isinstance(event, PurgeEvent):
+            board[event.cell[0]][event.cell[1]] = 0
+    return board
+
+
+def test_listener_stream_replays_turn():
+    for seed in range(20):
+        plain = GameLogic(seed=seed)
+        tracked = GameLogic(seed=seed)
+        received = []
+        tracked.subscribe(lambda turn, stream: received.append((turn, stream)))
+        policy = random.Random(seed)
+        for _ in range(400):
+            column = policy.randrange(5)
+            before = [row[:] for row in tracked.get_matrix()]
+            value = tracked.get_next_value()
+            expected = plain.play_turn(column)
+            turn = tracked.play_turn(column)
+            assert turn[:6] == expected[:6]
+            assert tracked.get_matrix() == plain.get_matrix()
+            if not turn.accepted:
+                continue
+            assert received[-1][0] is turn
+            stream = received[-1][1]
+            assert turn.events == expected.events
+            assert [event for event in stream if isinstance(event, MergeEvent)] == list(turn.events)
+            assert replay(before, column, value, stream) == tracked.get_matrix()
+            if turn.done:
+                break
+
+
+def test_purges_are_reported():
+    bot = BasicBot()
+    game = GameLogic(seed=2)
+    streams = []
+    game.subscribe(lambda turn, stream: streams.append(stream))
+    purged = 0
+    for _ in range(600):
+        before = [row[:] for row in game.get_matrix()]
+        value = game.get_next_value()
+        column = bot.solve(game.get_matrix(), value)
+        turn = game.play_turn(column)
+        assert replay(before, column, value, streams[-1]) == game.get_matrix()
+        assert all(isinstance(event, MergeEvent) for event in turn.events)
+        purged += sum(isinstance(event, PurgeEvent) for event in streams[-1])
+        if turn.done:
+            break
+    assert purged
+
+
+def test_turn_events_do_not_depend_on_listeners():
+    plain, tracked = GameLogic(seed=4), GameLogic(seed=4)
+    received = []
+
+    def listener(turn, stream):
+        received.append(turn)
+
+    tracked.subscribe(listener)
+    bot = BasicBot(frozen=True)
+    for move in range(300):
+        if move == 150:
+            tracked.unsubscribe(listener)
+        column = bot.solve(plain.get_matrix(), plain.get_next_value())
+        expected, turn = plain.play_turn(column), tracked.play_turn(column)
+        assert turn == expected
+        if turn.done:
+            break
+    assert 0 < len(received) <= 150
+
+
+if __name__ == "__main__":
+    test_listener_stream_replays_turn()
+    test_purges_are_reported()
+    test_turn_events_do_not_depend_on_listeners()
+    print("All tests passed!")
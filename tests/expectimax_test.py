@@ -0,0 +1,108 @@
+import random
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.expectimax import GAME_OVER_VALUE, ExpectimaxBot
+from core.game_logic import GameLogic
+from core.utils.core_utils import SpawnSequence
+
+
+def test_push_turn_matches_play_turn():
+    for seed in range(15):
+        game = GameLogic(seed=seed)
+        shadow = GameLogic(spec=game.get_spec())
+        policy = random.Random(seed)
+        value = game.get_next_value()
+        while not game.is_game_over(value):
+            column = policy.randrange(5)
+            shadow.set_matrix([row[:] for row in game.get_matrix()])
+            before = [row[:] for row in shadow.get_matrix()]
+            accepted, merges, score_gain = shadow.push_turn(value, column)
+            choices = shadow.spawn_choices() if accepted else ()
+            after = [row[:] for row in shadow.get_matrix()]
+            shadow.pop()
+            assert shadow.get_matrix() == before
+            assert shadow.undo_depth() == 0
+            turn = game.play_turn(column)
+            assert accepted == turn.accepted
+            if not accepted:
+                continue
+            assert (merges, score_gain) == (turn.merges, turn.score_delta)
+            assert after == game.get_matrix()
+            assert turn.next_value in choices
+            value = turn.next_value
+
+
+def test_depth_one_is_greedy_over_real_turns():
+    game = GameLogic(seed=4)
+    bot = ExpectimaxBot(depth=1)
+    value = game.get_next_value()
+    for _ in range(60):
+        if game.is_game_over(value):
+            break
+        moves, values = bot.search(game.get_matrix(), value, 1)
+        expected = [bot.evaluate_board(col, board, score, merges) for col, board, score, merges in moves]
+        assert [round(v, 9) for v in values] == [round(v, 9) for v in expected]
+        column = bot.solve(game.get_matrix(), value)
+        assert column == moves[values.index(max(values))][0]
+        value = game.play_turn(column).next_value
+
+
+def test_chance_node_averages_spawn_choices():
+    bot = ExpectimaxBot(depth=2, time_budget=None)
+    game = GameLogic(seed=9)
+    for _ in range(30):
+        game.play_turn(BasicBot().solve(game.get_matrix(), game.get_next_value()))
+    matrix = [row[:] for row in game.get_matrix()]
+    value = game.get_next_value()
+    moves, values = bot.search(matrix, value, 2)
+    for (col, _, score_gain, _), result in zip(moves, values):
+        bot.game.set_matrix([row[:] for row in matrix])
+        bot.game.push_turn(value, col)
+        choices = bot.game.spawn_choices()
+        expected = []
+        for spawn in choices:
+            leaves = bot._expand(spawn)
+            scores = bot.evaluate_leaves(
+                [leaf[1] for leaf in leaves], [score_gain + leaf[2] for leaf in leaves], [leaf[3] for leaf in leaves]
+            )
+            expected.append(max(scores) if scores else GAME_OVER_VALUE)
+        bot.game.pop()
+        assert abs(result - sum(expected) / len(choices)) < 1e-12
+
+
+def test_time_budget_falls_back_to_completed_depth():
+    game = GameLogic(seed=1)
+    for _ in range(20):
+        game.play_turn(BasicBot().solve(game.get_matrix(), game.get_next_value()))
+    bot = ExpectimaxBot(depth=6, time_budget=0.0)
+    column = bot.solve(game.get_matrix(), game.get_next_value())
+    assert bot.completed_depth == 1
+    assert bot.game.undo_depth() == 0
+    assert 0 <= column < 5
+    stats = bot.stats()
+    assert stats["nodes"] > 0 and stats["nodes_per_sec"] > 0
+    unbounded = ExpectimaxBot(depth=2, time_budget=None)
+    unbounded.solve(game.get_matrix(), game.get_next_value())
+    assert unbounded.completed_depth == 2
+
+
+def test_solve_is_reproducible_with_spawn_sequence():
+    scores = []
+    for _ in range(2):
+        game = GameLogic(spawn_sequence=SpawnSequence.from_seed(5, 400))
+        bot = ExpectimaxBot(depth=2, time_budget=None)
+        value = game.get_next_value()
+        for _ in range(40):
+            if game.is_game_over(value):
+                break
+            value = game.play_turn(bot.solve(game.get_matrix(), value)).next_value
+        scores.append((game.get_score(), [row[:] for row in game.get_matrix()]))
+    assert scores[0] == scores[1]
+
+
+if __name__ == "__main__":
+    test_push_turn_matches_play_turn()
+    test_depth_one_is_greedy_over_real_turns()
+    test_chance_node_averages_spawn_choices()
+    test_time_budget_falls_back_to_completed_depth()
+    test_solve_is_reproducible_with_spawn_sequence()
+    print("All tests passed!")
@@ -0,0 +1,93 @@
+import math
+import random
+from agents.heuristic.evaluator import Evaluator
+from core.utils import exponent_table
+from core.utils.board_spec import BoardSpec
+from core.utils.exponent_table import EXPONENT, MONO, PAIRED, SMOOTH, build_line_terms, line_terms
+
+
+def log2_monotonicity(matrix):
+    rows, cols = len(matrix), len(matrix[0])
+
+    def walk(pairs, count):
+        score = 0
+        for cur, nxt in pairs:
+            if cur >= nxt:
+                score += 1
+            elif cur > 0 and nxt > 0:
+                score -= math.log2(nxt) - math.log2(cur)
+        return score / count if count else 0.0
+
+    vertical = walk(((matrix[r][c], matrix[r + 1][c]) for c in range(cols) for r in range(rows - 1)), cols * (rows - 1))
+    horizontal = walk(((matrix[r][c], matrix[r][c + 1]) for r in range(rows) for c in range(cols - 1)), rows * (cols - 1))
+    return (vertical + horizontal) / 2.0
+
+
+def log2_smoothness(matrix):
+    rows, cols = len(matrix), len(matrix[0])
+    smoothness, comparisons = 0, 0
+    for r in range(rows):
+        for c in range(cols):
+            if matrix[r][c] > 0:
+                value = math.log2(matrix[r][c])
+                if c + 1 < cols and matrix[r][c + 1] > 0:
+                    smoothness += abs(value - math.log2(matrix[r][c + 1]))
+                    comparisons += 1
+                if r + 1 < rows and matrix[r + 1][c] > 0:
+                    smoothness += abs(value - math.log2(matrix[r + 1][c]))
+                    comparisons += 1
+    return smoothness / comparisons if comparisons else 0.0
+
+
+def test_pair_tables_match_log2():
+    values = [0] + [2 ** e for e in range(1, 40)]
+    for a in values:
+        for b in values:
+            ea, eb = EXPONENT[a], EXPONENT[b]
+            if a >= b:
+                assert MONO[ea][eb] == 1
+            elif a:
+                assert MONO[ea][eb] == -(math.log2(b) - math.log2(a))
+            else:
+                assert MONO[ea][eb] == 0
+            paired = a > 0 and b > 0
+            assert PAIRED[ea][eb] == int(paired)
+            assert SMOOTH[ea][eb] == (abs(math.log2(a) - math.log2(b)) if paired else 0)
+
+
+def test_evaluator_matches_log2_reference():
+    for spec in (BoardSpec(), BoardSpec(4, 3), BoardSpec(9, 6)):
+        rng = random.Random(spec.cells)
+        evaluator = Evaluator(spec)
+        for _ in range(300):
+            fill = rng.random()
+            matrix = [
+                [2 ** rng.randint(1, 20) if rng.random() < fill else 0 for _ in range(spec.cols)]
+                for _ in range(spec.rows)
+            ]
+            assert evaluator.calculate_monotonicity(matrix) == log2_monotonicity(matrix)
+            assert evaluator.calculate_smoothness(matrix) == log2_smoothness(matrix)
+
+
+def test_line_table_is_bounded():
+    exponent_table.clear_table()
+    limit = exponent_table.LINE_TABLE_LIMIT
+    exponent_table.LINE_TABLE_LIMIT = 3
+    try:
+        lines = [(2, 4, 0, 8, 8), (0, 0, 0, 0, 0), (16, 8, 4, 2, 2), (2, 2, 2, 2, 2), (4, 0, 4, 0, 4)]
+        for line in lines:
+            assert line_terms(line) == build_line_terms(line)
+        assert exponent_table.table_size() == 3
+        assert line_terms(lines[-1]) == build_line_terms(lines[-1])
+    finally:
+        exponent_table.LINE_TABLE_LIMIT = limit
+        exponent_table.clear_table()
+    assert line_terms((2, 4, 0, 8, 8)) == (1, 1, 2)
+    assert line_terms((16, 8, 4, 2, 2)) == (4, 3, 4)
+
+
+if __name__ == "__main__":
+    test_pair_tables_match_log2()
+    test_evaluator_matches_log2_reference()
+    test_line_table_is_bounded()
+    print("All tests passed!")
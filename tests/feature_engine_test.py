@@ -0,0 +1,130 @@
+import random
+import numpy as np
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.feature_engine import FEATURE_NAMES, RAW_FEATURE_NAMES, FeatureEngine
+from agents.heuristic.linear import LinearBot
+from agents.rl.teacher import RLAgent
+from core.game_logic import GameLogic
+from core.utils.board_spec import BoardSpec
+
+
+def test_features_match_basic_bot(random_board):
+    for spec in (BoardSpec(), BoardSpec(4, 3), BoardSpec(9, 6)):
+        rng = random.Random(spec.cells)
+        bot = BasicBot(spec)
+        boards = [random_board(rng, spec, fill=rng.random()) for _ in range(200)]
+        scores = [rng.choice([0, rng.randint(1, 5000)]) for _ in boards]
+        merges = [rng.randint(0, 4) for _ in boards]
+        batch = bot.feature_engine.features(boards, scores, merges)
+        assert batch.shape == (len(boards), len(FEATURE_NAMES))
+        for board, score, merge, row in zip(boards, scores, merges, batch.tolist()):
+            expected = bot.compute_features(0, board, score, merge)
+            assert dict(zip(FEATURE_NAMES, row)) == expected
+
+
+def test_raw_features_match_linear_bot(random_board):
+    rng = random.Random(4)
+    bot = LinearBot()
+    boards = [random_board(rng, bot.spec) for _ in range(200)]
+    scores = [rng.randint(0, 5000) for _ in boards]
+    batch = bot.feature_engine.raw_features(boards, scores, [1] * len(boards))
+    for board, score, row in zip(boards, scores, batch.tolist()):
+        assert dict(zip(RAW_FEATURE_NAMES, row)) == bot.compute_features(0, board, score, 1)
+
+
+def test_exponent_grid():
+    engine = FeatureEngine()
+    board = [[0, 2, 4, 1024, 2 ** 40]] + [[0] * 5 for _ in range(6)]
+    assert engine.exponents([board])[0, :5].tolist() == [0, 1, 2, 10, 40]
+    stats = engine.board_stats(np.zeros((3, 7, 5), dtype=np.int64))
+    assert stats[:, 0].tolist() == [35.0] * 3
+    assert stats[:, 3].tolist() == [1.0] * 3
+
+
+def test_rl_agent_vectors_match_per_board_features(random_board):
+    rng = random.Random(6)
+    agent = RLAgent()
+    bot = BasicBot()
+    for _ in range(100):
+        matrix = random_board(rng, bot.spec, max_exp=4)
+        vectors = agent._get_action_space_features(matrix, 4)
+        for col, vector in enumerate(vectors):
+            temp = [row[:] for row in matrix]
+            score, merges = bot.simulate_move(temp, col, 4)
+            if score == -1:
+                assert vector is None
+                continue
+            expected = bot.compute_features(col, temp, score, merges)
+            assert vector.tolist() == [expected[key] for key in FEATURE_NAMES]
+
+
+def mutate(rng, board, spec, columns):
+    child = [row[:] for row in board]
+    for col in rng.sample(range(spec.cols), columns):
+        for row in range(spec.rows):
+            if rng.random() < 0.4:
+                child[row][col] = 2 ** rng.randint(1, 12) if rng.random() < 0.7 else 0
+    return child
+
+
+def test_delta_features_match_full_recompute(random_board):
+    for spec in (BoardSpec(), BoardSpec(4, 3), BoardSpec(9, 6)):
+        rng = random.Random(spec.cells + 1)
+        engine = FeatureEngine(spec)
+        for _ in range(100):
+            board = random_board(rng, spec, fill=rng.random())
+            parent = engine.summarize(board)
+            children = [board] + [mutate(rng, board, spec, rng.randint(1, spec.cols)) for _ in range(6)]
+            scores = [rng.randint(0, 5000) for _ in children]
+            merges = [rng.randint(0, 4) for _ in children]
+            assert np.array_equal(
+                engine.features(children, scores, merges, parent), engine.features(children, scores, merges)
+            )
+            assert np.array_equal(
+                engine.raw_features(children, scores, merges, parent), engine.raw_features(children, scores, merges)
+            )
+
+
+def test_summary_follows_game_through_purges():
+    engine = FeatureEngine()
+    bot = BasicBot(frozen=True)
+    for seed in range(3):
+        game = GameLogic(seed=seed)
+        summary = engine.summarize(game.get_matrix())
+        for _ in range(300):
+            value = game.get_next_value()
+            if game.is_game_over(value):
+                break
+            game.play_turn(bot.solve(game.get_matrix(), value))
+            summary = engine.update(summary, game.get_matrix())
+            fresh = engine.summarize(game.get_matrix())
+            assert summary.totals == fresh.totals
+            assert engine.summary_stats(summary) == engine.summary_stats(fresh)
+            assert engine.summary_stats(summary) == tuple(engine.board_stats([game.get_matrix()])[0].tolist())
+
+
+def test_incremental_bots_make_identical_decisions():
+    for cls in (BasicBot, LinearBot):
+        plain, incremental = cls(), cls(incremental=True)
+        game = GameLogic(seed=8)
+        for _ in range(150):
+            value = game.get_next_value()
+            if game.is_game_over(value):
+                break
+            column = plain.solve(game.get_matrix(), value)
+            assert incremental.solve(game.get_matrix(), value) == column
+            game.play_turn(column)
+        assert plain.weights == incremental.weights
+
+
+if __name__ == "__main__":
+    from conftest import scattered_board
+
+    test_features_match_basic_bot(scattered_board)
+    test_raw_features_match_linear_bot(scattered_board)
+    test_exponent_grid()
+    test_rl_agent_vectors_match_per_board_features(scattered_board)
+    test_delta_features_match_full_recompute(scattered_board)
+    test_summary_follows_game_through_purges()
+    test_incremental_bots_make_identical_decisions()
+    print("All tests passed!")
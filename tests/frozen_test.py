@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from agents.heuristic.adaptive_linear import AdaptiveLinearBot
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.fixed_linear import FixedLinearBot
+from agents.heuristic.linear import LinearBot
+
+
+def test_frozen_solve_never_touches_weights(positions):
+    for cls in (BasicBot, LinearBot, AdaptiveLinearBot, FixedLinearBot):
+        bot = cls(frozen=True)
+        before = dict(bot.weights)
+        vector = bot.weight_vector
+        assert not vector.flags.writeable
+        for matrix, value in positions(1):
+            column = bot.solve(matrix, value)
+            scores = {
+                col: bot.evaluate_board(col, board, score, merges)
+                for col, board, score, merges in bot.afterstates(matrix, value)
+            }
+            best = max(scores.values())
+            assert abs(scores[column] - best) < 1e-9
+        assert bot.weights == before
+        assert bot.weight_vector is vector
+
+
+def test_fixed_weights_decide_the_same_frozen_or_not(positions):
+    live, frozen = FixedLinearBot(), FixedLinearBot(frozen=True)
+    for matrix, value in positions(2):
+        assert live.solve(matrix, value) == frozen.solve(matrix, value)
+
+
+def test_observe_applies_the_policy_update(positions):
+    frozen, reference = BasicBot(frozen=True), BasicBot()
+    for matrix, value in positions(3, 20):
+        column = frozen.solve(matrix, value)
+        outcome = frozen.outcome(matrix, value, column)
+        assert outcome.column == column
+        frozen.observe(outcome)
+        reference.update_weights(outcome.features, reference.reward(outcome.score_gain))
+        assert frozen.weights == reference.weights
+        assert frozen.weight_vector.tolist() == [frozen.weights[k] for k in frozen.evaluator.names]
+    full = [[2 * (1 + (r + c) % 2) * (4 ** c) for c in range(5)] for r in range(7)]
+    assert frozen.outcome(full, 8, 0) is None
+    frozen.observe(None)
+
+
+def test_frozen_bot_can_be_shared_across_threads(positions):
+    bot = BasicBot(frozen=True)
+    states = positions(4) + positions(5)
+    expected = [bot.solve(matrix, value) for matrix, value in states]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda state: bot.solve(*state), reversed(states)))
+    assert results[::-1] == expected
+
+
+if __name__ == "__main__":
+    from conftest import played_positions
+
+    test_frozen_solve_never_touches_weights(played_positions)
+    test_fixed_weights_decide_the_same_frozen_or_not(played_positions)
+    test_observe_applies_the_policy_update(played_positions)
+    test_frozen_bot_can_be_shared_across_threads(played_positions)
+    print("All tests passed!")
@@ -0,0 +1,94 @@
+import random
+import numpy as np
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.linear import LinearBot
+from core.utils import jit_kernels
+from core.utils.core_utils import merge_column, merging_values, rearrange
+
+
+def test_merging_values_matches_list_kernel():
+    rng = random.Random(3)
+    for _ in range(2000):
+        matrix = [[2 ** rng.randint(1, 3) if rng.random() < 0.8 else 0 for _ in range(5)] for _ in range(7)]
+        row, column = rng.randrange(7), rng.randrange(5)
+        value = matrix[row][column] or 2
+        cells = jit_kernels.to_flat(matrix)
+        merged, gained, count = jit_kernels.merging_values_flat(cells, row, column, value)
+        expected, _, score, expected_count = merging_values(matrix, 0, row, column, value)
+        assert (merged, gained, count) == (expected, score, expected_count)
+        assert cells.tolist() == np.array(matrix).ravel().tolist()
+
+
+def test_merge_column_and_rearrange_match_list_kernels(random_matrix):
+    rng = random.Random(5)
+    for _ in range(1000):
+        matrix = random_matrix(rng, max_exp=3)
+        column = rng.choice([-1, 0, 2, 4])
+        cells = jit_kernels.to_flat(matrix)
+        merged, gained, _ = jit_kernels.merge_column_flat(cells, column)
+        expected, _, score, _ = merge_column(matrix, 0, column)
+        assert (merged, gained) == (expected, score)
+        jit_kernels.rearrange_flat(cells, column)
+        rearrange(matrix, None if column == -1 else column)
+        assert cells.tolist() == np.array(matrix).ravel().tolist()
+
+
+def test_simulate_move_matches_bots(random_matrix):
+    rng = random.Random(7)
+    basic, linear = BasicBot(), LinearBot()
+    for _ in range(2000):
+        matrix = random_matrix(rng)
+        column = rng.randrange(5)
+        value = 2 ** rng.randint(1, 4)
+        flat = [row[:] for row in matrix]
+        general = [row[:] for row in matrix]
+        legacy = [row[:] for row in matrix]
+        result = jit_kernels.simulate_move(flat, column, value)
+        assert result == basic.evaluator._simulate_move_general(general, column, value)
+        assert result == linear.simulate_move(legacy, column, value)
+        assert flat == general == legacy
+
+
+def test_board_features_match_basic_bot(random_matrix):
+    rng = random.Random(9)
+    bot = BasicBot()
+    for _ in range(1000):
+        matrix = random_matrix(rng, max_exp=8)
+        column = rng.randrange(5)
+        assert bot.evaluator._compute_features_flat(column, matrix, 12, 2) == bot.compute_features(column, matrix, 12, 2)
+
+
+def test_bots_route_through_kernels_when_enabled(random_matrix):
+    rng = random.Random(11)
+    matrix = random_matrix(rng)
+    expected = BasicBot()
+    column = expected.solve([row[:] for row in matrix], 4)
+    saved = jit_kernels.ENABLED
+    jit_kernels.ENABLED = True
+    try:
+        bot = BasicBot()
+        assert bot.solve([row[:] for row in matrix], 4) == column
+        assert bot.weights == expected.weights
+    finally:
+        jit_kernels.ENABLED = saved
+
+
+def test_set_enabled_requires_numba():
+    saved = jit_kernels.ENABLED
+    try:
+        assert jit_kernels.set_enabled(True) == jit_kernels.NUMBA_AVAILABLE
+        assert jit_kernels.set_enabled(False) is False
+    finally:
+        jit_kernels.ENABLED = saved
+
+
+if __name__ == "__main__":
+    from conftest import stacked_matrix
+
+    test_merging_values_matches_list_kernel()
+    test_merge_column_and_rearrange_match_list_kernels(stacked_matrix)
+    test_simulate_move_matches_bots(stacked_matrix)
+    test_board_features_match_basic_bot(stacked_matrix)
+    test_bots_route_through_kernels_when_enabled(stacked_matrix)
+    test_set_enabled_requires_numba()
+    print("All tests passed!")
@@ -0,0 +1,61 @@
+import numpy as np
+from core.m2_env import M2Env
+
+
+def to_exponents(matrix):
+    return [[v.bit_length() - 1 if v else 0 for v in row] for row in matrix]
+
+
+def test_observation_is_readonly_engine_view():
+    env = M2Env()
+    obs, info = env.reset(seed=3)
+    board = obs["board"]
+    assert board.shape == (7, 5)
+    assert not board.flags.writeable
+    assert info["action_mask"].all()
+    for _ in range(50):
+        mask = env.action_mask()
+        action = int(np.flatnonzero(mask)[0])
+        obs, reward, done, truncated, info = env.step(action)
+        assert obs["board"] is board
+        assert board.tolist() == to_exponents(env.game.get_matrix())
+        assert 2 ** obs["next_value"] == env.game.get_next_value()
+        if done:
+            break
+    try:
+        board[0, 0] = 1
+    except ValueError:
+        return
+    assert False, "observation should be read-only"
+
+
+def test_seeded_reset_is_reproducible():
+    env = M2Env()
+    first = [env.reset(seed=11)[0]["next_value"]]
+    for action in [0, 1, 2, 3, 4] * 6:
+        first.append(env.step(action)[0]["next_value"])
+    second = [env.reset(seed=11)[0]["next_value"]]
+    for action in [0, 1, 2, 3, 4] * 6:
+        second.append(env.step(action)[0]["next_value"])
+    assert first == second
+
+
+def test_invalid_action_and_truncation():
+    env = M2Env(seed=0, max_steps=3)
+    env.reset()
+    full = [[2 ** (row + col + 1) for col in range(5)] for row in range(7)]
+    env.game.set_matrix(full)
+    mask = env.action_mask()
+    assert mask.tolist() == [full[6][col] == env.game.get_next_value() for col in range(5)]
+    _, reward, done, truncated, info = env.step(int(np.flatnonzero(~mask)[0]))
+    assert reward == -10.0 and done and not truncated and not info["accepted"]
+    env.reset()
+    results = [env.step(col) for col in (0, 1, 2)]
+    assert [r[3] for r in results] == [False, False, True]
+
+
+if __name__ == "__main__":
+    test_observation_is_readonly_engine_view()
+    test_seeded_reset_is_reproducible()
+    test_invalid_action_and_truncation()
+    print("All tests passed!")
@@ -0,0 +1,108 @@
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.mcts import MCTSBot
+from core.game_logic import GameLogic
+
+
+def midgame(seed, moves=25):
+    game = GameLogic(seed=seed)
+    bot = BasicBot()
+    for _ in range(moves):
+        game.play_turn(bot.solve(game.get_matrix(), game.get_next_value()))
+    return game
+
+
+def test_iteration_budget_is_exact():
+    game = midgame(2)
+    bot = MCTSBot(iterations=60, seed=1)
+    matrix = [row[:] for row in game.get_matrix()]
+    column = bot.solve(game.get_matrix(), game.get_next_value())
+    assert game.get_matrix() == matrix
+    assert bot.completed_iterations == 60
+    assert bot.root.visits == 60
+    assert sum(edge.visits for edge in bot.root.children.values()) == 60
+    assert column == max(bot.root.children, key=lambda col: bot.root.children[col].visits)
+
+
+def test_only_legal_column_is_chosen():
+    matrix = [[2 * (1 + (r + c) % 2) * (4 ** c) for c in range(5)] for r in range(7)]
+    matrix[6][3] = 8
+    bot = MCTSBot(iterations=20, seed=0)
+    assert bot.solve(matrix, 8) == 3
+    assert set(bot.root.children) == {3}
+
+
+def test_tree_is_reused_after_the_chosen_move():
+    game = midgame(4)
+    bot = MCTSBot(iterations=150, seed=3)
+    value = game.get_next_value()
+    column = bot.solve(game.get_matrix(), value)
+    child = bot.root.children[column]
+    turn = game.play_turn(column)
+    expected = child.children[turn.next_value].visits
+    assert expected > 0
+    bot.solve(game.get_matrix(), turn.next_value)
+    assert bot.reused_visits == expected
+    assert bot.root.visits == expected + 150
+    fresh = MCTSBot(iterations=10, reuse_tree=False, seed=3)
+    fresh.solve(game.get_matrix(), turn.next_value)
+    fresh.solve(game.get_matrix(), turn.next_value)
+    assert fresh.reused_visits == 0
+
+
+def test_time_budget_and_stats():
+    game = midgame(6)
+    bot = MCTSBot(time_budget=0.02, iterations=None, rollout_policy="linear", seed=0)
+    bot.solve(game.get_matrix(), game.get_next_value())
+    stats = bot.stats()
+    assert stats["iterations"] >= 1
+    assert stats["iterations_per_sec"] > 0
+    assert stats["elapsed"] < 1.0
+
+
+def test_seeded_search_is_reproducible():
+    game = midgame(8)
+    columns = [
+        MCTSBot(iterations=40, seed=11).solve(game.get_matrix(), game.get_next_value())
+        for _ in range(2)
+    ]
+    assert columns[0] == columns[1]
+
+
+def test_leaf_value_penalises_lost_positions():
+    bot = MCTSBot(iterations=10, seed=0)
+    dead = [[2 * (1 + (r + c) % 2) * (4 ** c) for c in range(5)] for r in range(7)]
+    bot.game.set_matrix([row[:] for row in dead])
+    assert bot._leaf_value(4096) == -bot.terminal_penalty
+    alive = midgame(3)
+    bot.game.set_matrix([row[:] for row in alive.get_matrix()])
+    assert bot._leaf_value(alive.get_next_value()) > -bot.terminal_penalty
+
+
+def test_rollout_policies_are_frozen():
+    game = midgame(5)
+    bot = MCTSBot(iterations=30, rollout_depth=4, rollout_policy="linear", seed=2)
+    weights = dict(bot.default_policy.weights), dict(bot.leaf_evaluator.weights)
+    bot.solve(game.get_matrix(), game.get_next_value())
+    assert bot.default_policy.frozen and bot.leaf_evaluator.frozen
+    assert (dict(bot.default_policy.weights), dict(bot.leaf_evaluator.weights)) == weights
+
+
+def test_rejects_bad_configuration():
+    for kwargs in ({"rollout_policy": "greedy"}, {"time_budget": None, "iterations": None}):
+        try:
+            MCTSBot(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {kwargs}")
+
+
+if __name__ == "__main__":
+    test_iteration_budget_is_exact()
+    test_only_legal_column_is_chosen()
+    test_tree_is_reused_after_the_chosen_move()
+    test_time_budget_and_stats()
+    test_seeded_search_is_reproducible()
+    test_leaf_value_penalises_lost_positions()
+    test_rollout_policies_are_frozen()
+    test_rejects_bad_configuration()
+    print("All tests passed!")
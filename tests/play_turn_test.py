@@ -0,0 +1,73 @@
+import copy
+import random
+from core.game_logic import GameLogic
+from core.utils.core_utils import (
+    _get_remove_values,
+    game_over,
+    rearrange,
+    remove_redundant,
+)
+
+
+def reference_turn(game, value, column):
+    merged, count = game.add_to_column(value, column)
+    if not merged:
+        return None
+    matrix = rearrange(game.get_matrix())
+    max_value = max(max(row) for row in matrix)
+    remove_redundant(matrix=matrix, remove_values=_get_remove_values(max_value))
+    game.set_matrix(matrix)
+    game.resolve_merges()
+    next_value = game.get_random_value()
+    return (count, game_over(game.get_matrix(), next_value), next_value)
+
+
+def test_play_turn_matches_reference_pipeline():
+    for seed in range(25):
+        fast = GameLogic(seed=seed)
+        slow = GameLogic(seed=seed)
+        policy = random.Random(seed)
+        value = slow.get_random_value()
+        assert fast.get_next_value() == value
+        for _ in range(300):
+            column = policy.randrange(5)
+            score = fast.get_score()
+            turn = fast.play_turn(column)
+            expected = reference_turn(slow, value, column)
+            if expected is None:
+                assert not turn.accepted
+                assert turn.next_value == value
+                continue
+            assert turn.accepted
+            assert (turn.reward, turn.done, turn.next_value) == expected
+            assert fast.get_matrix() == slow.get_matrix()
+            assert fast.get_score() == slow.get_score()
+            assert turn.score_delta == fast.get_score() - score
+            assert turn.merges == len(turn.events)
+            assert turn.score_delta == sum(event.value for event in turn.events)
+            value = expected[2]
+            if turn.done:
+                break
+
+
+def test_drop_events_match_general_path(random_matrix):
+    rng = random.Random(3)
+    for _ in range(2000):
+        matrix = random_matrix(rng)
+        column = rng.randrange(5)
+        value = 2 ** rng.randint(1, 4)
+        fast = GameLogic()
+        fast.set_matrix(copy.deepcopy(matrix))
+        slow = GameLogic()
+        slow.set_matrix(copy.deepcopy(matrix))
+        fast.add_to_column(value, column)
+        slow._add_to_column_general(value, column)
+        assert fast._drop_events == slow._drop_events
+
+
+if __name__ == "__main__":
+    from conftest import stacked_matrix
+
+    test_play_turn_matches_reference_pipeline()
+    test_drop_events_match_general_path(stacked_matrix)
+    print("All tests passed!")
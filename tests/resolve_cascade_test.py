@@ -0,0 +1,70 @@
+import copy
+import random
+from core.utils.core_utils import merge_column, rearrange, resolve_cascade, resolve_tracked
+
+
+def reference(matrix, column=-1, compact_column=None):
+    score = 0
+    counts = []
+    while True:
+        merged, matrix, score, count = merge_column(matrix, score, column)
+        if not merged:
+            break
+        counts.append(count)
+        matrix = rearrange(matrix, compact_column)
+    return (matrix, score, counts, count)
+
+
+def check(matrix, column=-1, compact_column=None):
+    expected, score, counts, last = reference(copy.deepcopy(matrix), column, compact_column)
+    result, delta, merges, events, last_count = resolve_tracked(copy.deepcopy(matrix), column, compact_column)
+    assert result == expected
+    assert delta == score
+    assert merges == len(counts) == len(events)
+    assert [len(e.sources) + 1 for e in events] == counts
+    assert sum(e.value for e in events) == score
+    if not counts:
+        assert last_count == last
+
+
+def test_full_board_matches_merge_loop(random_board):
+    rng = random.Random(1)
+    for _ in range(3000):
+        check(random_board(rng, fill=0.8, max_exp=3))
+
+
+def test_single_column_matches_merge_loop(random_board):
+    rng = random.Random(2)
+    for _ in range(3000):
+        column = rng.randrange(5)
+        check(random_board(rng, fill=0.8, max_exp=3), column, column)
+        check(random_board(rng, fill=0.8, max_exp=3), column)
+
+
+def test_dense_clusters(random_board):
+    rng = random.Random(3)
+    for _ in range(2000):
+        check(random_board(rng, fill=0.6, max_exp=1))
+
+
+def test_merge_event_log():
+    matrix = [[0] * 5 for _ in range(7)]
+    matrix[0][0] = 2
+    matrix[1][0] = 2
+    matrix[0][1] = 4
+    result, delta, merges, events = resolve_cascade(matrix)
+    assert (delta, merges) == (12, 2)
+    assert events[0].target == (0, 0) and events[0].value == 4
+    assert events[0].sources == ((1, 0),)
+    assert events[1].value == 8
+    assert result[0][:2] == [8, 0]
+
+
+if __name__ == "__main__":
+    from conftest import scattered_board
+
+    test_full_board_matches_merge_loop(scattered_board)
+    test_single_column_matches_merge_loop(scattered_board)
+    test_dense_clusters(scattered_board)
+    test_merge_event_log()
+    print("All tests passed!")
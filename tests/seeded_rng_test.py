@@ -0,0 +1,84 @@
+import random
+from benchmark import draw_spawn_sequences, evaluate_agent, make_basic_bot
+from core.bitboard import BitboardGameLogic
+from core.game_logic import GameLogic
+from core.utils.core_utils import SpawnSequence, rearrange
+
+
+def play(game, moves=150, policy_seed=0):
+    policy = random.Random(policy_seed)
+    values = []
+    value = game.get_random_value()
+    for _ in range(moves):
+        values.append(value)
+        if game.is_game_over(value):
+            break
+        merged, _ = game.add_to_column(value, policy.randrange(5))
+        if merged:
+            game.set_matrix(rearrange(game.get_matrix()))
+            game.merge_column()
+        value = game.get_random_value()
+    return values, game.get_score()
+
+
+def test_seeded_games_are_reproducible():
+    first = play(GameLogic(seed=5))
+    random.seed(123)
+    second = play(GameLogic(seed=5))
+    assert first == second
+    assert play(GameLogic(seed=6)) != first
+
+
+def test_interleaved_games_do_not_share_a_stream():
+    alone = play(GameLogic(seed=1))
+    a, b = GameLogic(seed=1), GameLogic(seed=2)
+    b.get_random_value()
+    b.get_random_value()
+    assert play(a) == alone
+
+
+def test_spawn_sequence_matches_seeded_stream():
+    seeded = play(GameLogic(seed=9), policy_seed=4)
+    draws = SpawnSequence.from_seed(9, 1000).draws
+    assert play(GameLogic(spawn_sequence=draws), policy_seed=4) == seeded
+    assert play(BitboardGameLogic(spawn_sequence=draws), policy_seed=4) == seeded
+
+
+def test_spawn_sequence_exhaustion():
+    game = GameLogic(spawn_sequence=[0.1, 0.9])
+    game.get_random_value()
+    game.get_random_value()
+    try:
+        game.get_random_value()
+    except IndexError:
+        return
+    assert False, "exhausted sequence should raise"
+
+
+def test_short_sequence_continues_on_the_episode_seed():
+    seeded = play(GameLogic(seed=9), policy_seed=4)
+    draws = SpawnSequence.from_seed(9, 20).draws
+    assert len(seeded[0]) > 20
+    assert play(GameLogic(seed=9, spawn_sequence=draws), policy_seed=4) == seeded
+    assert play(BitboardGameLogic(seed=9, spawn_sequence=draws), policy_seed=4) == seeded
+    sequence = SpawnSequence.from_seed(9, 20)
+    first = [sequence.random() for _ in range(40)]
+    sequence.rewind()
+    assert [sequence.random() for _ in range(40)] == first
+
+
+def test_benchmark_plays_past_a_short_spawn_sequence():
+    sequences = draw_spawn_sequences(2, 1, 20)
+    result = evaluate_agent("BasicBot", make_basic_bot, 2, 1, spawn_sequences=sequences)
+    assert result["n_runs"] == 2
+    assert result["mean_moves"] > 20
+
+
+if __name__ == "__main__":
+    test_seeded_games_are_reproducible()
+    test_interleaved_games_do_not_share_a_stream()
+    test_spawn_sequence_matches_seeded_stream()
+    test_spawn_sequence_exhaustion()
+    test_short_sequence_continues_on_the_episode_seed()
+    test_benchmark_plays_past_a_short_spawn_sequence()
+    print("All tests passed!")
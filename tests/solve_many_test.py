@@ -0,0 +1,85 @@
+from agents.heuristic.adaptive_linear import AdaptiveLinearBot
+from agents.heuristic.afterstate_cache import AfterstateCache
+from agents.heuristic.basic_bot import BasicBot
+from agents.heuristic.expectimax import ExpectimaxBot
+from agents.heuristic.fixed_linear import FixedLinearBot
+from agents.heuristic.linear import LinearBot
+from agents.heuristic.mcts import MCTSBot
+from agents.rl.standard import NoTeacherAgent
+from agents.rl.teacher import RLAgent
+from benchmark import make_basic_bot, run_episode_headless, run_lockstep_headless
+from core.utils.board_spec import BoardSpec
+
+
+def batch(positions, seeds=range(6), count=50):
+    states = [state for seed in seeds for state in positions(seed, count)]
+    return [matrix for matrix, _ in states], [value for _, value in states]
+
+
+def full_board():
+    return [[2 ** (1 + (r + c) % 5) for c in range(5)] for r in range(7)]
+
+
+def test_heuristic_bots_match_sequential_decisions(positions):
+    boards, values = batch(positions)
+    boards.append(full_board())
+    values.append(64)
+    for cls in (BasicBot, LinearBot, AdaptiveLinearBot, FixedLinearBot):
+        for kwargs in ({}, {"frozen": True}, {"frozen": True, "cache": AfterstateCache()}):
+            sequential, batched = cls(**kwargs), cls(**kwargs)
+            expected = [sequential.solve(m, v) for m, v in zip(boards, values)]
+            assert batched.solve_many(boards, values) == expected
+            assert batched.weights == sequential.weights
+            assert expected[-1] == 0
+
+
+def test_rl_agents_match_sequential_decisions(positions):
+    boards, values = batch(positions)
+    for cls in (NoTeacherAgent, RLAgent):
+        sequential, batched = cls(), cls()
+        batched.theta = sequential.theta.copy()
+        expected = [sequential.decide(m, v) for m, v in zip(boards, values)]
+        assert batched.solve_many(boards, values) == expected
+        assert batched.solve_many(boards, values) == expected
+        assert batched.cache.stats()["hits"] > 0
+
+
+def test_search_bots_fall_back_to_per_board_search(positions):
+    boards, values = batch(positions, seeds=[2], count=4)
+    expectimax = ExpectimaxBot(depth=2, time_budget=None)
+    assert expectimax.solve_many(boards, values) == [expectimax.solve(m, v) for m, v in zip(boards, values)]
+    first, second = MCTSBot(iterations=30, seed=3), MCTSBot(iterations=30, seed=3)
+    assert first.solve_many(boards, values) == [second.solve(m, v) for m, v in zip(boards, values)]
+
+
+def test_empty_batch():
+    assert BasicBot(frozen=True).solve_many([], []) == []
+    assert BasicBot(cache=AfterstateCache()).solve_many([], []) == []
+    assert NoTeacherAgent().solve_many([], []) == []
+
+
+def test_lockstep_benchmark_matches_sequential_episodes():
+    spec = BoardSpec(5, 4)
+    seeds = [0, 1, 2, 3]
+    lockstep = run_lockstep_headless(make_basic_bot(spec, frozen=True).solve_many, seeds, spec=spec)
+    sequential = [run_episode_headless(make_basic_bot(spec, frozen=True).act, seed=seed, spec=spec) for seed in seeds]
+    assert lockstep == sequential
+
+
+def test_act_many_records_one_sample_per_board(positions):
+    boards, values = batch(positions, seeds=[1], count=12)
+    bot = BasicBot(frozen=True)
+    assert bot.act_many(boards, values) == bot.solve_many(boards, values)
+    assert bot.latency.summary()["moves"] == len(boards)
+
+
+if __name__ == "__main__":
+    from conftest import played_positions
+
+    test_heuristic_bots_match_sequential_decisions(played_positions)
+    test_rl_agents_match_sequential_decisions(played_positions)
+    test_search_bots_fall_back_to_per_board_search(played_positions)
+    test_empty_batch()
+    test_lockstep_benchmark_matches_sequential_episodes()
+    test_act_many_records_one_sample_per_board(played_positions)
+    print("All tests passed!")
@@ -0,0 +1,62 @@
+import random
+from core.utils.core_utils import (
+    _get_remove_values,
+    dynamic_random_choices,
+    initial_random_choices,
+    random_value,
+    remove_redundant,
+    spawn_distribution,
+)
+
+
+def reference_random_value(matrix):
+    max_value = 0
+    for row in matrix:
+        for value in row:
+            max_value = max(max_value, value)
+    if max_value == 0:
+        return (random.choices([2, 4])[0], matrix)
+    if max_value >= 1024:
+        choices = dynamic_random_choices(max_value)
+        choices, matrix = remove_redundant(
+            matrix=matrix, random_choices=choices, remove_values=_get_remove_values(max_value)
+        )
+    else:
+        choices = initial_random_choices(max_value)
+    if not choices:
+        choices = [2, 4]
+    return (random.choices(choices)[0], matrix)
+
+
+def test_distribution_matches_choice_functions():
+    for exponent in range(1, 60):
+        max_value = 2 ** exponent
+        choices, purge_values = spawn_distribution(max_value)
+        if max_value >= 1024:
+            expected = dynamic_random_choices(max_value)
+            remove = _get_remove_values(max_value)
+            assert purge_values[0] == remove
+            expected = [v for v in expected if v not in purge_values]
+        else:
+            expected = initial_random_choices(max_value)
+            assert purge_values == ()
+        assert list(choices) == (expected or [2, 4])
+    assert spawn_distribution(0) == ((2, 4), ())
+
+
+def test_random_value_matches_reference():
+    rng = random.Random(4)
+    for _ in range(500):
+        matrix = [[2 ** rng.randint(0, 16) if rng.random() < 0.6 else 0 for _ in range(5)] for _ in range(7)]
+        matrix = [[0 if v == 1 else v for v in row] for row in matrix]
+        copy = [row[:] for row in matrix]
+        random.seed(1)
+        expected = reference_random_value(copy)
+        random.seed(1)
+        assert random_value(matrix) == expected
+
+
+if __name__ == "__main__":
+    test_distribution_matches_choice_functions()
+    test_random_value_matches_reference()
+    print("All tests passed!")
@@ -0,0 +1,64 @@
+import random
+from core.game_logic import GameLogic
+from core.utils.core_utils import rearrange
+
+
+def play(game, moves, seed):
+    random.seed(seed)
+    policy = random.Random(seed)
+    value = game.get_random_value()
+    for _ in range(moves):
+        if game.is_game_over(value):
+            break
+        merged, _ = game.add_to_column(value, policy.randrange(5))
+        if merged:
+            game.set_matrix(rearrange(game.get_matrix()))
+            game.resolve_merges()
+        value = game.get_random_value()
+    return value
+
+
+def state(game):
+    return (
+        [row[:] for row in game.get_matrix()],
+        game.get_score(),
+        game.max_tile(),
+        game.empty_count(),
+        game.column_heights(),
+        game.get_hash(),
+    )
+
+
+def test_push_pop_restores_state():
+    for seed in range(20):
+        game = GameLogic()
+        value = play(game, 60, seed)
+        before = state(game)
+        for column in range(5):
+            game.push(value, column)
+            game.push(2, (column + 1) % 5)
+            assert game.undo_depth() == 2
+            game.pop()
+            game.pop()
+            assert state(game) == before
+        assert game.undo_depth() == 0
+
+
+def test_snapshot_is_immutable_and_restorable():
+    game = GameLogic()
+    play(game, 40, 3)
+    snap = game.snapshot()
+    matrix = game.get_matrix()
+    before = state(game)
+    game.add_to_column(2, 0)
+    game.add_to_column(4, 1)
+    game.restore(snap)
+    assert state(game) == before
+    assert game.get_matrix() is matrix
+    assert isinstance(snap[0], tuple) and isinstance(snap[0][0], tuple)
+
+
+if __name__ == "__main__":
+    test_push_pop_restores_state()
+    test_snapshot_is_immutable_and_restorable()
+    print("All tests passed!")
@@ -0,0 +1,71 @@
+import numpy as np
+from core.game_logic import GameLogic
+from core.utils.core_utils import (
+    _get_remove_values,
+    game_over,
+    random_value,
+    rearrange,
+    remove_redundant,
+)
+from core.vec_game_logic import VecGameLogic
+
+
+def scalar_turn(game, value, column):
+    merged, count = game.add_to_column(value, column)
+    if not merged:
+        return (0, True)
+    matrix = rearrange(game.get_matrix())
+    max_value = max(max(row) for row in matrix)
+    remove_redundant(matrix=matrix, remove_values=_get_remove_values(max_value))
+    game.resolve_merges()
+    return (count, False)
+
+
+def test_matches_scalar_pipeline():
+    n = 64
+    vec = VecGameLogic(n, seed=5)
+    policy = np.random.default_rng(9)
+    games = [GameLogic() for _ in range(n)]
+    done = np.zeros(n, dtype=bool)
+    for _ in range(250):
+        values = vec.get_next_values()
+        columns = policy.integers(0, 5, size=n)
+        rewards, dones = vec.step(columns)
+        matrices = vec.get_matrices()
+        for i, game in enumerate(games):
+            if done[i]:
+                continue
+            reward, rejected = scalar_turn(game, int(values[i]), int(columns[i]))
+            assert reward == rewards[i]
+            if not rejected:
+                _, matrix = random_value(game.get_matrix())
+                assert game_over(matrix, int(vec.get_next_values()[i])) == dones[i]
+            assert rejected or matrices[i].tolist() == game.get_matrix()
+            assert game.get_score() == vec.get_scores()[i]
+            done[i] = dones[i]
+        if done.all():
+            break
+
+
+def test_spawn_values_follow_max_tile():
+    vec = VecGameLogic(256, seed=0)
+    assert set(vec.get_next_values().tolist()) == {2, 4}
+    vec.get_boards()[:, 0, 0] = 9
+    vec.reset(np.arange(0))
+    vec._spawn(np.arange(256))
+    assert set(vec.get_next_values().tolist()) <= {2, 4, 8, 16, 32, 64, 128}
+
+
+def test_reset_subset():
+    vec = VecGameLogic(4, seed=1)
+    vec.step([0, 1, 2, 3])
+    vec.reset([1])
+    assert vec.get_boards()[1].sum() == 0
+    assert vec.get_boards()[0].sum() > 0
+
+
+if __name__ == "__main__":
+    test_matches_scalar_pipeline()
+    test_spawn_values_follow_max_tile()
+    test_reset_subset()
+    print("All tests passed!")
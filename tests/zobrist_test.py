@@ -0,0 +1,76 @@
+import random
+from core.game_logic import GameLogic
+from core.utils.core_utils import rearrange
+from core.utils.transposition_table import TranspositionTable
+from core.utils.zobrist import board_hash
+
+
+def test_incremental_hash_matches_full_hash():
+    for seed in range(20):
+        random.seed(seed)
+        policy = random.Random(seed)
+        game = GameLogic()
+        value = game.get_random_value()
+        for _ in range(200):
+            assert game.get_hash() == board_hash(game.get_matrix())
+            if game.is_game_over(value):
+                break
+            merged, _ = game.add_to_column(value, policy.randrange(5))
+            if merged:
+                game.set_matrix(rearrange(game.get_matrix()))
+                game.resolve_merges()
+            value = game.get_random_value()
+    game.reset()
+    assert game.get_hash() == 0
+
+
+def test_hash_distinguishes_positions():
+    matrix = [[0] * 5 for _ in range(7)]
+    matrix[0][0] = 2
+    other = [[0] * 5 for _ in range(7)]
+    other[0][1] = 2
+    assert board_hash(matrix) != board_hash(other)
+    matrix[0][0] = 4
+    assert board_hash(matrix) != board_hash(other)
+
+
+def test_always_policy_replaces_colliding_slot():
+    table = TranspositionTable(capacity=4)
+    table.store(1, "a")
+    table.store(5, "b")
+    assert table.get(1) is None
+    assert table.get(5) == "b"
+    assert table.replacements == 1
+    assert table.hits == 1 and table.misses == 1
+    assert table.hit_rate() == 0.5
+    assert table.occupancy() == 0.25
+
+
+def test_depth_policy_keeps_deeper_entry():
+    table = TranspositionTable(capacity=4, policy="depth")
+    assert table.store(1, "deep", depth=3)
+    assert not table.store(5, "shallow", depth=1)
+    assert table.get(1) == "deep"
+    assert table.store(5, "deeper", depth=4)
+    assert table.get(5) == "deeper"
+
+
+def test_lru_policy_evicts_oldest():
+    table = TranspositionTable(capacity=2, policy="lru")
+    table.store(1, "a")
+    table.store(2, "b")
+    table.get(1)
+    table.store(3, "c")
+    assert table.get(2) is None
+    assert table.get(1) == "a"
+    assert len(table) == 2
+    assert table.stats()["replacements"] == 1
+
+
+if __name__ == "__main__":
+    test_incremental_hash_matches_full_hash()
+    test_hash_distinguishes_positions()
+    test_always_policy_replaces_colliding_slot()
+    test_depth_policy_keeps_deeper_entry()
+    test_lru_policy_evicts_oldest()
+    print("All tests passed!")